@@ -2,3 +2,4 @@ from .imgbb import ImgBBAPI, ExternalAPIManager
 from .context_processors import user_context
 from .sse import *
 from .email import send_password_reset_email
+from .keyset_pagination import KeysetPaginator, KeysetPage
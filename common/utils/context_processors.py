@@ -1,17 +1,19 @@
+from django.utils.functional import SimpleLazyObject
+
 from constants import UserRole, DATE_FORMAT_DMY, DATE_FORMAT_DMYHI
-from novels.models.reading_favorite import Favorite
+
 
 def user_context(request):
     context = {}
     
     if request.user.is_authenticated:
+        # Imported here: novels.services imports common.utils
+        from novels.services import UserCounterService
+
         user_profile = getattr(request.user, 'profile', None)
-        favorites = Favorite.objects.filter(user=request.user).select_related("novel")
-        user_like_novel_count = favorites.count()
-        # Get user's novel count
-        novel_count = 0
-        if hasattr(request.user, 'created_novels'):
-            novel_count = request.user.created_novels.filter(deleted_at__isnull=True).count()
+        user_id = request.user.pk
+        # Only templates that show the counts read the cache (and, on a miss, count)
+        counts = SimpleLazyObject(lambda: UserCounterService.get_counts(user_id))
         
         context.update({
             'user_profile': user_profile,
@@ -19,8 +21,8 @@ def user_context(request):
             'user_avatar': user_profile.get_avatar() if user_profile else None,
             'is_admin': request.user.role == UserRole.SYSTEM_ADMIN.value,
             'is_staff': request.user.role in [UserRole.WEBSITE_ADMIN.value, UserRole.SYSTEM_ADMIN.value],
-            'user_novel_count': novel_count,
-            'user_like_novel_count' : user_like_novel_count,
+            'user_novel_count': SimpleLazyObject(lambda: counts['novels']),
+            'user_like_novel_count': SimpleLazyObject(lambda: counts['favorites']),
             'DATE_FORMAT_DMY': DATE_FORMAT_DMY,
             'DATE_FORMAT_DMYHI': DATE_FORMAT_DMYHI,
         })
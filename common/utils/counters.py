@@ -0,0 +1,100 @@
+"""
+Denormalized counters and their set-based reconciliation.
+
+Apps declare their counters in a ``counters`` module; reconcile_counters
+finds them with autodiscover_modules and repairs them in keyset batches,
+one correlated-subquery UPDATE per batch instead of per-object saves.
+"""
+from typing import NamedTuple
+
+from django.db.models import F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+registry = {}
+
+
+class CounterReport(NamedTuple):
+    batches: int
+    drifted: int
+    fixed: int
+
+
+class DenormalizedCounter:
+    """
+    Counter columns on ``model`` computed from rows of ``source``.
+
+    ``link`` is the lookup from a source row to the model's primary key
+    (e.g. ``'volume__novel'``) and ``aggregates`` maps each counter field
+    to the aggregate over the linked source rows matching ``filter``.
+    Rows without any source row get ``default``.
+    """
+
+    def __init__(self, name, model, source, link, aggregates, filter=None, default=0):
+        self.name = name
+        self.model = model
+        self.source = source
+        self.link = link
+        self.aggregates = aggregates
+        self.filter = filter or Q()
+        self.default = default
+
+    def expected(self, field):
+        """Expression for the value ``field`` should hold"""
+        output_field = self.model._meta.get_field(field)
+        rows = (
+            self.source._default_manager.filter(self.filter, **{self.link: OuterRef('pk')})
+            .order_by()
+            .values(self.link)
+            .annotate(value=self.aggregates[field])
+            .values('value')
+        )
+        return Coalesce(
+            Subquery(rows, output_field=output_field),
+            Value(self.default, output_field=output_field),
+            output_field=output_field,
+        )
+
+    def drifted(self, queryset):
+        """Rows of ``queryset`` where any counter differs from its source"""
+        annotations = {f'expected_{field}': self.expected(field) for field in self.aggregates}
+        differs = Q()
+        for field in self.aggregates:
+            differs |= ~Q(**{field: F(f'expected_{field}')})
+        return queryset.annotate(**annotations).filter(differs)
+
+    def reconcile(self, batch_size, fix=False):
+        """Walk the model by primary key and report, or rewrite, drifted rows"""
+        batches = drifted = fixed = 0
+        lower = None
+        while True:
+            rows = self.model._default_manager.order_by('pk')
+            if lower is not None:
+                rows = rows.filter(pk__gt=lower)
+            bound = list(rows.values_list('pk', flat=True)[batch_size - 1:batch_size])
+            batch = rows.filter(pk__lte=bound[0]) if bound else rows
+
+            batch_drifted = self.drifted(batch)
+            count = batch_drifted.count()
+            if fix and count:
+                fixed += self.model._default_manager.filter(
+                    pk__in=batch_drifted.values('pk')
+                ).update(**{field: self.expected(field) for field in self.aggregates})
+            batches += 1
+            drifted += count
+
+            if not bound:
+                return CounterReport(batches, drifted, fixed)
+            lower = bound[0]
+
+
+def register(counter):
+    registry[counter.name] = counter
+    return counter
+
+
+def discover_counters():
+    """Import every installed app's ``counters`` module and return the registry"""
+    from django.utils.module_loading import autodiscover_modules
+
+    autodiscover_modules('counters')
+    return registry
@@ -0,0 +1,139 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+CURSOR_NEXT = 'n'
+CURSOR_PREVIOUS = 'p'
+
+
+class KeysetPage:
+    """One page of a KeysetPaginator, shaped like django.core.paginator.Page"""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None,
+                 total=None, total_is_exact=True):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.total = total
+        self.total_is_exact = total_is_exact
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Cursor pagination over an ordered queryset.
+
+    Every page is fetched with a WHERE on the sort columns instead of an
+    OFFSET, so page 10,000 costs the same as page 1 as long as the ordering
+    is backed by an index. The last column of ``ordering`` must be unique
+    (normally ``-id``) so that ties are broken deterministically.
+
+    Cursors are opaque URL-safe strings; an unreadable cursor falls back to
+    the first page. No COUNT(*) is issued unless ``count_limit`` is given,
+    in which case the total is counted up to that many rows only.
+    """
+
+    def __init__(self, queryset, ordering, per_page, count_limit=None):
+        self.queryset = queryset
+        self.ordering = [(name.lstrip('-'), name.startswith('-')) for name in ordering]
+        self.per_page = per_page
+        self.count_limit = count_limit
+
+    def get_page(self, cursor=None):
+        direction, values = self.decode_cursor(cursor)
+        backwards = direction == CURSOR_PREVIOUS
+
+        queryset = self.queryset.order_by(*self._order_by(reverse=backwards))
+        if values is not None:
+            queryset = queryset.filter(self._keyset_filter(values, backwards))
+
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backwards:
+            rows.reverse()
+
+        if backwards:
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+
+        total, total_is_exact = self._count()
+        return KeysetPage(
+            rows,
+            next_cursor=self.encode_cursor(CURSOR_NEXT, rows[-1]) if has_next and rows else None,
+            previous_cursor=self.encode_cursor(CURSOR_PREVIOUS, rows[0]) if has_previous and rows else None,
+            total=total,
+            total_is_exact=total_is_exact,
+        )
+
+    def encode_cursor(self, direction, obj):
+        values = [getattr(obj, name) for name, _ in self.ordering]
+        # isoformat() keeps microseconds, which DjangoJSONEncoder would truncate
+        payload = json.dumps(
+            [direction, values], default=lambda value: value.isoformat(), separators=(',', ':')
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        """Return (direction, values); (CURSOR_NEXT, None) means the first page"""
+        if not cursor:
+            return CURSOR_NEXT, None
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            direction, raw_values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if direction not in (CURSOR_NEXT, CURSOR_PREVIOUS) or len(raw_values) != len(self.ordering):
+                raise ValueError(cursor)
+            model_meta = self.queryset.model._meta
+            values = [
+                model_meta.get_field(name).to_python(value)
+                for (name, _), value in zip(self.ordering, raw_values)
+            ]
+        except (ValueError, TypeError, binascii.Error, ValidationError):
+            return CURSOR_NEXT, None
+        return direction, values
+
+    def _order_by(self, reverse=False):
+        return [
+            f'-{name}' if descending != reverse else name
+            for name, descending in self.ordering
+        ]
+
+    def _keyset_filter(self, values, backwards):
+        """(a < x) OR (a = x AND b < y) OR ... for the page after the cursor"""
+        condition = Q()
+        for index, (name, descending) in enumerate(self.ordering):
+            lookup = 'lt' if descending != backwards else 'gt'
+            clause = Q(**{f'{name}__{lookup}': values[index]})
+            for (prev_name, _), prev_value in zip(self.ordering[:index], values[:index]):
+                clause &= Q(**{prev_name: prev_value})
+            condition |= clause
+        return condition
+
+    def _count(self):
+        if self.count_limit is None:
+            return None, True
+        total = self.queryset.order_by()[:self.count_limit + 1].count()
+        if total > self.count_limit:
+            return self.count_limit, False
+        return total, True
@@ -1,204 +1,680 @@
+import os
 import json
+import time
+import uuid
+import atexit
+import select
+import socket
 import asyncio
+import bisect
 import logging
+import threading
 import weakref
+from collections import Counter, OrderedDict
+from contextlib import suppress
+from operator import itemgetter
 from typing import Dict, Set, Optional
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections as db_connections
 from django.http import StreamingHttpResponse
 from django.utils import timezone
+from django.utils.module_loading import import_string
 from django.core.serializers.json import DjangoJSONEncoder
 from asgiref.sync import sync_to_async
 from django.apps import AppConfig
 from constants import (
     MAX_TIME_RETRY_CONNECTION,
     MAX_QUEUE_SIZE,
-    DEFAULT_TIMEOUT
+    SSE_NOTIFY_PAYLOAD_LIMIT,
+    SSE_DATAGRAM_LIMIT,
+    SSE_BROKER_POLL_TIMEOUT,
+    SSE_BROKER_SEND_TIMEOUT,
+    SSE_BROKER_RECONNECT_SECONDS,
+    SSE_REPLAY_BUFFER_SIZE,
+    SSE_REPLAY_MAX_USERS,
+    SSE_REPLAY_TIMEOUT,
+    SSE_STATS_INTERVAL,
+    SSEBackpressure,
 )
 
 logger = logging.getLogger(__name__)
 
+NOTIFICATION = 'notification'
+NOTIFICATION_SUMMARY = 'notification_summary'
+
+
+def pack_events(events, limit):
+    """Gom các sự kiện (user_id, ...) thành các mảng JSON không quá limit byte"""
+    batch, size = [], 2
+    for event in events:
+        item = json.dumps(list(event), cls=DjangoJSONEncoder, ensure_ascii=False)
+        item_size = len(item.encode('utf-8')) + 1
+        if item_size + 2 > limit:
+            logger.warning(f"SSE event for user {event[0]} exceeds {limit} bytes, dropping")
+            continue
+        if batch and size + item_size > limit:
+            yield '[' + ','.join(batch) + ']'
+            batch, size = [], 2
+        batch.append(item)
+        size += item_size
+    if batch:
+        yield '[' + ','.join(batch) + ']'
+
+
+EVENT_ID_KEY = 'sse:event_id'
+
+
+def _reserve_event_ids(count):
+    cache.add(EVENT_ID_KEY, 0, None)
+    try:
+        return cache.incr(EVENT_ID_KEY, count)
+    except ValueError:
+        # Bị đẩy khỏi cache giữa add và incr
+        cache.add(EVENT_ID_KEY, 0, None)
+        return cache.incr(EVENT_ID_KEY, count)
+
+
+def next_event_ids(count):
+    """
+    Id cho count sự kiện từ bộ đếm chung trong cache.
+
+    Mọi publisher cùng tăng một khóa nên id theo đúng thứ tự cấp phát,
+    kể cả giữa các worker và máy có đồng hồ lệch nhau. Bộ đếm không bao
+    giờ đứng sau số micro giây hiện tại, để khi khóa bị xóa khỏi cache nó
+    không quay về id đã phát; với cache riêng từng process (LocMemCache)
+    id chỉ còn tăng dần trong process như đồng hồ.
+    """
+    last = _reserve_event_ids(count)
+    now = time.time_ns() // 1000
+    if last < now:
+        # Cả khoảng vừa tăng thêm thuộc về lần gọi này
+        last = cache.incr(EVENT_ID_KEY, now - last + count)
+    return range(last - count + 1, last + 1)
+
+
+def _append_event(entry, event_id, message, size):
+    """Thêm vào bộ đệm vòng của một user theo thứ tự id; floor là id cũ nhất đã bị đẩy ra"""
+    # Lô của publisher khác có thể đến sau dù id nhỏ hơn
+    bisect.insort(entry['events'], (event_id, message), key=itemgetter(0))
+    if len(entry['events']) > size:
+        entry['floor'] = max(entry['floor'], entry['events'].pop(0)[0])
+
+
+def _events_after(entry, last_id):
+    """Các sự kiện sau last_id, hoặc None nếu bộ đệm không chắc còn đủ"""
+    if entry is None or last_id < entry['floor']:
+        return None
+    return [(event_id, message) for event_id, message in entry['events'] if event_id > last_id]
+
+
+class MemoryReplayBuffer:
+    """
+    Bộ đệm phát lại trong bộ nhớ của từng process.
+
+    Mỗi process đã đăng ký broker ghi mọi sự kiện nhận được, kể cả của user
+    không kết nối ở đó, nên stream nối lại ở worker nào cũng phát lại được.
+    """
+
+    shared = False
+
+    def __init__(self, size=SSE_REPLAY_BUFFER_SIZE, max_users=SSE_REPLAY_MAX_USERS):
+        self.size = size
+        self.max_users = max_users
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, events):
+        with self._lock:
+            for user_id, event_id, message in events:
+                entry = self._entries.get(user_id)
+                if entry is None:
+                    # Sự kiện trước lần ghi đầu tiên không có trong process này
+                    entry = self._entries[user_id] = {'floor': event_id, 'events': []}
+                    if len(self._entries) > self.max_users:
+                        self._entries.popitem(last=False)
+                else:
+                    self._entries.move_to_end(user_id)
+                _append_event(entry, event_id, message, self.size)
+
+    def since(self, user_id, last_id):
+        with self._lock:
+            return _events_after(self._entries.get(user_id), last_id)
+
+
+class CacheReplayBuffer:
+    """
+    Bộ đệm phát lại trong cache mặc định, dùng chung khi CACHES là backend
+    dùng chung giữa các worker.
+
+    Bên publish ghi một lần cho mỗi lô. Hai lô ghi cùng lúc cho cùng một
+    user có thể làm mất một mục phát lại; giao trực tiếp không bị ảnh hưởng.
+    """
+
+    shared = True
+
+    def __init__(self, size=SSE_REPLAY_BUFFER_SIZE, timeout=SSE_REPLAY_TIMEOUT):
+        self.size = size
+        self.timeout = timeout
+
+    def key(self, user_id):
+        return f'sse:replay:{user_id}'
+
+    def record(self, events):
+        keys = {user_id: self.key(user_id) for user_id, _, _ in events}
+        entries = cache.get_many(list(keys.values()))
+        for user_id, event_id, message in events:
+            entry = entries.setdefault(keys[user_id], {'floor': event_id, 'events': []})
+            _append_event(entry, event_id, message, self.size)
+        cache.set_many(entries, self.timeout)
+
+    def since(self, user_id, last_id):
+        return _events_after(cache.get(self.key(user_id)), last_id)
+
+
+class LocalBroker:
+    """Chỉ giao trong process hiện tại: đủ cho runserver hoặc một worker"""
 
-class SSEManager:
     def __init__(self):
+        self._handlers = []
+
+    def subscribe(self, handler):
+        self._handlers.append(handler)
+
+    def publish(self, events):
+        for handler in self._handlers:
+            handler(events)
+
+    def close(self):
+        self._handlers.clear()
+
+
+class UnixSocketBroker:
+    """
+    Pub/sub qua datagram Unix socket trong SSE_BROKER_PATH.
+
+    Mỗi process đăng ký bind một socket riêng, publish gửi tới mọi socket
+    trong thư mục. Chỉ dùng được khi các worker chạy trên cùng một máy.
+    """
+
+    def __init__(self, path=None):
+        self.directory = str(path or settings.SSE_BROKER_PATH)
+        self._socket = None
+        self._path = None
+
+    def subscribe(self, handler):
+        os.makedirs(self.directory, exist_ok=True)
+        self._path = os.path.join(self.directory, f'{os.getpid()}-{uuid.uuid4().hex[:8]}.sock')
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._socket.bind(self._path)
+        self._socket.settimeout(SSE_BROKER_POLL_TIMEOUT)
+        atexit.register(self.close)
+        threading.Thread(
+            target=self._listen, args=(self._socket, handler), name='sse-broker', daemon=True
+        ).start()
+
+    def _listen(self, sock, handler):
+        while self._socket is sock:
+            try:
+                payload = sock.recv(SSE_DATAGRAM_LIMIT)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            try:
+                handler(json.loads(payload))
+            except Exception as e:
+                logger.error(f"Error dispatching SSE events: {e}")
+
+    def publish(self, events):
+        payloads = [payload.encode('utf-8') for payload in pack_events(events, SSE_DATAGRAM_LIMIT)]
+        if not payloads:
+            return
+        try:
+            names = [name for name in os.listdir(self.directory) if name.endswith('.sock')]
+        except FileNotFoundError:
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.settimeout(SSE_BROKER_SEND_TIMEOUT)
+            for name in names:
+                path = os.path.join(self.directory, name)
+                for payload in payloads:
+                    try:
+                        sock.sendto(payload, path)
+                    except (ConnectionRefusedError, FileNotFoundError):
+                        # Process đã thoát mà không dọn socket
+                        with suppress(FileNotFoundError):
+                            os.unlink(path)
+                        break
+                    except socket.timeout:
+                        logger.warning(f"SSE subscriber {name} is not keeping up, dropping events")
+                        break
+
+    def close(self):
+        sock, self._socket = self._socket, None
+        if sock is not None:
+            sock.close()
+            with suppress(FileNotFoundError):
+                os.unlink(self._path)
+
+
+class PostgresNotifyBroker:
+    """
+    LISTEN/NOTIFY của PostgreSQL, dùng được qua nhiều máy.
+
+    publish gọi pg_notify trên kết nối của Django nên sự kiện chỉ được gửi
+    khi transaction commit; mỗi process đăng ký giữ một kết nối LISTEN
+    riêng (API của psycopg2) trong một thread.
+    """
+
+    def __init__(self, channel=None, using=DEFAULT_DB_ALIAS):
+        self.channel = channel or settings.SSE_BROKER_CHANNEL
+        self.using = using
+        self._closed = False
+
+    def subscribe(self, handler):
+        threading.Thread(target=self._listen, args=(handler,), name='sse-broker', daemon=True).start()
+
+    def publish(self, events):
+        with db_connections[self.using].cursor() as cursor:
+            for payload in pack_events(events, SSE_NOTIFY_PAYLOAD_LIMIT):
+                cursor.execute('SELECT pg_notify(%s, %s)', [self.channel, payload])
+
+    def _listen(self, handler):
+        while not self._closed:
+            try:
+                self._listen_once(handler)
+            except Exception as e:
+                logger.error(f"SSE broker connection lost, reconnecting: {e}")
+            time.sleep(SSE_BROKER_RECONNECT_SECONDS)
+
+    def _listen_once(self, handler):
+        wrapper = db_connections[self.using]
+        conn = wrapper.get_new_connection(wrapper.get_connection_params())
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(f'LISTEN {wrapper.ops.quote_name(self.channel)}')
+            while not self._closed:
+                if not select.select([conn], [], [], SSE_BROKER_POLL_TIMEOUT)[0]:
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    try:
+                        handler(json.loads(notify.payload))
+                    except Exception as e:
+                        logger.error(f"Error dispatching SSE events: {e}")
+        finally:
+            conn.close()
+
+    def close(self):
+        self._closed = True
+
+
+class SSEManager:
+    """
+    Kết nối SSE của process hiện tại.
+
+    Mọi gửi đều đi qua broker (SSE_BROKER); process nào có kết nối thì
+    đăng ký với broker một lần và tự giao cho kết nối của mình, nên thông
+    báo đến được user dù request gửi chạy ở worker hay máy khác.
+
+    Sự kiện được đánh id khi publish và giữ trong bộ đệm phát lại
+    (SSE_REPLAY_BUFFER) để stream nối lại với Last-Event-ID nhận bù.
+
+    Mỗi SSE_STATS_INTERVAL giây, process ghi log số sự kiện bị bỏ, gộp và
+    kết nối bị ngắt do backpressure, rồi cộng vào tổng chung trong cache
+    để trang dashboard admin hiển thị.
+    """
+
+    STATS_KEY_PREFIX = 'sse_stats'
+    STAT_NAMES = ('dropped', 'coalesced', 'disconnected')
+
+    def __init__(self, broker=None, replay_buffer=None):
         self.connections: Dict[int, Set] = {}
-        self._lock = asyncio.Lock()
+        # dropped / coalesced / disconnected của các kết nối trong process này
+        self.stats = Counter()
+        self._reported = Counter()
+        # Thread của broker và event loop cùng đọc/ghi connections
+        self._lock = threading.Lock()
         self._shutdown = False
+        self._broker = broker
+        self._replay_buffer = replay_buffer
+        self._subscribed = False
+
+    @property
+    def broker(self):
+        if self._broker is None:
+            self._broker = import_string(settings.SSE_BROKER)()
+        return self._broker
+
+    @property
+    def replay_buffer(self):
+        if self._replay_buffer is None:
+            self._replay_buffer = import_string(settings.SSE_REPLAY_BUFFER)()
+        return self._replay_buffer
+
+    def subscribe(self):
+        """Nhận sự kiện từ broker; mỗi process chỉ đăng ký một lần"""
+        with self._lock:
+            if self._subscribed:
+                return
+            self._subscribed = True
+        self.broker.subscribe(self.dispatch)
+        threading.Thread(target=self._report_stats_forever, name='sse-stats', daemon=True).start()
+
+    def report_stats(self):
+        """Ghi log và cộng vào tổng chung phần stats tăng thêm từ lần báo trước"""
+        # Kết nối giữ tham chiếu tới self.stats, nên so với bản chụp thay vì thay Counter mới
+        current = self.stats.copy()
+        delta = current - self._reported
+        self._reported = current
+        if not delta:
+            return delta
+
+        logger.warning(
+            "SSE backpressure since last report: "
+            + ", ".join(f"{name}={delta[name]}" for name in self.STAT_NAMES)
+        )
+        for name, count in delta.items():
+            key = self._stats_key(name)
+            cache.add(key, 0, None)
+            cache.incr(key, count)
+        return delta
+
+    def shared_stats(self):
+        """Tổng stats của mọi process đã báo về cache"""
+        values = cache.get_many([self._stats_key(name) for name in self.STAT_NAMES])
+        return {name: values.get(self._stats_key(name), 0) for name in self.STAT_NAMES}
+
+    def _stats_key(self, name):
+        return f'{self.STATS_KEY_PREFIX}:{name}'
+
+    def _report_stats_forever(self):
+        while not self._shutdown:
+            time.sleep(SSE_STATS_INTERVAL)
+            try:
+                self.report_stats()
+            except Exception as e:
+                logger.error(f"Error reporting SSE stats: {e}")
 
     async def add_connection(self, user_id: int, connection):
-        async with self._lock:
+        with self._lock:
             if user_id not in self.connections:
                 self.connections[user_id] = set()
             self.connections[user_id].add(connection)
+        self.subscribe()
         logger.info(f"Added SSE connection for user {user_id}")
 
     async def remove_connection(self, user_id: int, connection):
-        async with self._lock:
+        self._discard(user_id, connection)
+        logger.info(f"Removed SSE connection for user {user_id}")
+
+    def _discard(self, user_id: int, connection):
+        with self._lock:
             if user_id in self.connections:
                 self.connections[user_id].discard(connection)
                 if not self.connections[user_id]:
                     del self.connections[user_id]
-        logger.info(f"Removed SSE connection for user {user_id}")
 
-    async def send_to_user(self, user_id: int, data: dict):
-        """Gửi data đến user"""
-        if self._shutdown:
+    def publish(self, events, replay=True):
+        """Gửi các cặp (user_id, data) tới mọi process qua broker; replay=False cho sự kiện không cần phát lại"""
+        if self._shutdown or not events:
             return
-            
-        async with self._lock:
-            if user_id not in self.connections:
-                return
-            connections = list(self.connections[user_id])
-
-        message = self._format_sse_message(data)
-        dead_connections = set()
-
-        for connection in connections:
-            try:
-                if hasattr(connection, 'send_message'):
-                    await connection.send_message(message)
-            except Exception as e:
-                logger.error(f"Error sending to connection: {e}")
-                dead_connections.add(connection)
-
-        if dead_connections:
-            async with self._lock:
-                for dc in dead_connections:
-                    if user_id in self.connections:
-                        self.connections[user_id].discard(dc)
-                if user_id in self.connections and not self.connections[user_id]:
-                    del self.connections[user_id]
+        if replay:
+            event_ids = next_event_ids(len(events))
+        else:
+            event_ids = [None] * len(events)
+        events = [(user_id, event_id, data) for (user_id, data), event_id in zip(events, event_ids)]
+        if replay and self.replay_buffer.shared:
+            self.replay_buffer.record([
+                (user_id, event_id, self._format_sse_message(data, event_id))
+                for user_id, event_id, data in events
+            ])
+        self.broker.publish(events)
+
+    async def send_to_user(self, user_id: int, data: dict, replay: bool = True):
+        """Gửi data đến user"""
+        await sync_to_async(self.publish)([(user_id, data)], replay)
+
+    def replay(self, user_id: int, last_event_id: int):
+        """(id, message) gửi sau last_event_id, hoặc None nếu không phát lại được"""
+        return self.replay_buffer.since(user_id, last_event_id)
+
+    def dispatch(self, events):
+        """Giao sự kiện nhận từ broker cho các kết nối trong process này"""
+        # Bộ đệm riêng của process ghi cả sự kiện của user không kết nối ở đây
+        local_buffer = not self.replay_buffer.shared
+        record = []
+        for user_id, event_id, data in events:
+            with self._lock:
+                connections = list(self.connections.get(user_id, ()))
+            keep = local_buffer and event_id is not None
+            if not connections and not keep:
+                continue
+            message = self._format_sse_message(data, event_id)
+            if keep:
+                record.append((user_id, event_id, message))
+            notifications = int(data.get('type') == NOTIFICATION)
+            for connection in connections:
+                try:
+                    connection.deliver(message, event_id, notifications)
+                except Exception as e:
+                    logger.error(f"Error sending to connection: {e}")
+                    self._discard(user_id, connection)
+        if record:
+            self.replay_buffer.record(record)
 
     async def shutdown(self):
         """Graceful shutdown tất cả connections"""
         self._shutdown = True
-        async with self._lock:
+        with self._lock:
             all_connections = []
             for user_connections in self.connections.values():
                 all_connections.extend(user_connections)
-            
-            for connection in all_connections:
-                try:
-                    connection.close()
-                except Exception as e:
-                    logger.error(f"Error closing connection: {e}")
-            
             self.connections.clear()
 
-    def _format_sse_message(self, data: dict) -> str:
+        for connection in all_connections:
+            try:
+                connection.close()
+            except Exception as e:
+                logger.error(f"Error closing connection: {e}")
+        if self._broker is not None:
+            self._broker.close()
+        self.report_stats()
+
+    def _format_sse_message(self, data: dict, event_id: Optional[int] = None) -> str:
         json_data = json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False)
-        return f"data: {json_data}\n\n"
+        if event_id is None:
+            return f"data: {json_data}\n\n"
+        return f"id: {event_id}\ndata: {json_data}\n\n"
 
 
 # Global SSE manager
 sse_manager = SSEManager()
 
 
+# Đặt vào queue khi connection đóng để đánh thức stream đang chờ
+CLOSED = object()
+
+
 class ASGISSEConnection:
-    def __init__(self, user_id: int):
+    """
+    Hàng đợi message của một stream.
+
+    Gửi không bao giờ chờ: khi queue đầy, chính sách backpressure
+    (SSE_BACKPRESSURE) bỏ message cũ nhất, gộp các thông báo liên tiếp ở
+    cuối queue hoặc ngắt kết nối, và ghi lại vào stats.
+    """
+
+    def __init__(self, user_id: int, backpressure: Optional[str] = None, stats: Optional[Counter] = None):
         self.user_id = user_id
+        # Phần tử: (event_id, message, số thông báo message đại diện)
         self.message_queue = asyncio.Queue(maxsize=MAX_QUEUE_SIZE)  # Giới hạn queue size
         self.closed = False
-        self._close_event = asyncio.Event()
+        self.backpressure = backpressure or settings.SSE_BACKPRESSURE
+        self.stats = stats if stats is not None else Counter()
+        # Broker giao message từ thread khác, phải quay về loop của stream
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._loop = None
 
-    async def send_message(self, message: str):
+    def _call(self, callback, *args):
+        """Chạy callback trên loop của stream, trực tiếp nếu đang ở loop đó"""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if self._loop is None or running is self._loop:
+            callback(*args)
+        else:
+            self._loop.call_soon_threadsafe(callback, *args)
+
+    def deliver(self, message: str, event_id: Optional[int] = None, notifications: int = 0):
+        """Đưa message vào queue, gọi được từ bất kỳ thread nào"""
         if not self.closed:
-            try:
-                # Non-blocking put với timeout
-                await asyncio.wait_for(
-                    self.message_queue.put(message), 
-                    timeout=1.0
-                )
-            except asyncio.TimeoutError:
-                logger.warning(f"Message queue full for user {self.user_id}, dropping message")
+            self._call(self._put, (event_id, message, notifications))
+
+    def _put(self, event):
+        if self.closed:
+            return
+        try:
+            self.message_queue.put_nowait(event)
+            return
+        except asyncio.QueueFull:
+            pass
+
+        if self.backpressure == SSEBackpressure.DISCONNECT:
+            self.stats['disconnected'] += 1
+            logger.warning(f"Message queue full for user {self.user_id}, disconnecting")
+            self.close()
+            return
+        if self.backpressure == SSEBackpressure.COALESCE and self._coalesce(event):
+            return
+        self.message_queue.get_nowait()
+        self.message_queue.put_nowait(event)
+        self.stats['dropped'] += 1
+        logger.warning(f"Message queue full for user {self.user_id}, dropping oldest message")
+
+    def _coalesce(self, event) -> bool:
+        """
+        Gộp dãy thông báo liên tiếp ở cuối queue (cùng event nếu là thông báo)
+        thành một sự kiện; False nếu dãy đó chưa tới hai thông báo.
+
+        Phần còn lại của queue giữ nguyên thứ tự, và sự kiện gộp mang id của
+        thông báo cuối dãy, nên Last-Event-ID dừng ở đó không bỏ sót gì.
+        """
+        pending = [self.message_queue.get_nowait() for _ in range(self.message_queue.qsize())]
+        start = len(pending)
+        while start and pending[start - 1][2]:
+            start -= 1
+        run = pending[start:]
+        if event[2]:
+            run.append(event)
+            after = []
+        else:
+            after = [event]
+        if len(run) < 2:
+            for item in pending:
+                self.message_queue.put_nowait(item)
+            return False
+
+        count = sum(item[2] for item in run)
+        event_id = run[-1][0]
+        summary = sse_manager._format_sse_message({
+            'type': NOTIFICATION_SUMMARY,
+            'data': {'count': count},
+        }, event_id)
+        for item in [*pending[:start], (event_id, summary, count), *after]:
+            self.message_queue.put_nowait(item)
+        self.stats['coalesced'] += len(run) - 1
+        return True
+
+    async def send_message(self, message: str):
+        self.deliver(message)
 
     async def get_message(self, timeout=1.0):
-        """Lấy message với timeout"""
+        """Lấy message với timeout; None khi hết giờ hoặc connection đã đóng"""
+        event = await self.next_event(timeout)
+        return event[1] if event else None
+
+    async def next_event(self, timeout=1.0):
+        """(event_id, message) kế tiếp; None khi hết giờ hoặc connection đã đóng"""
         if self.closed:
             return None
-            
+
         try:
-            return await asyncio.wait_for(self.message_queue.get(), timeout=timeout)
+            async with asyncio.timeout(timeout):
+                event = await self.message_queue.get()
         except asyncio.TimeoutError:
             return None
+        return None if event is CLOSED else event[:2]
 
     def close(self):
+        if self.closed:
+            return
         self.closed = True
-        self._close_event.set()
+        try:
+            self._call(self._wake)
+        except RuntimeError:
+            # Loop của stream đã đóng, không còn ai chờ
+            pass
 
-    async def wait_for_close(self):
-        """Wait for connection to be closed"""
-        await self._close_event.wait()
+    def _wake(self):
+        with suppress(asyncio.QueueFull):
+            # Queue đầy thì stream cũng không đang chờ
+            self.message_queue.put_nowait(CLOSED)
 
 
-async def sse_event_stream(user_id: int):
-    connection = ASGISSEConnection(user_id)
+async def sse_event_stream(user_id: int, last_event_id: Optional[int] = None):
+    connection = ASGISSEConnection(user_id, stats=sse_manager.stats)
     await sse_manager.add_connection(user_id, connection)
+    loop = asyncio.get_running_loop()
 
     try:
+        # Kết nối đã nhận sự kiện trước khi đọc bộ đệm nên không lỡ gì ở giữa;
+        # sự kiện vừa phát lại vừa đến trực tiếp thì bỏ bản sau
+        missed = None
+        if last_event_id is not None:
+            missed = await sync_to_async(sse_manager.replay)(user_id, last_event_id)
+        replayed = set()
+
         # Initial message
         initial_message = sse_manager._format_sse_message({
             'type': 'connection',
             'data': {
                 'status': 'connected',
                 'user_id': user_id,
+                'resumed': missed is not None,
                 'timestamp': timezone.now().isoformat()
             }
         })
         yield initial_message
 
-        last_sent = timezone.now()
-        heartbeat_task = None
+        for event_id, message in missed or ():
+            replayed.add(event_id)
+            yield message
 
+        # Chỉ một lần chờ trên queue cho mỗi message: thức dậy khi có message,
+        # khi connection đóng hoặc khi tới hạn heartbeat
+        heartbeat_at = loop.time() + MAX_TIME_RETRY_CONNECTION
         while not connection.closed and not sse_manager._shutdown:
-            try:
-                # Tạo timeout task cho việc lấy message
-                message_task = asyncio.create_task(connection.get_message(timeout=DEFAULT_TIMEOUT))
-                close_task = asyncio.create_task(connection.wait_for_close())
-                
-                # Wait for either message or close event
-                done, pending = await asyncio.wait(
-                    [message_task, close_task],
-                    timeout=DEFAULT_TIMEOUT,
-                    return_when=asyncio.FIRST_COMPLETED
-                )
-                
-                # Cancel pending tasks
-                for task in pending:
-                    task.cancel()
-                    try:
-                        await task
-                    except asyncio.CancelledError:
-                        pass
-
-                if close_task in done:
-                    # Connection closed
-                    break
-
-                message = None
-                if message_task in done:
-                    try:
-                        message = await message_task
-                    except Exception:
-                        pass
-
-                if message:
-                    yield message
-                    last_sent = timezone.now()
-                else:
-                    # Check for heartbeat
-                    if (timezone.now() - last_sent).total_seconds() >= MAX_TIME_RETRY_CONNECTION:
-                        heartbeat = {
-                            'type': 'heartbeat',
-                            'data': {'timestamp': timezone.now().isoformat()}
-                        }
-                        yield sse_manager._format_sse_message(heartbeat)
-                        last_sent = timezone.now()
-
-            except asyncio.CancelledError:
-                logger.info(f"SSE stream cancelled for user {user_id}")
-                break
-            except Exception as e:
-                logger.error(f"Error in SSE stream for user {user_id}: {e}")
+            event = await connection.next_event(timeout=max(heartbeat_at - loop.time(), 0))
+            if connection.closed:
                 break
+            if event is not None:
+                event_id, message = event
+                if event_id in replayed:
+                    continue
+            else:
+                message = sse_manager._format_sse_message({
+                    'type': 'heartbeat',
+                    'data': {'timestamp': timezone.now().isoformat()}
+                })
+            yield message
+            heartbeat_at = loop.time() + MAX_TIME_RETRY_CONNECTION
 
     except asyncio.CancelledError:
         logger.info(f"SSE stream cancelled for user {user_id}")
@@ -209,12 +685,12 @@ async def sse_event_stream(user_id: int):
         await sse_manager.remove_connection(user_id, connection)
 
 
-def create_sse_response(user_id: int) -> StreamingHttpResponse:
+def create_sse_response(user_id: int, last_event_id: Optional[int] = None) -> StreamingHttpResponse:
     """Tạo StreamingHttpResponse cho SSE trong môi trường ASGI"""
     
     async def async_stream():
         try:
-            async for chunk in sse_event_stream(user_id):
+            async for chunk in sse_event_stream(user_id, last_event_id):
                 yield chunk.encode('utf-8')
         except asyncio.CancelledError:
             logger.info(f"SSE stream cancelled for user {user_id}")
@@ -235,29 +711,44 @@ def create_sse_response(user_id: int) -> StreamingHttpResponse:
     return response
 
 
+def notification_payload(notification, redirect_url=None) -> dict:
+    notification_data = {
+        'type': NOTIFICATION,
+        'data': {
+            'id': notification.id,
+            'title': notification.title,
+            'content': notification.content,
+            'notification_type': notification.type,
+            'is_read': notification.is_read,
+            'created_at': notification.created_at.isoformat(),
+        }
+    }
+    if redirect_url:
+        notification_data['data']['redirect_url'] = redirect_url
+    return notification_data
+
+
 async def send_notification_to_user(user_id: int, notification, redirect_url=None):
     """Gửi thông báo đến user qua SSE"""
     try:
-        notification_data = {
-            'type': 'notification',
-            'data': {
-                'id': notification.id,
-                'title': notification.title,
-                'content': notification.content,
-                'notification_type': notification.type,
-                'is_read': notification.is_read,
-                'created_at': notification.created_at.isoformat(),
-            }
-        }
-        if redirect_url:
-            notification_data['data']['redirect_url'] = redirect_url
-            
+        notification_data = notification_payload(notification, redirect_url)
         await sse_manager.send_to_user(user_id, notification_data)
         logger.info(f"Sent notification to user {user_id}")
     except Exception as e:
         logger.error(f"Error sending notification via SSE: {e}")
 
 
+async def send_notifications_to_users(notifications, redirect_url=None):
+    """Gửi một lô thông báo qua SSE bằng một lần publish"""
+    try:
+        await sync_to_async(sse_manager.publish)([
+            (n.user_id, notification_payload(n, redirect_url)) for n in notifications
+        ])
+        logger.info(f"Published {len(notifications)} notifications")
+    except Exception as e:
+        logger.error(f"Error sending notifications via SSE: {e}")
+
+
 # Sync wrapper cho trường hợp cần gọi từ sync code
 def send_notification_to_user_sync(user_id: int, notification, redirect_url=None):
     """Sync wrapper cho send_notification_to_user"""
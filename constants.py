@@ -91,6 +91,25 @@ class ReportStatusChoices:
         (RESOLVED, _('Đã xử lý')),
     )
 
+class FanoutStatusChoices:
+    PENDING = 'PENDING'
+    RUNNING = 'RUNNING'
+    DONE = 'DONE'
+    FAILED = 'FAILED'
+
+    CHOICES = (
+        (PENDING, _('Chờ gửi')),
+        (RUNNING, _('Đang gửi')),
+        (DONE, _('Đã gửi xong')),
+        (FAILED, _('Lỗi')),
+    )
+
+class SSEBackpressure:
+    """What a stream does with a new event when its queue is full (SSE_BACKPRESSURE)"""
+    DROP_OLDEST = 'drop_oldest'
+    COALESCE = 'coalesce'  # Fold queued notifications into one "N new notifications" event
+    DISCONNECT = 'disconnect'  # The client reconnects and catches up from the replay buffer
+
 START_POSITION_DEFAULT = 1
 PROGRESS_DEFAULT = 0.0
 COUNT_DEFAULT = 0
@@ -118,6 +137,8 @@ MAX_SESSION_REMEMBER = 1209600
 MAX_RATE = 5
 MAX_TOKEN_LENGTH = 255
 MAX_LIMIT_CHUNKS = 5
+MAX_CHUNK_RANGE_LIMIT = 50  # Server-side cap on chunks returned per window
+CHUNK_STREAM_THRESHOLD = 20  # Windows larger than this are streamed as NDJSON
 MAX_LIKE_NOVELS =18
 MAX_TREND_NOVELS =30
 MAX_MOST_READ_NOVELS =12
@@ -128,6 +149,7 @@ MAX_NEWUPDATE_NOVELS =12
 MAX_LATEST_CHAPTER = 12
 MIN_LATEST_CHAPTER = 1
 MAX_HOME_COMMENTS = 10  # Maximum comments to show on home page
+MAX_HOME_NEW_NOVELS = 11  # New novel cards shown on home page
 MAX_RANDOM_STRING_LENGTH = 10
 MAX_SESSION_REMEMBER = 2592000  # 30 days
 MAX_TIME_RETRY_CONNECTION = 30
@@ -185,14 +207,43 @@ PAGINATION_TEMPLATE_PATH = 'admin/includes/pagination_range.html'  # Template pa
 PAGINATION_MIN_PAGE = 1  # Minimum page number
 PAGINATION_ELLIPSIS_THRESHOLD = 2  # Page difference threshold for showing ellipsis
 PAGINATION_MIN_PAGES_TO_SHOW = 1  # Minimum number of pages required to show pagination
+KEYSET_COUNT_LIMIT = 1000  # Keyset pages count at most this many rows for the approximate total
 
 # Chunking configuration
 MAX_CHUNK_SIZE = 10000  # Maximum size for a chunk in characters
+CHUNK_COMPRESSION_MIN_SIZE = 256  # Shorter chunks stay inline even when compression is on
+CHUNK_COMPRESSION_LEVEL = 6
+CHUNK_BULK_BATCH_SIZE = 100  # Rows per bulk_create/bulk_update statement when re-chunking
+IMPORT_BATCH_SIZE = 5000  # Chunks written per transaction by import_novels
+IMPORT_PREFETCH_PER_WORKER = 4  # Records in flight per import worker process
 
 # HTML Chunker constants
 HTML_TAG_OVERHEAD = 20  # Buffer size for HTML tags like <p></p>
 BEAUTIFULSOUP_PARSER = 'html.parser'
 HTML_BLOCK_ELEMENTS = ['p', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']
+# Tree building rules of BeautifulSoup's html.parser builder, which the
+# streaming HtmlChunker follows so its chunks match the legacy chunker's
+HTML_VOID_ELEMENTS = [
+    'area', 'base', 'basefont', 'bgsound', 'br', 'col', 'command', 'embed',
+    'frame', 'hr', 'image', 'img', 'input', 'isindex', 'keygen', 'link',
+    'menuitem', 'meta', 'nextid', 'param', 'source', 'spacer', 'track', 'wbr',
+]
+HTML_PRESERVE_WHITESPACE_ELEMENTS = ['pre', 'textarea']
+HTML_UNCOUNTED_TEXT_ELEMENTS = ['rt', 'rp', 'style', 'script', 'template']  # Their text is not part of get_text()
+HTML_LIST_ATTRIBUTES = {  # Whitespace-separated attribute values, normalized to single spaces
+    '*': ['class', 'accesskey', 'dropzone'],
+    'a': ['rel', 'rev'],
+    'link': ['rel', 'rev'],
+    'td': ['headers'],
+    'th': ['headers'],
+    'form': ['accept-charset'],
+    'object': ['archive'],
+    'area': ['rel'],
+    'icon': ['sizes'],
+    'iframe': ['sandbox'],
+    'output': ['for'],
+}
+HTML_CHUNKER_FEED_SIZE = 64 * 1024  # Characters handed to the HTML parser at a time
 
 # Reading constants
 WORDS_PER_MINUTE = 200  # Average reading speed for time estimation
@@ -219,6 +270,58 @@ SECONDS_PER_MINUTE = 60
 SEARCH_RESULTS_LIMIT = 20  # Limit for search results
 COMMENT_TRUNCATE_LENGTH = 200  # Length to truncate comments
 
+# Homepage snapshot cache
+HOME_SNAPSHOT_TIMEOUT = 600  # Fresh section lifetime in seconds
+HOME_SNAPSHOT_STALE_TIMEOUT = 86400  # Stale copy served while another worker rebuilds
+HOME_SNAPSHOT_LOCK_TIMEOUT = 30  # Rebuild lock lifetime in seconds
+HOME_SNAPSHOT_LOCK_WAIT = 2.0  # Max seconds to wait for another worker's rebuild
+HOME_SNAPSHOT_POLL_INTERVAL = 0.05
+CHAPTER_NAV_INDEX_TIMEOUT = 86400  # Per-novel chapter navigation index, dropped by signals
+CHAPTER_CONTENT_CACHE_TIMEOUT = 86400  # Compressed chunks, keyed by chapter id + updated_at
+USER_COUNTERS_TIMEOUT = 86400  # Per-user sidebar counts, dropped by signals
+
+# Batch size for backfill / reconcile management commands
+RECONCILE_BATCH_SIZE = 1000
+
+# Trending score: exponentially decayed activity weights
+TRENDING_HALF_LIFE_HOURS = 72
+TRENDING_LOOKBACK_DAYS = 30  # Window scanned when there is no previous run
+TRENDING_MIN_SCORE = 0.01  # Rows decayed below this are pruned
+TRENDING_STALE_HOURS = 24  # Trending falls back to view count when no score is newer than this
+TRENDING_VIEW_WEIGHT = 1.0
+TRENDING_FAVORITE_WEIGHT = 5.0
+TRENDING_REVIEW_WEIGHT = 8.0
+TRENDING_COMMENT_WEIGHT = 3.0
+
+# Buffered view counts (see ViewCountService)
+VIEW_BUFFER_DRAIN_SECONDS = 10  # In-process view deltas move to the shared buffer at most this often
+VIEW_BUFFER_MAX_KEYS = 500  # ...or as soon as this many novels/chapters have pending views
+VIEW_DEDUPE_SECONDS = 30 * 60  # Repeat views of a page by one viewer within this window count once
+VIEW_FLUSH_INTERVAL = 60  # Seconds between flushes with flush_view_counts --loop
+
+# Per-novel daily statistics (see DailyStatsService)
+DAILY_STATS_LOOKBACK_DAYS = 30  # Window rolled up when there is no previous run
+DAILY_STATS_SETTLE_SECONDS = 60  # Events this recent are left for the next run
+DASHBOARD_CHART_DAYS = 30
+DASHBOARD_TOP_LIMIT = 5
+
+# New-chapter notification fan-out (see NotificationFanoutService)
+MAX_FANOUT_STATUS_LENGTH = 10
+NOTIFICATION_FANOUT_BATCH_SIZE = 1000  # Followers notified per bulk insert and SSE round
+NOTIFICATION_FANOUT_STALE_SECONDS = 300  # A running fan-out silent this long is taken over
+NOTIFICATION_FANOUT_POLL_INTERVAL = 5  # Seconds between checks with send_notification_fanouts --loop
+
+# Cross-process SSE delivery (see SSE_BROKER)
+SSE_NOTIFY_PAYLOAD_LIMIT = 7900  # Bytes per pg_notify; PostgreSQL caps payloads at 8000
+SSE_DATAGRAM_LIMIT = 64 * 1024  # Bytes per Unix datagram
+SSE_BROKER_POLL_TIMEOUT = 5  # Seconds a broker thread waits before checking for shutdown
+SSE_BROKER_SEND_TIMEOUT = 1.0  # Seconds to wait on a subscriber that is not reading
+SSE_BROKER_RECONNECT_SECONDS = 5
+SSE_REPLAY_BUFFER_SIZE = 100  # Recent events kept per user for Last-Event-ID resume
+SSE_REPLAY_MAX_USERS = 10000  # Users kept by each process's in-memory replay buffer
+SSE_REPLAY_TIMEOUT = 3600  # Seconds a user's events stay in the cache replay buffer
+SSE_STATS_INTERVAL = 60  # Seconds between reports of each process's SSE backpressure counters
+
 # Constants for attempting
 MAX_ATTEMPTS = 10
 
@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "docwn.settings")
 
 application = get_asgi_application()
+
+# Server processes move buffered page views to the shared buffer even when idle
+from novels.services import ViewCountService  # noqa: E402
+
+ViewCountService.start_drainer()
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import tempfile
 import dj_database_url
 from dotenv import load_dotenv
 from django.contrib.messages import constants as messages
@@ -164,6 +165,54 @@ else:
         }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# LocMemCache is per-process; point CACHE_BACKEND/CACHE_LOCATION at a shared
+# backend (e.g. DatabaseCache) when running several gunicorn workers.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'docwn-default'),
+    }
+}
+
+# Store new or edited Chunk.content zlib-compressed (see compress_chunks)
+CHUNK_COMPRESSION = os.getenv('CHUNK_COMPRESSION', 'False').lower() == 'true'
+
+# Page views are buffered and applied by flush_view_counts. FileViewBuffer
+# only works when every worker runs on one host; dedupe uses the cache, so
+# it is per-process with LocMemCache.
+VIEW_COUNT_BUFFER = os.getenv('VIEW_COUNT_BUFFER', 'novels.services.view_count_service.DatabaseViewBuffer')
+VIEW_COUNT_BUFFER_PATH = os.getenv('VIEW_COUNT_BUFFER_PATH', str(BASE_DIR / 'view_counts.buffer'))
+VIEW_COUNT_DEDUPE = os.getenv('VIEW_COUNT_DEDUPE', 'True').lower() == 'true'
+
+# New-chapter notifications are sent in batches after the approval commits:
+# in a background thread of the web process when this is on, and by
+# send_notification_fanouts (which also resumes interrupted runs) either way.
+NOTIFICATION_FANOUT_THREAD = os.getenv('NOTIFICATION_FANOUT_THREAD', 'True').lower() == 'true'
+
+
+# SSE events are published through this broker and delivered by whichever
+# worker holds the user's stream. LocalBroker only reaches streams in the
+# publishing process; UnixSocketBroker spans the workers of one host and
+# PostgresNotifyBroker (the default on PostgreSQL) spans hosts.
+# Event ids come from a counter in CACHES; with more than one worker use a
+# shared backend so ids follow publish order across publishers.
+SSE_BROKER = os.getenv(
+    'SSE_BROKER',
+    'common.utils.sse.PostgresNotifyBroker'
+    if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql'
+    else 'common.utils.sse.LocalBroker'
+)
+SSE_BROKER_CHANNEL = os.getenv('SSE_BROKER_CHANNEL', 'docwn_sse')
+SSE_BROKER_PATH = os.getenv('SSE_BROKER_PATH', os.path.join(tempfile.gettempdir(), 'docwn-sse'))
+# Recent events replayed to a stream that reconnects with Last-Event-ID.
+# MemoryReplayBuffer keeps a copy in every subscribed worker;
+# CacheReplayBuffer shares one through CACHES, so it needs a shared backend.
+SSE_REPLAY_BUFFER = os.getenv('SSE_REPLAY_BUFFER', 'common.utils.sse.MemoryReplayBuffer')
+# drop_oldest, coalesce or disconnect; see constants.SSEBackpressure
+SSE_BACKPRESSURE = os.getenv('SSE_BACKPRESSURE', 'coalesce')
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
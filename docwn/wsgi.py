@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "docwn.settings")
 
 application = get_wsgi_application()
+
+# Server processes move buffered page views to the shared buffer even when idle
+from novels.services import ViewCountService  # noqa: E402
+
+ViewCountService.start_drainer()
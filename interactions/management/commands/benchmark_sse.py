@@ -0,0 +1,135 @@
+import asyncio
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from common.utils.sse import sse_event_stream, sse_manager
+from constants import DEFAULT_TIMEOUT, MAX_QUEUE_SIZE, MAX_TIME_RETRY_CONNECTION
+
+
+class LegacyConnection:
+    """The connection the stream used before it waited on its queue alone"""
+
+    def __init__(self):
+        self.message_queue = asyncio.Queue(maxsize=MAX_QUEUE_SIZE)
+        self.closed = False
+        self._close_event = asyncio.Event()
+
+    async def get_message(self, timeout=1.0):
+        try:
+            return await asyncio.wait_for(self.message_queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def wait_for_close(self):
+        await self._close_event.wait()
+
+
+async def legacy_event_stream(user_id):
+    """The previous sse_event_stream loop: two tasks per poll of DEFAULT_TIMEOUT"""
+    connection = LegacyConnection()
+    yield sse_manager._format_sse_message({
+        'type': 'connection',
+        'data': {'status': 'connected', 'user_id': user_id, 'timestamp': timezone.now().isoformat()}
+    })
+    last_sent = timezone.now()
+    while not connection.closed:
+        message_task = asyncio.create_task(connection.get_message(timeout=DEFAULT_TIMEOUT))
+        close_task = asyncio.create_task(connection.wait_for_close())
+        done, pending = await asyncio.wait(
+            [message_task, close_task],
+            timeout=DEFAULT_TIMEOUT,
+            return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in pending:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if close_task in done:
+            break
+        message = await message_task if message_task in done else None
+        if message:
+            yield message
+            last_sent = timezone.now()
+        elif (timezone.now() - last_sent).total_seconds() >= MAX_TIME_RETRY_CONNECTION:
+            yield sse_manager._format_sse_message({
+                'type': 'heartbeat',
+                'data': {'timestamp': timezone.now().isoformat()}
+            })
+            last_sent = timezone.now()
+
+
+class Command(BaseCommand):
+    help = 'Hold many idle SSE streams and compare CPU and memory per stream with the previous loop'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--connections',
+            type=int,
+            default=10_000,
+            help='Concurrent idle streams'
+        )
+        parser.add_argument(
+            '--duration',
+            type=float,
+            default=MAX_TIME_RETRY_CONNECTION,
+            help='Seconds the streams are held idle while CPU time is measured'
+        )
+
+    def handle(self, *args, **options):
+        count = options['connections']
+        duration = options['duration']
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\n=== SSE IDLE STREAM BENCHMARK ({count:,} streams, {duration:g} s idle) ===\n'
+        ))
+        for name, open_stream in (
+            ('legacy', legacy_event_stream),
+            ('current', sse_event_stream),
+        ):
+            memory, cpu = asyncio.run(self.hold(open_stream, count, duration))
+            cpu_per_minute = cpu * 1000 / count * 60 / duration
+            self.stdout.write(
+                f'  {name:<8} CPU {cpu * 1000:9.1f} ms  '
+                f'{cpu_per_minute:7.3f} ms/stream/min  '
+                f'memory {memory / count / 1024:6.2f} KB/stream'
+            )
+
+    async def hold(self, open_stream, count, duration):
+        """(bytes allocated for ``count`` open streams, CPU seconds spent while they idle)"""
+        opened = 0
+        ready = asyncio.Event()
+
+        async def consume(stream):
+            nonlocal opened
+            first = True
+            async for _ in stream:
+                if first:
+                    first = False
+                    opened += 1
+                    if opened == count:
+                        ready.set()
+
+        tracemalloc.start()
+        try:
+            baseline = tracemalloc.get_traced_memory()[0]
+            tasks = [asyncio.create_task(consume(open_stream(user_id))) for user_id in range(1, count + 1)]
+            await ready.wait()
+            # Let every stream reach its idle wait
+            await asyncio.sleep(0.1)
+            memory = tracemalloc.get_traced_memory()[0] - baseline
+        finally:
+            tracemalloc.stop()
+
+        start = time.process_time()
+        await asyncio.sleep(duration)
+        cpu = time.process_time() - start
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return memory, cpu
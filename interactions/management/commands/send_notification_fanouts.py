@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from interactions.models import NotificationFanout
+from interactions.services import NotificationFanoutService
+from constants import (
+    FanoutStatusChoices,
+    NOTIFICATION_FANOUT_BATCH_SIZE,
+    NOTIFICATION_FANOUT_POLL_INTERVAL,
+)
+
+
+class Command(BaseCommand):
+    help = 'Send pending or interrupted new-chapter notification fan-outs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=NOTIFICATION_FANOUT_BATCH_SIZE,
+            help='Followers notified per batch'
+        )
+        parser.add_argument(
+            '--retry-failed',
+            action='store_true',
+            help='Queue failed fan-outs again; they resume after the last batch sent'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and check for work every --interval seconds'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=NOTIFICATION_FANOUT_POLL_INTERVAL,
+            help='Seconds between checks with --loop'
+        )
+
+    def handle(self, *args, **options):
+        if options['retry_failed']:
+            NotificationFanout.objects.filter(status=FanoutStatusChoices.FAILED).update(
+                status=FanoutStatusChoices.PENDING, error=''
+            )
+
+        while True:
+            sent = 0
+            for fanout_id in NotificationFanoutService.claimable():
+                try:
+                    created = NotificationFanoutService.process(fanout_id, batch_size=options['batch_size'])
+                except Exception as e:
+                    self.stderr.write(f'Fan-out {fanout_id} failed: {e}')
+                    continue
+                if created is not None:
+                    sent += 1
+                    self.stdout.write(f'Fan-out {fanout_id}: {created} notifications')
+            self.stdout.write(f'Fan-outs sent: {sent}')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS('Notification fan-outs processed.'))
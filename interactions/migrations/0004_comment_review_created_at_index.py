@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-16 23:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("interactions", "0003_remove_notification_related_comment_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["created_at"], name="interaction_created_fbcd4f_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["created_at"], name="interaction_created_a0ae64_idx"
+            ),
+        ),
+    ]
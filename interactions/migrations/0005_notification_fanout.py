@@ -0,0 +1,79 @@
+# Generated by Django 5.2.4 on 2026-10-17 00:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("interactions", "0004_comment_review_created_at_index"),
+        ("novels", "0014_novel_daily_stats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationFanout",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PENDING", "Chờ gửi"),
+                            ("RUNNING", "Đang gửi"),
+                            ("DONE", "Đã gửi xong"),
+                            ("FAILED", "Lỗi"),
+                        ],
+                        db_index=True,
+                        default="PENDING",
+                        max_length=10,
+                        verbose_name="Trạng thái",
+                    ),
+                ),
+                (
+                    "total",
+                    models.IntegerField(default=0, verbose_name="Số người theo dõi"),
+                ),
+                ("sent", models.IntegerField(default=0, verbose_name="Đã gửi")),
+                ("last_favorite_id", models.BigIntegerField(default=0)),
+                ("error", models.TextField(blank=True, verbose_name="Lỗi")),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Ngày tạo"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Ngày cập nhật"),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Ngày hoàn tất"
+                    ),
+                ),
+                (
+                    "chapter",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="notification_fanouts",
+                        to="novels.chapter",
+                        verbose_name="Chương",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Gửi thông báo chương mới",
+                "verbose_name_plural": "Gửi thông báo chương mới",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
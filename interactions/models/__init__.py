@@ -2,3 +2,4 @@ from .comment import Comment
 from .notification import Notification
 from .report import Report
 from .review import Review
+from .notification_fanout import NotificationFanout
@@ -52,6 +52,7 @@ class Comment(models.Model):
         indexes = [
             models.Index(fields=['novel', '-created_at']),
             models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['created_at']),
             models.Index(fields=['parent_comment']),
         ]
 
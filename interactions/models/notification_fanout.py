@@ -0,0 +1,52 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from novels.models import Chapter
+from constants import (
+    COUNT_DEFAULT,
+    MAX_FANOUT_STATUS_LENGTH,
+    FanoutStatusChoices,
+)
+
+
+class NotificationFanout(models.Model):
+    """Thông báo chương mới gửi tới người theo dõi truyện theo từng lô"""
+    chapter = models.ForeignKey(
+        Chapter,
+        on_delete=models.CASCADE,
+        verbose_name=_("Chương"),
+        related_name='notification_fanouts'
+    )
+    status = models.CharField(
+        max_length=MAX_FANOUT_STATUS_LENGTH,
+        choices=FanoutStatusChoices.CHOICES,
+        default=FanoutStatusChoices.PENDING,
+        db_index=True,
+        verbose_name=_("Trạng thái")
+    )
+    total = models.IntegerField(default=COUNT_DEFAULT, verbose_name=_("Số người theo dõi"))
+    sent = models.IntegerField(default=COUNT_DEFAULT, verbose_name=_("Đã gửi"))
+    # Favorite.id of the last follower notified; batches resume after it
+    last_favorite_id = models.BigIntegerField(default=COUNT_DEFAULT)
+    error = models.TextField(blank=True, verbose_name=_("Lỗi"))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Ngày tạo"))
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Ngày cập nhật"))
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Ngày hoàn tất"))
+
+    class Meta:
+        verbose_name = _("Gửi thông báo chương mới")
+        verbose_name_plural = _("Gửi thông báo chương mới")
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.chapter} - {self.sent}/{self.total}"
+
+    @property
+    def percent(self):
+        if not self.total:
+            return 100 if self.status == FanoutStatusChoices.DONE else 0
+        return min(100, round(self.sent * 100 / self.total))
+
+    @property
+    def is_active(self):
+        return self.status in (FanoutStatusChoices.PENDING, FanoutStatusChoices.RUNNING)
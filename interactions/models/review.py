@@ -41,6 +41,7 @@ class Review(models.Model):
         indexes = [
             models.Index(fields=['novel', '-created_at']),
             models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['created_at']),
             models.Index(fields=['rating']),
         ]
 
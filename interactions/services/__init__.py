@@ -2,3 +2,4 @@ from .report_service import *
 from .review_service import *
 from .comment_service import *
 from .notification_service import *
+from .notification_fanout_service import *
@@ -0,0 +1,163 @@
+import logging
+import threading
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, connections, transaction
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from common.utils.sse import send_notifications_to_users
+from interactions.models import Notification, NotificationFanout
+from novels.models import Chapter, Favorite
+from constants import (
+    FanoutStatusChoices,
+    NOTIFICATION_FANOUT_BATCH_SIZE,
+    NOTIFICATION_FANOUT_STALE_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+NEW_CHAPTER = "NEW_CHAPTER"
+
+
+class NotificationFanoutService:
+    """
+    New-chapter notifications for every follower of a novel, off the request.
+
+    Approving a chapter only records a NotificationFanout. The fan-out then
+    walks the novel's favorites by id, inserting one batch of notifications
+    per transaction together with its cursor and pushing the batch over SSE
+    in one round, so an interrupted run resumes where it stopped.
+    """
+
+    @staticmethod
+    def enqueue(chapter):
+        """Record a fan-out for a newly approved chapter and start it once the approval commits"""
+        fanout = NotificationFanout.objects.create(
+            chapter=chapter,
+            total=Favorite.objects.filter(novel_id=chapter.volume.novel_id).count(),
+        )
+        if settings.NOTIFICATION_FANOUT_THREAD:
+            transaction.on_commit(lambda: NotificationFanoutService.start_thread(fanout.pk))
+        return fanout
+
+    @staticmethod
+    def start_thread(fanout_id):
+        threading.Thread(
+            target=NotificationFanoutService._run_in_thread,
+            args=(fanout_id,),
+            name=f'notification-fanout-{fanout_id}',
+            daemon=True,
+        ).start()
+
+    @staticmethod
+    def _run_in_thread(fanout_id):
+        try:
+            NotificationFanoutService.process(fanout_id)
+        except Exception:
+            logger.exception("Notification fan-out %s failed", fanout_id)
+        finally:
+            connections.close_all()
+
+    @staticmethod
+    def claim(fanout_id):
+        """Mark a pending, or abandoned running, fan-out as ours; False if someone else has it"""
+        now = timezone.now()
+        stale = now - timedelta(seconds=NOTIFICATION_FANOUT_STALE_SECONDS)
+        return NotificationFanout.objects.filter(
+            Q(status=FanoutStatusChoices.PENDING)
+            | Q(status=FanoutStatusChoices.RUNNING, updated_at__lt=stale),
+            pk=fanout_id,
+        ).update(status=FanoutStatusChoices.RUNNING, updated_at=now) == 1
+
+    @staticmethod
+    def claimable():
+        """Ids of the fan-outs send_notification_fanouts should run"""
+        stale = timezone.now() - timedelta(seconds=NOTIFICATION_FANOUT_STALE_SECONDS)
+        return list(
+            NotificationFanout.objects.filter(
+                Q(status=FanoutStatusChoices.PENDING)
+                | Q(status=FanoutStatusChoices.RUNNING, updated_at__lt=stale)
+            ).order_by('created_at').values_list('pk', flat=True)
+        )
+
+    @staticmethod
+    def process(fanout_id, batch_size=NOTIFICATION_FANOUT_BATCH_SIZE):
+        """Run a fan-out to the end; return notifications created, or None if it was not claimed"""
+        if not NotificationFanoutService.claim(fanout_id):
+            return None
+
+        fanout = NotificationFanout.objects.select_related('chapter__volume__novel').get(pk=fanout_id)
+        chapter = fanout.chapter
+        novel = chapter.volume.novel
+        template = {
+            'type': NEW_CHAPTER,
+            'title': _("Truyện '%(novel_name)s' có chương mới") % {"novel_name": novel.name},
+            'content': _("Chương '%(chapter_title)s' vừa được duyệt và hiển thị.") % {"chapter_title": chapter.title},
+            'content_type': ContentType.objects.get_for_model(Chapter),
+            'object_id': chapter.id,
+        }
+        redirect_url = reverse(
+            "novels:chapter_detail",
+            kwargs={"novel_slug": novel.slug, "chapter_slug": chapter.slug},
+        )
+
+        created = 0
+        try:
+            while True:
+                with transaction.atomic():
+                    followers = list(
+                        Favorite.objects.filter(novel_id=novel.id, id__gt=fanout.last_favorite_id)
+                        .order_by('id')
+                        .values_list('id', 'user_id')[:batch_size]
+                    )
+                    if not followers:
+                        break
+                    notifications = Notification.objects.bulk_create(
+                        [Notification(user_id=user_id, **template) for favorite_id, user_id in followers]
+                    )
+                    NotificationFanoutService._fill_ids(notifications, template)
+                    fanout.last_favorite_id = followers[-1][0]
+                    fanout.sent += len(notifications)
+                    fanout.save(update_fields=['last_favorite_id', 'sent', 'updated_at'])
+                created += len(notifications)
+
+                async_to_sync(send_notifications_to_users)(notifications, redirect_url)
+                if len(followers) < batch_size:
+                    break
+        except Exception as e:
+            NotificationFanout.objects.filter(pk=fanout_id).update(
+                status=FanoutStatusChoices.FAILED, error=str(e), updated_at=timezone.now()
+            )
+            raise
+
+        # Followers who arrived after the approval are notified as well
+        fanout.total = max(fanout.total, fanout.sent)
+        fanout.status = FanoutStatusChoices.DONE
+        fanout.finished_at = timezone.now()
+        fanout.save(update_fields=['total', 'status', 'finished_at', 'updated_at'])
+        return created
+
+    @staticmethod
+    def _fill_ids(notifications, template):
+        """Read back ids on backends whose bulk insert does not return them (MySQL)"""
+        if connection.features.can_return_rows_from_bulk_insert:
+            return
+        ids = dict(
+            Notification.objects.filter(
+                content_type=template['content_type'],
+                object_id=template['object_id'],
+                user_id__in=[n.user_id for n in notifications],
+            ).order_by('id').values_list('user_id', 'id')
+        )
+        for notification in notifications:
+            notification.id = ids.get(notification.user_id)
+
+    @staticmethod
+    def latest_for_chapter(chapter):
+        return NotificationFanout.objects.filter(chapter=chapter).order_by('-created_at').first()
@@ -1,11 +1,12 @@
 from django.core.paginator import Paginator
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from django.db.models import Q
 from django.shortcuts import get_object_or_404
 
 from interactions.models import Review
 from interactions.forms import ReviewForm
 from novels.models import Novel
+from novels.services.novel_rating_service import NovelRatingService
 from constants import (
     PAGINATOR_REVIEW_LIST,
     MIN_RATE,
@@ -113,7 +114,10 @@ class ReviewService:
 
         form = ReviewForm(data, user=user, novel=novel)
         if form.is_valid():
-            return form.save()
+            with transaction.atomic():
+                review = form.save()
+                NovelRatingService.apply(novel.id, added=review.rating)
+            return review
         else:
             return form.errors
 
@@ -142,14 +146,22 @@ class ReviewService:
 
         review.rating = rating_value
         review.content = content.strip()
-        review.save()
+        with transaction.atomic():
+            # The stored rating, locked, so concurrent edits move the totals once each
+            previous_rating = Review.objects.select_for_update().values_list('rating', flat=True).get(pk=review.pk)
+            review.save()
+            NovelRatingService.apply(novel.id, added=rating_value, removed=previous_rating)
         return review, "ok"
 
     @staticmethod
     def delete_review(novel_slug, review_id):
         novel = get_object_or_404(Novel, slug=novel_slug, deleted_at__isnull=True)
         review = get_object_or_404(Review, pk=review_id, novel=novel, is_active=True)
-        review.delete()
+        with transaction.atomic():
+            rating = Review.objects.select_for_update().values_list('rating', flat=True).filter(pk=review.pk).first()
+            if rating is not None:
+                review.delete()
+                NovelRatingService.apply(novel.id, removed=rating)
         return True
     
     @staticmethod
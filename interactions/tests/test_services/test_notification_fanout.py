@@ -0,0 +1,87 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import AsyncMock, patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from interactions.models import Notification, NotificationFanout
+from interactions.services import NotificationFanoutService
+from novels.models import Novel, Volume, Chapter, Favorite
+from constants import ApprovalStatus, FanoutStatusChoices, UserRole
+
+User = get_user_model()
+
+
+@override_settings(NOTIFICATION_FANOUT_THREAD=False)
+@patch('interactions.services.notification_fanout_service.send_notifications_to_users', new_callable=AsyncMock)
+class TestNotificationFanout(TestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email='admin@example.com', username='admin', password='testpass123', role=UserRole.WEBSITE_ADMIN.value
+        )
+        self.novel = Novel.objects.create(
+            name='Followed Novel', summary='Test summary', approval_status=ApprovalStatus.APPROVED.value
+        )
+        volume = Volume.objects.create(novel=self.novel, name='Tap 1', position=1)
+        self.chapter = Chapter.objects.create(volume=volume, title='Chuong moi', position=1)
+        self.followers = [
+            User.objects.create_user(email=f'fan{i}@example.com', username=f'fan{i}', password='testpass123')
+            for i in range(5)
+        ]
+        for user in self.followers:
+            Favorite.objects.create(user=user, novel=self.novel)
+
+    def test_approve_only_queues_the_fanout(self, send):
+        self.client.force_login(self.admin)
+
+        response = self.client.post(reverse('admin:approve_chapter', kwargs={'chapter_slug': self.chapter.slug}))
+
+        self.assertEqual(response.status_code, 302)
+        fanout = NotificationFanout.objects.get(chapter=self.chapter)
+        self.assertEqual((fanout.status, fanout.total, fanout.sent), (FanoutStatusChoices.PENDING, 5, 0))
+        self.assertFalse(Notification.objects.exists())
+        send.assert_not_called()
+
+        progress = self.client.get(
+            reverse('admin:chapter_notification_progress', kwargs={'chapter_slug': self.chapter.slug})
+        ).json()
+        self.assertEqual((progress['sent'], progress['total'], progress['active']), (0, 5, True))
+
+    def test_command_sends_in_batches(self, send):
+        fanout = NotificationFanoutService.enqueue(self.chapter)
+
+        out = StringIO()
+        call_command('send_notification_fanouts', '--batch-size', '2', stdout=out)
+
+        self.assertIn(f'Fan-out {fanout.pk}: 5 notifications', out.getvalue())
+        fanout.refresh_from_db()
+        self.assertEqual((fanout.status, fanout.sent, fanout.percent), (FanoutStatusChoices.DONE, 5, 100))
+        self.assertEqual(
+            set(Notification.objects.filter(object_id=self.chapter.id).values_list('user_id', flat=True)),
+            {user.id for user in self.followers}
+        )
+        # One SSE round per batch, each carrying saved notifications
+        self.assertEqual([len(call.args[0]) for call in send.call_args_list], [2, 2, 1])
+        self.assertTrue(all(n.pk for call in send.call_args_list for n in call.args[0]))
+
+    def test_interrupted_fanout_resumes_after_cursor(self, send):
+        fanout = NotificationFanoutService.enqueue(self.chapter)
+        last_sent = Favorite.objects.filter(novel=self.novel).order_by('id')[2]
+        NotificationFanout.objects.filter(pk=fanout.pk).update(
+            status=FanoutStatusChoices.RUNNING, sent=3, last_favorite_id=last_sent.id
+        )
+
+        # A fan-out another worker is still running is left alone
+        self.assertIsNone(NotificationFanoutService.process(fanout.pk))
+
+        NotificationFanout.objects.filter(pk=fanout.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(NotificationFanoutService.process(fanout.pk), 2)
+
+        fanout.refresh_from_db()
+        self.assertEqual((fanout.status, fanout.sent), (FanoutStatusChoices.DONE, 5))
+        self.assertEqual(Notification.objects.count(), 2)
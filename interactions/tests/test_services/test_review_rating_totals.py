@@ -0,0 +1,79 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from interactions.models import Review
+from interactions.services import ReviewService
+from novels.models import Novel
+from novels.services import NovelRatingService
+from constants import ApprovalStatus
+
+User = get_user_model()
+
+
+class TestReviewRatingTotals(TestCase):
+
+    def setUp(self):
+        self.owner = User.objects.create_user(email='owner@example.com', username='owner', password='testpass123')
+        self.readers = [
+            User.objects.create_user(email=f'reader{i}@example.com', username=f'reader{i}', password='testpass123')
+            for i in range(3)
+        ]
+        self.novel = Novel.objects.create(
+            name='Rated Novel',
+            summary='Test summary',
+            created_by=self.owner,
+            approval_status=ApprovalStatus.APPROVED.value
+        )
+
+    def _review(self, user, rating):
+        return ReviewService.create_review(user, self.novel.slug, {'rating': rating, 'content': 'Nice'})
+
+    def _totals(self):
+        novel = Novel.objects.get(pk=self.novel.pk)
+        histogram = {star: count for star, count, _ in NovelRatingService.histogram(novel)}
+        return novel.rating_avg, novel.rating_sum, novel.rating_count, histogram
+
+    def test_create_edit_delete_keep_totals_in_step(self):
+        first = self._review(self.readers[0], 5)
+        self._review(self.readers[1], 3)
+        self.assertEqual(self._totals(), (4.0, 8, 2, {5: 1, 4: 0, 3: 1, 2: 0, 1: 0}))
+
+        ReviewService.edit_review(self.readers[0], self.novel.slug, first.id, 2, 'Changed my mind')
+        self.assertEqual(self._totals(), (2.5, 5, 2, {5: 0, 4: 0, 3: 1, 2: 1, 1: 0}))
+
+        ReviewService.delete_review(self.novel.slug, first.id)
+        self.assertEqual(self._totals(), (3.0, 3, 1, {5: 0, 4: 0, 3: 1, 2: 0, 1: 0}))
+
+        ReviewService.delete_review(self.novel.slug, Review.objects.get(user=self.readers[1]).id)
+        self.assertEqual(self._totals(), (0.0, 0, 0, {5: 0, 4: 0, 3: 0, 2: 0, 1: 0}))
+
+    def test_reconcile_repairs_drift(self):
+        self._review(self.readers[0], 4)
+        # Written behind the service's back
+        Review.objects.create(user=self.readers[1], novel=self.novel, rating=1, content='Bypass')
+        Review.objects.create(user=self.readers[2], novel=self.novel, rating=5, content='Hidden', is_active=False)
+
+        out = StringIO()
+        call_command('reconcile_ratings', stdout=out)
+
+        self.assertIn('Novels updated: 1', out.getvalue())
+        self.assertEqual(self._totals(), (2.5, 5, 2, {5: 0, 4: 1, 3: 0, 2: 0, 1: 1}))
+
+        out = StringIO()
+        call_command('reconcile_ratings', stdout=out)
+        self.assertIn('Novels updated: 0', out.getvalue())
+
+    def test_review_panel_reads_histogram(self):
+        self._review(self.readers[0], 5)
+        self._review(self.readers[1], 5)
+        self._review(self.readers[2], 2)
+
+        response = self.client.get(reverse('novels:novel_detail', kwargs={'novel_slug': self.novel.slug}))
+
+        self.assertEqual(response.context['rating_histogram'], [(5, 2, 67), (4, 0, 0), (3, 0, 0), (2, 1, 33), (1, 0, 0)])
+        self.assertContains(response, '<span class="review-count">(3)</span>', html=True)
+        self.assertContains(response, 'style="width: 67%"')
@@ -0,0 +1,101 @@
+import asyncio
+import json
+import multiprocessing
+import queue
+import shutil
+import tempfile
+
+from django.test import SimpleTestCase
+
+from common.utils.sse import SSEManager, UnixSocketBroker, pack_events
+
+READY = 'ready'
+
+
+class QueueConnection:
+    """Stands in for ASGISSEConnection and reports deliveries to the test process"""
+
+    def __init__(self, worker, user_id, results):
+        self.worker = worker
+        self.user_id = user_id
+        self.results = results
+
+    def deliver(self, message, event_id=None, notifications=0):
+        self.results.put((self.worker, self.user_id, message))
+
+    def close(self):
+        pass
+
+
+def run_worker(worker, user_ids, directory, results, stop):
+    manager = SSEManager(broker=UnixSocketBroker(directory))
+    for user_id in user_ids:
+        asyncio.run(manager.add_connection(user_id, QueueConnection(worker, user_id, results)))
+    results.put((worker, READY, None))
+    stop.wait()
+    manager.broker.close()
+
+
+class TestSSEBroker(SimpleTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        context = multiprocessing.get_context('fork')
+        self.results = context.Queue()
+        self.stop = context.Event()
+        # user 2 has a stream in both workers, user 4 in none
+        self.workers = [
+            context.Process(target=run_worker, args=(worker, user_ids, self.directory, self.results, self.stop))
+            for worker, user_ids in enumerate([[1, 2], [2, 3]])
+        ]
+        for process in self.workers:
+            process.start()
+        self.addCleanup(self._stop_workers)
+        ready = [self.results.get(timeout=10) for _ in self.workers]
+        self.assertEqual({status for _, status, _ in ready}, {READY})
+
+    def _stop_workers(self):
+        self.stop.set()
+        for process in self.workers:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+
+    def _drain(self, expected):
+        received = []
+        for _ in range(expected):
+            received.append(self.results.get(timeout=10))
+        with self.assertRaises(queue.Empty):
+            self.results.get(timeout=0.5)
+        return received
+
+    def test_publish_reaches_streams_in_every_worker(self):
+        # The publisher has no streams of its own, like a worker handling an admin request
+        publisher = SSEManager(broker=UnixSocketBroker(self.directory))
+        publisher.publish([
+            (user_id, {'type': 'notification', 'data': {'id': user_id}})
+            for user_id in (1, 2, 3, 4)
+        ])
+
+        received = self._drain(4)
+
+        self.assertEqual(
+            sorted((worker, user_id) for worker, user_id, _ in received),
+            [(0, 1), (0, 2), (1, 2), (1, 3)],
+        )
+        for _, user_id, message in received:
+            event_id, data = message.split('\n')[:2]
+            self.assertTrue(event_id.startswith('id: '))
+            self.assertEqual(json.loads(data[len('data: '):]), {'type': 'notification', 'data': {'id': user_id}})
+
+    def test_large_batches_are_split(self):
+        events = [(user_id % 3 + 1, {'type': 'notification', 'data': {'content': 'x' * 2000}}) for user_id in range(90)]
+        payloads = list(pack_events(events, 64 * 1024))
+        self.assertGreater(len(payloads), 1)
+        self.assertEqual(sum(len(json.loads(payload)) for payload in payloads), 90)
+
+        SSEManager(broker=UnixSocketBroker(self.directory)).publish(events)
+
+        # users 1 and 3 are in one worker each, user 2 in both
+        self.assertEqual(len(self._drain(120)), 120)
@@ -0,0 +1,290 @@
+import asyncio
+import json
+import time
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from constants import SSEBackpressure
+
+from common.utils.sse import (
+    ASGISSEConnection,
+    CacheReplayBuffer,
+    EVENT_ID_KEY,
+    LocalBroker,
+    MemoryReplayBuffer,
+    SSEManager,
+    next_event_ids,
+    sse_event_stream,
+    sse_manager,
+)
+
+
+def event_data(chunk):
+    return json.loads(chunk.rsplit('data: ', 1)[1])
+
+
+def event_type(chunk):
+    return event_data(chunk)['type']
+
+
+class TestSSEEventStream(SimpleTestCase):
+
+    def run_stream(self, scenario):
+        async def main():
+            stream = sse_event_stream(42)
+            try:
+                self.assertEqual(event_type(await anext(stream)), 'connection')
+                return await scenario(stream)
+            finally:
+                await stream.aclose()
+        return asyncio.run(main())
+
+    def test_published_message_wakes_stream(self):
+        async def scenario(stream):
+            next_chunk = asyncio.ensure_future(anext(stream))
+            await asyncio.sleep(0)
+            await sse_manager.send_to_user(42, {'type': 'notification', 'data': {'id': 1}})
+            return await asyncio.wait_for(next_chunk, timeout=2)
+
+        self.assertEqual(event_type(self.run_stream(scenario)), 'notification')
+        self.assertNotIn(42, sse_manager.connections)
+
+    @patch('common.utils.sse.MAX_TIME_RETRY_CONNECTION', 0.05)
+    def test_heartbeat_when_idle(self):
+        async def scenario(stream):
+            return [event_type(await asyncio.wait_for(anext(stream), timeout=2)) for _ in range(2)]
+
+        self.assertEqual(self.run_stream(scenario), ['heartbeat', 'heartbeat'])
+
+    def test_close_ends_stream(self):
+        async def scenario(stream):
+            next_chunk = asyncio.ensure_future(anext(stream))
+            await asyncio.sleep(0)
+            for connection in sse_manager.connections[42]:
+                connection.close()
+            with self.assertRaises(StopAsyncIteration):
+                await asyncio.wait_for(next_chunk, timeout=2)
+
+        self.run_stream(scenario)
+
+
+class TestSSEReplay(SimpleTestCase):
+
+    def setUp(self):
+        self.manager = SSEManager(broker=LocalBroker(), replay_buffer=MemoryReplayBuffer(size=3))
+        # A worker that already serves streams records every event it receives
+        self.manager.subscribe()
+        self.published = []
+        self.manager.broker.subscribe(self.published.extend)
+        patcher = patch('common.utils.sse.sse_manager', self.manager)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def publish(self, *ids):
+        self.manager.publish([(42, {'type': 'notification', 'data': {'id': i}}) for i in ids])
+        return self.published[-1][1]
+
+    def resume(self, last_event_id, count):
+        async def main():
+            stream = sse_event_stream(42, last_event_id)
+            try:
+                return [await anext(stream) for _ in range(count)]
+            finally:
+                await stream.aclose()
+        return asyncio.run(main())
+
+    def test_reconnect_replays_missed_events(self):
+        last_event_id = self.publish(1)
+        self.publish(2, 3)
+
+        connection, *missed = self.resume(last_event_id, 3)
+
+        self.assertTrue(event_data(connection)['data']['resumed'])
+        self.assertEqual([event_data(chunk)['data']['id'] for chunk in missed], [2, 3])
+        self.assertEqual(
+            [chunk.split('\n')[0] for chunk in missed],
+            [f'id: {event_id}' for _, event_id, _ in self.published[1:]],
+        )
+
+    def test_reconnect_past_the_buffer_starts_fresh(self):
+        last_event_id = self.publish(1)
+        # Pushes event 1 and the one after it out of the three-event buffer
+        self.publish(2, 3, 4, 5)
+
+        connection, = self.resume(last_event_id, 1)
+
+        self.assertFalse(event_data(connection)['data']['resumed'])
+        self.assertIsNone(self.manager.replay(42, last_event_id))
+
+    def test_pings_are_not_replayed(self):
+        last_event_id = self.publish(1)
+        asyncio.run(self.manager.send_to_user(42, {'type': 'ping', 'data': {}}, replay=False))
+
+        self.assertIsNone(self.published[-1][1])
+        self.assertEqual(self.manager.replay(42, last_event_id), [])
+
+
+class TestSSEEventIds(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_ids_follow_publish_order_across_publishers(self):
+        buffer = MemoryReplayBuffer()
+        publishers = [SSEManager(broker=LocalBroker(), replay_buffer=buffer) for _ in range(2)]
+        published = []
+        for manager in publishers:
+            manager.subscribe()
+            manager.broker.subscribe(published.extend)
+        ahead = time.time_ns()
+        clocks = {0: ahead, 1: ahead - 3600 * 10**9}  # the second publisher's clock is an hour behind
+
+        for i in range(4):
+            with patch('common.utils.sse.time.time_ns', return_value=clocks[i % 2]):
+                publishers[i % 2].publish([(42, {'type': 'notification', 'data': {'id': i}})])
+
+        ids = [event_id for _, event_id, _ in published]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), 4)
+        # Allocated from the counter every worker shares through the cache
+        self.assertEqual(cache.get(EVENT_ID_KEY), ids[-1])
+        self.assertEqual(
+            [event_data(message)['data']['id'] for _, message in publishers[1].replay(42, ids[0])],
+            [1, 2, 3],
+        )
+
+    def test_late_batch_from_another_publisher_is_replayed_in_order(self):
+        buffer = MemoryReplayBuffer()
+        first, second, third = next_event_ids(3)
+        buffer.record([(42, first, 'first'), (42, third, 'third')])
+        # The publisher holding ``second`` reached the broker last
+        buffer.record([(42, second, 'second')])
+
+        self.assertEqual(buffer.since(42, first), [(second, 'second'), (third, 'third')])
+
+
+class TestCacheReplayBuffer(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_ring_keeps_latest_events(self):
+        buffer = CacheReplayBuffer(size=2)
+        ids = list(next_event_ids(3))
+        buffer.record([(7, event_id, f'message {event_id}') for event_id in ids])
+
+        self.assertEqual(buffer.since(7, ids[0]), [(ids[1], f'message {ids[1]}'), (ids[2], f'message {ids[2]}')])
+        self.assertEqual(buffer.since(7, ids[2]), [])
+        # The first event was evicted, so an older client cannot be caught up
+        self.assertIsNone(buffer.since(7, ids[0] - 1))
+        self.assertIsNone(buffer.since(8, ids[0]))
+
+
+@patch('common.utils.sse.MAX_QUEUE_SIZE', 3)
+class TestSSEBackpressure(SimpleTestCase):
+
+    def connection(self, policy):
+        return ASGISSEConnection(42, backpressure=policy)
+
+    def deliver(self, connection, *types):
+        for event_id, kind in enumerate(types, start=1):
+            connection.deliver(
+                sse_manager._format_sse_message({'type': kind, 'data': {}}, event_id),
+                event_id,
+                int(kind == 'notification'),
+            )
+
+    def queued(self, connection):
+        items = []
+        while not connection.message_queue.empty():
+            event_id, message, _ = connection.message_queue.get_nowait()
+            items.append((event_id, event_data(message)))
+        return items
+
+    def test_drop_oldest(self):
+        connection = self.connection(SSEBackpressure.DROP_OLDEST)
+        self.deliver(connection, 'notification', 'notification', 'ping', 'notification')
+
+        self.assertEqual([event_id for event_id, _ in self.queued(connection)], [2, 3, 4])
+        self.assertEqual(connection.stats, {'dropped': 1})
+
+    def test_coalesce_folds_queued_notifications(self):
+        connection = self.connection(SSEBackpressure.COALESCE)
+        self.deliver(connection, 'ping', 'notification', 'notification', 'notification')
+        # With room again, notifications queue normally
+        connection.deliver(sse_manager._format_sse_message({'type': 'notification', 'data': {}}, 5), 5, 1)
+
+        self.assertEqual(self.queued(connection), [
+            (1, {'type': 'ping', 'data': {}}),
+            (4, {'type': 'notification_summary', 'data': {'count': 3}}),
+            (5, {'type': 'notification', 'data': {}}),
+        ])
+        self.assertEqual(connection.stats, {'coalesced': 2})
+
+    def test_coalesce_keeps_order_and_folds_only_the_trailing_run(self):
+        connection = self.connection(SSEBackpressure.COALESCE)
+        self.deliver(connection, 'notification', 'ping', 'notification', 'notification')
+
+        self.assertEqual(self.queued(connection), [
+            (1, {'type': 'notification', 'data': {}}),
+            (2, {'type': 'ping', 'data': {}}),
+            (4, {'type': 'notification_summary', 'data': {'count': 2}}),
+        ])
+        self.assertEqual(connection.stats, {'coalesced': 1})
+
+    def test_coalesce_before_a_non_notification(self):
+        connection = self.connection(SSEBackpressure.COALESCE)
+        self.deliver(connection, 'ping', 'notification', 'notification', 'ping')
+
+        self.assertEqual(self.queued(connection), [
+            (1, {'type': 'ping', 'data': {}}),
+            (3, {'type': 'notification_summary', 'data': {'count': 2}}),
+            (4, {'type': 'ping', 'data': {}}),
+        ])
+
+    def test_coalesce_without_a_trailing_run_drops_oldest(self):
+        connection = self.connection(SSEBackpressure.COALESCE)
+        self.deliver(connection, 'notification', 'notification', 'ping', 'notification')
+
+        self.assertEqual([event_id for event_id, _ in self.queued(connection)], [2, 3, 4])
+        self.assertEqual(connection.stats, {'dropped': 1})
+
+    def test_coalesce_without_notifications_drops_oldest(self):
+        connection = self.connection(SSEBackpressure.COALESCE)
+        self.deliver(connection, 'ping', 'ping', 'ping', 'notification')
+
+        self.assertEqual([event_id for event_id, _ in self.queued(connection)], [2, 3, 4])
+        self.assertEqual(connection.stats, {'dropped': 1})
+
+    def test_disconnect_slow_consumer(self):
+        connection = self.connection(SSEBackpressure.DISCONNECT)
+        self.deliver(connection, 'notification', 'notification', 'notification', 'notification')
+
+        self.assertTrue(connection.closed)
+        self.assertEqual(len(self.queued(connection)), 3)
+        self.assertEqual(connection.stats, {'disconnected': 1})
+
+
+class TestSSEStatsReport(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_report_adds_new_counts_to_shared_totals(self):
+        workers = [SSEManager(broker=LocalBroker()) for _ in range(2)]
+        workers[0].stats.update(dropped=2, coalesced=5)
+        workers[1].stats.update(disconnected=1)
+
+        with self.assertLogs('common.utils.sse', 'WARNING') as logs:
+            for manager in workers:
+                manager.report_stats()
+        self.assertIn('dropped=2, coalesced=5, disconnected=0', logs.output[0])
+
+        # Only what was counted since the previous report is added
+        workers[0].stats['dropped'] += 1
+        workers[0].report_stats()
+        self.assertEqual(workers[1].report_stats(), {})
+
+        self.assertEqual(workers[1].shared_stats(), {'dropped': 3, 'coalesced': 5, 'disconnected': 1})
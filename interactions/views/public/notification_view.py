@@ -45,7 +45,13 @@ def notification_mark_read(request, pk):
 @csrf_exempt
 def sse_stream(request):
     user_id = request.user.id
-    return create_sse_response(user_id)
+    # EventSource gửi Last-Event-ID khi tự nối lại; JS gửi qua query khi tạo kết nối mới
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+    return create_sse_response(user_id, last_event_id=last_event_id)
 
 @require_http_methods(["POST"])
 @login_required
@@ -53,37 +59,24 @@ def sse_ping(request):
     try:
         user_id = request.user.id
         
-        # Kiểm tra xem user có active SSE connections không
-        has_connection = False
-        if user_id in sse_manager.connections:
-            has_connection = len(sse_manager.connections[user_id]) > 0
-        
-        if has_connection:
-            heartbeat_data = {
-                'type': 'ping',
-                'data': {
-                    'status': 'pong',
-                    'timestamp': timezone.now().isoformat(),
-                    'user_id': user_id
-                }
+        # Stream có thể nằm ở worker khác, nên luôn gửi qua broker
+        heartbeat_data = {
+            'type': 'ping',
+            'data': {
+                'status': 'pong',
+                'timestamp': timezone.now().isoformat(),
+                'user_id': user_id
             }
-            
-            async_to_sync(sse_manager.send_to_user)(user_id, heartbeat_data)
-            
-            return JsonResponse({
-                'status': 'success',
-                'message': 'Ping sent',
-                'has_connection': True,
-                'timestamp': timezone.now().isoformat()
-            })
-        else:
-            return JsonResponse({
-                'status': 'success', 
-                'message': 'No active connections',
-                'has_connection': False,
-                'timestamp': timezone.now().isoformat()
-            })
-            
+        }
+
+        async_to_sync(sse_manager.send_to_user)(user_id, heartbeat_data, replay=False)
+
+        return JsonResponse({
+            'status': 'success',
+            'message': 'Ping sent',
+            'timestamp': timezone.now().isoformat()
+        })
+
     except Exception as e:
         return JsonResponse({
             'status': 'error',
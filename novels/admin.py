@@ -4,8 +4,10 @@ from django.urls import reverse
 from django.shortcuts import redirect
 from django.contrib import messages
 from django.http import HttpResponseRedirect
+from django.db import transaction
 from .models import Novel, Author, Artist, Tag, Chapter, Chunk, Volume
 from .utils import ChunkManager
+from .services import ChapterNavigationService, ChapterService, HomepageService
 
 # Register your models here.
 
@@ -70,12 +72,14 @@ class ChapterAdmin(admin.ModelAdmin):
         """Action to re-chunk selected chapters using normal chunking."""
         updated_count = 0
         error_count = 0
+        rows_written = 0
         
         for chapter in queryset:
             try:
                 content = chapter.get_content()
                 if content.strip():
-                    ChunkManager.create_normal_chunks_for_chapter(chapter, content)
+                    report = ChunkManager.create_normal_chunks_for_chapter(chapter, content)
+                    rows_written += report.written
                     updated_count += 1
                 else:
                     error_count += 1
@@ -85,7 +89,8 @@ class ChapterAdmin(admin.ModelAdmin):
         if updated_count > 0:
             messages.success(
                 request, 
-                f"Successfully re-chunked {updated_count} chapters using normal chunking."
+                f"Successfully re-chunked {updated_count} chapters using normal chunking "
+                f"({rows_written} chunk rows written)."
             )
         if error_count > 0:
             messages.warning(
@@ -98,16 +103,44 @@ class ChapterAdmin(admin.ModelAdmin):
     def soft_delete_chapters(self, request, queryset):
         """Action to soft delete selected chapters."""
         from django.utils import timezone
-        updated = queryset.filter(deleted_at__isnull=True).update(deleted_at=timezone.now())
+        with transaction.atomic():
+            chapters = queryset.filter(deleted_at__isnull=True)
+            removed = ChapterService.visible_words_by_novel(chapters)
+            volume_ids = set(chapters.values_list('volume_id', flat=True))
+            updated = chapters.update(deleted_at=timezone.now())
+            for novel_id, words in removed.items():
+                ChapterService.apply_word_count_delta(novel_id, -words)
+            self.refresh_latest_chapters(volume_ids)
+        self.invalidate_navigation(queryset)
         messages.success(request, f"Successfully soft deleted {updated} chapters.")
     soft_delete_chapters.short_description = "Soft delete selected chapters"
     
     def restore_chapters(self, request, queryset):
         """Action to restore soft deleted chapters."""
-        updated = queryset.filter(deleted_at__isnull=False).update(deleted_at=None)
+        with transaction.atomic():
+            chapters = queryset.filter(deleted_at__isnull=False)
+            restored = ChapterService.visible_words_by_novel(chapters)
+            volume_ids = set(chapters.values_list('volume_id', flat=True))
+            updated = chapters.update(deleted_at=None)
+            for novel_id, words in restored.items():
+                ChapterService.apply_word_count_delta(novel_id, words)
+            self.refresh_latest_chapters(volume_ids)
+        self.invalidate_navigation(queryset)
         messages.success(request, f"Successfully restored {updated} chapters.")
     restore_chapters.short_description = "Restore selected chapters"
 
+    def refresh_latest_chapters(self, volume_ids):
+        """Bulk updates skip ChapterService, so recompute the latest chapter pointers here."""
+        for volume in Volume.objects.filter(pk__in=volume_ids).only('id', 'novel_id'):
+            ChapterService.refresh_latest_chapter_pointers(volume)
+
+    def invalidate_navigation(self, queryset):
+        """Bulk updates skip model signals, so drop the cached indexes and homepage here."""
+        novel_ids = set(queryset.values_list('volume__novel_id', flat=True))
+        for novel_id in novel_ids:
+            ChapterNavigationService.invalidate(novel_id)
+        HomepageService.invalidate('chapter')
+
 
 @admin.register(Chunk)
 class ChunkAdmin(admin.ModelAdmin):
@@ -4,4 +4,6 @@ from django.apps import AppConfig
 class NovelsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "novels"
-    
+
+    def ready(self):
+        from . import signals  # noqa: F401
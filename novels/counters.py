@@ -0,0 +1,45 @@
+from django.db.models import Avg, Count, FloatField, Q, Sum
+
+from common.utils.counters import DenormalizedCounter, register
+from interactions.models import Review
+from novels.models import Novel, Chapter, Chunk, Favorite
+from novels.services.chapter_service import ChapterService
+from constants import MIN_RATE, MAX_RATE
+
+# Novel/Chapter.view_count and Comment.like_count have no row-level
+# source: views are only kept as buffered deltas (see ViewCountService)
+# and comment likes are not recorded per user, so there is nothing to
+# recount them from.
+
+CHAPTER_WORD_COUNT = register(DenormalizedCounter(
+    'chapter.word_count', Chapter, Chunk, 'chapter',
+    {'word_count': Sum('word_count')},
+))
+
+NOVEL_WORD_COUNT = register(DenormalizedCounter(
+    'novel.word_count', Novel, Chapter, 'volume__novel',
+    {
+        'word_count': Sum('word_count'),
+        'reading_minutes': ChapterService.reading_minutes(Sum('word_count')),
+    },
+    filter=Q(approved=True, is_hidden=False, deleted_at__isnull=True),
+))
+
+NOVEL_FAVORITE_COUNT = register(DenormalizedCounter(
+    'novel.favorite_count', Novel, Favorite, 'novel',
+    {'favorite_count': Count('id')},
+))
+
+NOVEL_RATING = register(DenormalizedCounter(
+    'novel.rating', Novel, Review, 'novel',
+    {
+        'rating_avg': Avg('rating', output_field=FloatField()),
+        'rating_sum': Sum('rating'),
+        'rating_count': Count('id'),
+        **{
+            f'rating_{star}_count': Count('id', filter=Q(rating=star))
+            for star in range(MIN_RATE + 1, MAX_RATE + 1)
+        },
+    },
+    filter=Q(is_active=True),
+))
@@ -1,6 +1,4 @@
 from django.templatetags.static import static
-import random
-from datetime import date, timedelta
 card_list = [
         {
             'image_url': static('novels/images/fake.jpg'),
@@ -153,30 +151,6 @@ comments = [
             "time": "1 giờ"
         }
     ]
-top_novels_this_month = [
-    {"title": "Tôi Thấy Hoa Vàng Trên Cỏ Xanh", "views": 1234},
-    {"title": "Bí Mật Của Naoko", "views": 987},
-    {"title": "Nhà Giả Kim", "views": 865},
-    {"title": "Đắc Nhân Tâm", "views": 754},
-    {"title": "Totto-chan", "views": 690},
-]
-def getNewNovels():
-    today = date.today()
-    labels = []
-    data = []
-    for i in range(29, -1, -1): 
-        day = today - timedelta(days=i)
-        labels.append(day.strftime("%d/%m"))
-        data.append(random.randint(0, 10))  
-    return labels, data
-
-new_novels = [
-    {"title": "Tôi Thấy Hoa Vàng Trên Cỏ Xanh", "date": "01/07/2025"},
-    {"title": "Bí Mật Của Naoko", "date": "05/07/2025"},
-    {"title": "Nhà Giả Kim", "date": "12/07/2025"},
-    {"title": "Đắc Nhân Tâm", "date": "18/07/2025"},
-    {"title": "Totto-chan", "date": "28/07/2025"},
-]
 authors = [
     {"name": "Nguyễn Nhật Ánh", "total_novels": 12, "total_views": 12000},
     {"name": "Haruki Murakami", "total_novels": 8, "total_views": 9800},
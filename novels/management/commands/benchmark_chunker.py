@@ -0,0 +1,120 @@
+import random
+import statistics
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+from django.core.management.base import BaseCommand
+
+from novels.utils import HtmlChunker
+from novels.utils.helpers import count_words
+from novels.utils.legacy_html_chunker import SoupHtmlChunker
+from constants import MAX_CHUNK_SIZE, BEAUTIFULSOUP_PARSER
+
+WORDS = (
+    'anh em chung ta cung nhau di qua nhung ngay thang dai dang '
+    'tieng viet co dau khong he don gian nhung rat dep de doc'
+).split()
+
+
+class Command(BaseCommand):
+    help = 'Compare the streaming HtmlChunker with the BeautifulSoup chunker on a generated chapter'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--size',
+            type=int,
+            default=1_000_000,
+            help='Approximate chapter size in characters'
+        )
+        parser.add_argument(
+            '--max-chunk-size',
+            type=int,
+            default=MAX_CHUNK_SIZE,
+            help='Maximum chunk size passed to both chunkers'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Number of timed runs per chunker (median is reported)'
+        )
+
+    def handle(self, *args, **options):
+        content = self.generate_chapter(options['size'])
+        max_chunk_size = options['max_chunk_size']
+        soup_chunker = SoupHtmlChunker(max_chunk_size)
+        stream_chunker = HtmlChunker(max_chunk_size)
+
+        def soup_write_path():
+            # What ChunkManager used to do: chunk, validate, then parse again for the total
+            chunks = soup_chunker.split_into_chunks(content)
+            all(soup_chunker.validate_html_chunk(chunk) for chunk, _ in chunks)
+            count_words(BeautifulSoup(content, BEAUTIFULSOUP_PARSER).get_text())
+            return chunks
+
+        def stream_write_path():
+            chunks = stream_chunker.split_into_chunks(content)
+            sum(word_count for _, word_count in chunks)
+            return chunks
+
+        soup_chunks = soup_write_path()
+        stream_chunks = stream_write_path()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\n=== CHUNKER BENCHMARK ({len(content):,} chars, max {max_chunk_size:,}/chunk) ===\n'
+        ))
+        for name, write_path, chunks in (
+            ('soup', soup_write_path, soup_chunks),
+            ('stream', stream_write_path, stream_chunks),
+        ):
+            elapsed = self.measure(write_path, options['repeat'])
+            peak = self.peak_memory(write_path)
+            rate = len(content) / 1_000_000 / (elapsed / 1000)
+            self.stdout.write(
+                f'  {name:<7} {elapsed:9.2f} ms  {rate:7.2f} MB/s  '
+                f'peak {peak / 1_000_000:7.2f} MB  {len(chunks)} chunks'
+            )
+
+        differing = abs(len(soup_chunks) - len(stream_chunks)) + sum(
+            soup != stream for soup, stream in zip(soup_chunks, stream_chunks)
+        )
+        if differing:
+            self.stdout.write(self.style.WARNING(f'  Chunks that differ: {differing}'))
+        else:
+            self.stdout.write(self.style.SUCCESS('  Output identical.'))
+
+    def generate_chapter(self, size):
+        """Rich-text chapter shaped like editor output: short headings and formatted paragraphs"""
+        rng = random.Random(size)
+        parts = []
+        length = 0
+        while length < size:
+            if rng.random() < 0.03:
+                block = f'<h2>{" ".join(rng.choices(WORDS, k=5)).title()}</h2>\n'
+            else:
+                words = rng.choices(WORDS, k=rng.randint(20, 120))
+                for _ in range(rng.randint(0, 3)):
+                    i = rng.randrange(len(words))
+                    words[i] = rng.choice(('<strong>{}</strong>', '<em>{}</em>', '{}&nbsp;&amp;')).format(words[i])
+                block = f'<p>{" ".join(words)}</p>\n'
+            parts.append(block)
+            length += len(block)
+        return ''.join(parts)
+
+    def measure(self, run, repeat):
+        """Median wall time of ``run`` in milliseconds"""
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
+
+    def peak_memory(self, run):
+        tracemalloc.start()
+        try:
+            run()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
@@ -0,0 +1,78 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+
+from common.utils import KeysetPaginator
+from common.utils.keyset_pagination import CURSOR_NEXT
+from novels.services import NovelService
+from constants import MAX_MOST_READ_NOVELS
+
+ORDERING = ('-view_count', '-id')
+
+
+class Command(BaseCommand):
+    help = 'Compare OFFSET and keyset pagination latency on the most-read novel listing'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--page',
+            type=int,
+            default=10000,
+            help='Deep page number to compare against page 1'
+        )
+        parser.add_argument(
+            '--per-page',
+            type=int,
+            default=MAX_MOST_READ_NOVELS,
+            help='Rows per page'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Number of timed runs per measurement (median is reported)'
+        )
+
+    def handle(self, *args, **options):
+        per_page = options['per_page']
+        repeat = options['repeat']
+        queryset = NovelService.get_approved_novels()
+
+        total = queryset.count()
+        last_page = max(1, (total + per_page - 1) // per_page)
+        deep_page = min(options['page'], last_page)
+        if deep_page < options['page']:
+            self.stdout.write(self.style.WARNING(
+                f'Only {total} approved novels ({last_page} pages); '
+                f'benchmarking page {deep_page} instead of {options["page"]}.'
+            ))
+
+        offset_paginator = Paginator(queryset.order_by(*ORDERING), per_page)
+        keyset_paginator = KeysetPaginator(queryset, ORDERING, per_page)
+
+        deep_cursor = None
+        if deep_page > 1:
+            anchor = queryset.order_by(*ORDERING)[(deep_page - 1) * per_page - 1]
+            deep_cursor = keyset_paginator.encode_cursor(CURSOR_NEXT, anchor)
+
+        results = [
+            ('OFFSET', 1, self.measure(lambda: list(offset_paginator.page(1).object_list), repeat)),
+            ('OFFSET', deep_page, self.measure(lambda: list(offset_paginator.page(deep_page).object_list), repeat)),
+            ('keyset', 1, self.measure(lambda: list(keyset_paginator.get_page(None)), repeat)),
+            ('keyset', deep_page, self.measure(lambda: list(keyset_paginator.get_page(deep_cursor)), repeat)),
+        ]
+
+        self.stdout.write(self.style.SUCCESS(f'\n=== PAGINATION BENCHMARK ({total} novels, {per_page}/page) ===\n'))
+        for engine, page, elapsed in results:
+            self.stdout.write(f'  {engine:<7} page {page:>6}: {elapsed:8.2f} ms')
+
+    def measure(self, fetch, repeat):
+        """Median wall time of ``fetch`` in milliseconds"""
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fetch()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
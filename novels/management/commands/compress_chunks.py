@@ -0,0 +1,98 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from novels.models import Chunk
+from novels.utils import ChunkManager
+from novels.utils.content_codec import decode_content
+from constants import RECONCILE_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Convert Chunk.content to (or from) compressed storage in batches and report the savings'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=RECONCILE_BATCH_SIZE,
+            help='Number of chunks processed per batch'
+        )
+        parser.add_argument(
+            '--decompress',
+            action='store_true',
+            help='Store every chunk inline again'
+        )
+        parser.add_argument(
+            '--report',
+            action='store_true',
+            help='Only measure the savings; do not write anything'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        compress = not options['decompress']
+        dry_run = options['report']
+
+        rows = converted = 0
+        bytes_before = bytes_after = 0
+        decode_seconds = 0.0
+        decoded = 0
+        last_id = 0
+
+        while True:
+            batch = list(
+                Chunk.objects.filter(id__gt=last_id)
+                .order_by('id')
+                .only('id', 'content', 'content_data')[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            to_compressed, to_inline = [], []
+            for chunk in batch:
+                was_compressed = bool(chunk.content_data)
+                bytes_before += self.stored_size(chunk)
+
+                chunk.compress_content(compress)
+                bytes_after += self.stored_size(chunk)
+
+                if chunk.content_data:
+                    start = time.perf_counter()
+                    decode_content(chunk.content_data)
+                    decode_seconds += time.perf_counter() - start
+                    decoded += 1
+
+                if bool(chunk.content_data) != was_compressed:
+                    (to_compressed if chunk.content_data else to_inline).append(chunk)
+
+            rows += len(batch)
+            converted += len(to_compressed) + len(to_inline)
+            if not dry_run:
+                self.write_batch(to_compressed, to_inline)
+
+        self.report(rows, converted, bytes_before, bytes_after, decode_seconds, decoded, dry_run)
+
+    def stored_size(self, chunk):
+        if chunk.content_data:
+            return len(chunk.content_data)
+        return len(chunk.content.encode('utf-8'))
+
+    def write_batch(self, to_compressed, to_inline):
+        with transaction.atomic():
+            ChunkManager.bulk_update_chunks(to_compressed + to_inline)
+
+    def report(self, rows, converted, bytes_before, bytes_after, decode_seconds, decoded, dry_run):
+        ratio = bytes_before / bytes_after if bytes_after else 1
+        saved = (1 - bytes_after / bytes_before) * 100 if bytes_before else 0
+        decode_us = decode_seconds / decoded * 1_000_000 if decoded else 0
+
+        self.stdout.write(self.style.SUCCESS('\n=== CHUNK STORAGE REPORT ==='))
+        self.stdout.write(f'  Chunks scanned: {rows:,}')
+        self.stdout.write(f'  Chunks {"to convert" if dry_run else "converted"}: {converted:,}')
+        self.stdout.write(f'  Content bytes before: {bytes_before:,}')
+        self.stdout.write(f'  Content bytes after: {bytes_after:,}')
+        self.stdout.write(f'  Ratio: {ratio:.2f}x ({saved:.1f}% saved)')
+        self.stdout.write(f'  Decompression per chunk: {decode_us:.1f} µs')
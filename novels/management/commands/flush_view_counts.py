@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from novels.services import ViewCountService
+from constants import RECONCILE_BATCH_SIZE, VIEW_FLUSH_INTERVAL
+
+
+class Command(BaseCommand):
+    help = 'Apply buffered page views to Novel.view_count and Chapter.view_count'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=RECONCILE_BATCH_SIZE,
+            help='Number of rows updated per UPDATE statement'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and flush every --interval seconds'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=VIEW_FLUSH_INTERVAL,
+            help='Seconds between flushes with --loop'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            updated = ViewCountService.flush(batch_size=options['batch_size'])
+            self.stdout.write(
+                f'Novels updated: {updated["novel"]}, chapters updated: {updated["chapter"]}'
+            )
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS('View counts flushed.'))
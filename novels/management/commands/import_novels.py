@@ -0,0 +1,142 @@
+import os
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from novels.services import HomepageService, UserCounterService
+from novels.utils.novel_importer import (
+    NovelImporter,
+    count_chunks,
+    iter_import_records,
+    prepare_records,
+)
+from constants import IMPORT_BATCH_SIZE, MAX_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = (
+        'Bulk import novels from a JSON-lines file or a directory of .jsonl files '
+        'and novel bundles; resumable through a checkpoint file'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'source',
+            help='A .jsonl file, or a directory of .jsonl files and bundle directories with a novel.json'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Worker processes used for chunking (0 chunks in this process)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help='Chunks written per transaction'
+        )
+        parser.add_argument(
+            '--max-chunk-size',
+            type=int,
+            default=MAX_CHUNK_SIZE,
+            help='Maximum chunk size in characters'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='File recording imported records (default: <source>.checkpoint)'
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Ignore and truncate an existing checkpoint'
+        )
+        parser.add_argument(
+            '--approve',
+            action='store_true',
+            help='Import novels and chapters as approved unless a record says otherwise'
+        )
+        parser.add_argument(
+            '--created-by',
+            help='Username recorded as the creator of imported novels'
+        )
+
+    def handle(self, *args, **options):
+        source = Path(options['source'])
+        if not source.exists():
+            raise CommandError(f'Source not found: {source}')
+
+        created_by = None
+        if options['created_by']:
+            try:
+                created_by = get_user_model().objects.get(username=options['created_by'])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f'User not found: {options["created_by"]}')
+
+        checkpoint_path = Path(options['checkpoint'] or f'{str(source).rstrip("/")}.checkpoint')
+        done = set()
+        if checkpoint_path.exists() and not options['restart']:
+            done = set(checkpoint_path.read_text(encoding='utf-8').split())
+            self.stdout.write(f'Resuming: {len(done):,} records already imported')
+
+        importer = NovelImporter(approve=options['approve'], created_by=created_by)
+        records = (
+            (key, record, root)
+            for key, record, root in iter_import_records(source)
+            if key not in done
+        )
+        prepared = prepare_records(
+            records, options['workers'], options['max_chunk_size'], settings.CHUNK_COMPRESSION
+        )
+
+        start = time.perf_counter()
+        batch, batch_chunks, batches = [], 0, 0
+        with checkpoint_path.open('w' if options['restart'] else 'a', encoding='utf-8') as checkpoint:
+            for key, record in prepared:
+                batch.append((key, record))
+                batch_chunks += count_chunks(record)
+                if batch_chunks >= options['batch_size']:
+                    batches += 1
+                    self.write_batch(importer, batch, checkpoint, batches, start)
+                    batch, batch_chunks = [], 0
+            if batch:
+                batches += 1
+                self.write_batch(importer, batch, checkpoint, batches, start)
+
+        if importer.counts['novels']:
+            HomepageService.invalidate('novel', 'chapter')
+            # bulk_create skips the Novel signal that drops the creator's sidebar counts
+            if created_by is not None:
+                UserCounterService.invalidate(created_by.pk)
+        self.report(importer, time.perf_counter() - start)
+
+    def write_batch(self, importer, batch, checkpoint, number, start):
+        """Commit one batch, then record its keys so a rerun skips them"""
+        importer.write_batch([record for _, record in batch])
+        checkpoint.write(''.join(f'{key}\n' for key, _ in batch))
+        checkpoint.flush()
+        os.fsync(checkpoint.fileno())
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f'  Batch {number}: {importer.counts["novels"]:,} novels, '
+            f'{importer.counts["chunks"]:,} chunks, '
+            f'{importer.rows_written / elapsed if elapsed else 0:,.0f} rows/s'
+        )
+
+    def report(self, importer, elapsed):
+        counts = importer.counts
+        rate = importer.rows_written / elapsed if elapsed else 0
+
+        self.stdout.write(self.style.SUCCESS('\n=== IMPORT REPORT ==='))
+        self.stdout.write(f'  Novels: {counts["novels"]:,}')
+        self.stdout.write(f'  Volumes: {counts["volumes"]:,}')
+        self.stdout.write(f'  Chapters: {counts["chapters"]:,}')
+        self.stdout.write(f'  Chunks: {counts["chunks"]:,}')
+        self.stdout.write(f'  Skipped (slug already imported): {counts["skipped"]:,}')
+        if counts['unknown_tags']:
+            self.stdout.write(self.style.WARNING(f'  Unknown tags ignored: {counts["unknown_tags"]:,}'))
+        self.stdout.write(f'  Rows written: {importer.rows_written:,} in {elapsed:.2f}s ({rate:,.0f} rows/s)')
@@ -0,0 +1,97 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from novels.models import Novel, Volume, Chapter
+from constants import RECONCILE_BATCH_SIZE
+
+POINTER_FIELDS = ['latest_public_chapter', 'latest_public_chapter_at']
+
+
+class Command(BaseCommand):
+    help = 'Backfill or reconcile the latest_public_chapter pointers on volumes and novels'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=RECONCILE_BATCH_SIZE,
+            help='Number of rows processed per batch'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        volumes_changed = self.rebuild(
+            Volume, batch_size, self.latest_chapters_for_volumes
+        )
+        self.stdout.write(f'Volumes updated: {volumes_changed}')
+
+        novels_changed = self.rebuild(
+            Novel, batch_size, self.latest_chapters_for_novels
+        )
+        self.stdout.write(f'Novels updated: {novels_changed}')
+
+        self.stdout.write(self.style.SUCCESS('Latest chapter pointers rebuilt.'))
+
+    def rebuild(self, model, batch_size, resolve_latest):
+        """Walk the table by primary key and rewrite only drifted pointers"""
+        changed = 0
+        last_id = 0
+
+        while True:
+            batch = list(
+                model.objects.filter(id__gt=last_id)
+                .order_by('id')
+                .only('id', *POINTER_FIELDS)[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            latest = resolve_latest([obj.id for obj in batch])
+            dirty = []
+            for obj in batch:
+                chapter_id, chapter_at = latest.get(obj.id, (None, None))
+                if obj.latest_public_chapter_id != chapter_id or obj.latest_public_chapter_at != chapter_at:
+                    obj.latest_public_chapter_id = chapter_id
+                    obj.latest_public_chapter_at = chapter_at
+                    dirty.append(obj)
+
+            if dirty:
+                with transaction.atomic():
+                    model.objects.bulk_update(dirty, POINTER_FIELDS)
+                changed += len(dirty)
+
+        return changed
+
+    def latest_chapters_for_volumes(self, volume_ids):
+        rows = Chapter.objects.filter(
+            volume_id__in=volume_ids,
+            approved=True,
+            is_hidden=False,
+            deleted_at__isnull=True
+        ).annotate(
+            row_number=Window(
+                expression=RowNumber(),
+                partition_by=[F('volume_id')],
+                order_by=[F('updated_at').desc(), F('id').desc()]
+            )
+        ).filter(row_number=1).values_list('volume_id', 'id', 'updated_at')
+        return {volume_id: (chapter_id, updated_at) for volume_id, chapter_id, updated_at in rows}
+
+    def latest_chapters_for_novels(self, novel_ids):
+        rows = Volume.objects.filter(
+            novel_id__in=novel_ids,
+            latest_public_chapter_at__isnull=False
+        ).annotate(
+            row_number=Window(
+                expression=RowNumber(),
+                partition_by=[F('novel_id')],
+                order_by=[F('latest_public_chapter_at').desc(), F('latest_public_chapter_id').desc()]
+            )
+        ).filter(row_number=1).values_list(
+            'novel_id', 'latest_public_chapter_id', 'latest_public_chapter_at'
+        )
+        return {novel_id: (chapter_id, chapter_at) for novel_id, chapter_id, chapter_at in rows}
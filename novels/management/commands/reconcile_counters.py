@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from common.utils.counters import discover_counters
+from constants import RECONCILE_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Report, and with --fix repair, denormalized counters that drifted from their source rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--counter',
+            action='append',
+            help='Only check this counter (repeatable); default is every registered counter'
+        )
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Rewrite drifted rows instead of only reporting them'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=RECONCILE_BATCH_SIZE,
+            help='Number of rows checked per batch'
+        )
+
+    def handle(self, *args, **options):
+        counters = discover_counters()
+        names = options['counter'] or sorted(counters)
+        unknown = set(names) - counters.keys()
+        if unknown:
+            raise CommandError(
+                f'Unknown counter(s): {", ".join(sorted(unknown))}. Choices: {", ".join(sorted(counters))}'
+            )
+
+        total_drifted = 0
+        for name in names:
+            report = counters[name].reconcile(options['batch_size'], fix=options['fix'])
+            total_drifted += report.drifted
+            line = f'{name}: {report.drifted} drifted rows in {report.batches} batches'
+            if options['fix']:
+                line += f', {report.fixed} fixed'
+            self.stdout.write(self.style.WARNING(line) if report.drifted else line)
+
+        if total_drifted and not options['fix']:
+            self.stdout.write(self.style.WARNING('Run again with --fix to repair the drifted rows.'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Counters reconciled.'))
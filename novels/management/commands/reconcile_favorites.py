@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from novels.services.novel_service import FavoriteService
+from constants import RECONCILE_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Recompute Novel.favorite_count where it drifted from the favorites table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=RECONCILE_BATCH_SIZE,
+            help='Number of novels checked per batch'
+        )
+
+    def handle(self, *args, **options):
+        changed = FavoriteService.reconcile(batch_size=options['batch_size'])
+
+        self.stdout.write(f'Novels updated: {changed}')
+        self.stdout.write(self.style.SUCCESS('Favorite counts reconciled.'))
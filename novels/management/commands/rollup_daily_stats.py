@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from novels.services import DailyStatsService
+from constants import RECONCILE_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Fold favorites, reviews, comments and new chapters since the last run into NovelDailyStats'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=RECONCILE_BATCH_SIZE,
+            help='Number of stats rows written per batch'
+        )
+
+    def handle(self, *args, **options):
+        since, until, written = DailyStatsService.rollup(batch_size=options['batch_size'])
+
+        self.stdout.write(f'Window: {since:%Y-%m-%d %H:%M:%S} - {until:%Y-%m-%d %H:%M:%S}')
+        self.stdout.write(f'Stats rows written: {written}')
+        self.stdout.write(self.style.SUCCESS('Daily stats updated.'))
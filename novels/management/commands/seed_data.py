@@ -13,9 +13,10 @@ from novels.models import (
     Favorite, ReadingHistory
 )
 from interactions.models import Review, Comment
+from novels.services import NovelRatingService
 from constants import (
     UserRole, Gender, ProgressStatus, ApprovalStatus,
-    MIN_RATE, MAX_RATE
+    MIN_RATE, MAX_RATE, RECONCILE_BATCH_SIZE
 )
 
 class Command(BaseCommand):
@@ -910,31 +911,9 @@ class Command(BaseCommand):
     def calculate_novel_ratings(self):
         """Calculate novel ratings based on actual reviews"""
         self.stdout.write('Calculating novel ratings from reviews...')
-        
-        from django.db.models import Avg, Count
-        
-        novels = Novel.objects.all()
-        updated_count = 0
-        
-        for novel in novels:
-            # Get active reviews for this novel
-            reviews = novel.reviews.filter(is_active=True)
-            
-            if reviews.exists():
-                # Calculate average rating
-                avg_data = reviews.aggregate(
-                    avg_rating=Avg('rating'),
-                    review_count=Count('id')
-                )
-                
-                novel.rating_avg = round(avg_data['avg_rating'], 1)
-                novel.save(update_fields=['rating_avg'])
-                updated_count += 1
-            else:
-                # No reviews yet, set to 0 or a default value
-                novel.rating_avg = 0.0
-                novel.save(update_fields=['rating_avg'])
-        
+
+        updated_count = NovelRatingService.reconcile()
+
         self.stdout.write(self.style.SUCCESS(f'Updated ratings for {updated_count} novels'))
 
     def calculate_word_counts(self):
@@ -952,21 +931,9 @@ class Command(BaseCommand):
                 chunk.word_count = word_count
                 chunk.save(update_fields=['word_count'])
         
-        # Update chapter word counts (sum from chunks)
-        chapters = Chapter.objects.all()
-        for chapter in chapters:
-            total_words = sum(chunk.word_count for chunk in chapter.chunks.all())
-            chapter.word_count = total_words
-            chapter.save(update_fields=['word_count'])
+        # Chapter totals sum their chunks, novel totals their public chapters
+        from novels.counters import CHAPTER_WORD_COUNT, NOVEL_WORD_COUNT
+        CHAPTER_WORD_COUNT.reconcile(RECONCILE_BATCH_SIZE, fix=True)
+        NOVEL_WORD_COUNT.reconcile(RECONCILE_BATCH_SIZE, fix=True)
         
-        # Update novel word counts (sum from chapters through volumes)
-        novels = Novel.objects.all()
-        for novel in novels:
-            total_words = 0
-            for volume in novel.volumes.all():
-                for chapter in volume.chapters.all():
-                    total_words += chapter.word_count
-            novel.word_count = total_words
-            novel.save(update_fields=['word_count'])
-        
-        self.stdout.write(self.style.SUCCESS(f'Updated word counts for {chunks.count()} chunks, {chapters.count()} chapters, {novels.count()} novels'))
+        self.stdout.write(self.style.SUCCESS(f'Updated word counts for {chunks.count()} chunks, {Chapter.objects.count()} chapters, {Novel.objects.count()} novels'))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from novels.models import NovelTrendingScore
+from novels.services import TrendingService
+from constants import RECONCILE_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Fold activity since the last run into the time-decayed trending scores'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Drop all scores and rebuild them from the lookback window'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=RECONCILE_BATCH_SIZE,
+            help='Number of novels written per batch'
+        )
+
+    def handle(self, *args, **options):
+        if options['full']:
+            NovelTrendingScore.objects.all().delete()
+
+        scored, pruned = TrendingService.recompute(batch_size=options['batch_size'])
+
+        self.stdout.write(f'Novels scored: {scored}')
+        self.stdout.write(f'Scores pruned: {pruned}')
+        self.stdout.write(self.style.SUCCESS('Trending scores updated.'))
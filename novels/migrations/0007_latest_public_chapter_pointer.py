@@ -0,0 +1,60 @@
+# Generated by Django 5.2.4 on 2026-10-16 22:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("novels", "0006_novel_tags"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="novel",
+            name="latest_public_chapter",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="novels.chapter",
+            ),
+        ),
+        migrations.AddField(
+            model_name="novel",
+            name="latest_public_chapter_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="volume",
+            name="latest_public_chapter",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="novels.chapter",
+            ),
+        ),
+        migrations.AddField(
+            model_name="volume",
+            name="latest_public_chapter_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="novel",
+            index=models.Index(
+                fields=["-latest_public_chapter_at"],
+                name="novels_nove_latest__88cbf6_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="volume",
+            index=models.Index(
+                fields=["-latest_public_chapter_at"],
+                name="novels_volu_latest__fab0dc_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.4 on 2026-10-16 23:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("novels", "0007_latest_public_chapter_pointer"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NovelTrendingScore",
+            fields=[
+                (
+                    "novel",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="trending_score",
+                        serialize=False,
+                        to="novels.novel",
+                    ),
+                ),
+                ("score", models.FloatField(default=0)),
+                ("rank_key", models.FloatField(default=0)),
+                ("scored_at", models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="favorite",
+            index=models.Index(
+                fields=["created_at"], name="novels_favo_created_93e8be_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="readinghistory",
+            index=models.Index(
+                fields=["read_at"], name="novels_read_read_at_18fef2_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="noveltrendingscore",
+            index=models.Index(
+                fields=["-rank_key"], name="novels_nove_rank_ke_02b729_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="noveltrendingscore",
+            index=models.Index(
+                fields=["-scored_at"], name="novels_nove_scored__6d6965_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.4 on 2026-10-16 23:14
+
+import novels.models.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("novels", "0008_novel_trending_score"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chunk",
+            name="content_data",
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="chunk",
+            name="content",
+            field=novels.models.fields.CompressibleTextField(
+                payload_field="content_data"
+            ),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.4 on 2026-10-16 23:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("novels", "0011_pending_view_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="novel",
+            name="rating_1_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="novel",
+            name="rating_2_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="novel",
+            name="rating_3_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="novel",
+            name="rating_4_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="novel",
+            name="rating_5_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="novel",
+            name="rating_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="novel",
+            name="rating_sum",
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-17 00:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("novels", "0012_novel_rating_totals"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="novel",
+            name="reading_minutes",
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.4 on 2026-10-17 00:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("novels", "0013_novel_reading_minutes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyStatsWatermark",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("processed_until", models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name="NovelDailyStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("views", models.IntegerField(default=0)),
+                ("favorites", models.IntegerField(default=0)),
+                ("reviews", models.IntegerField(default=0)),
+                ("comments", models.IntegerField(default=0)),
+                ("new_chapters", models.IntegerField(default=0)),
+                (
+                    "novel",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_stats",
+                        to="novels.novel",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["date"], name="novels_nove_date_135911_idx")
+                ],
+                "unique_together": {("novel", "date")},
+            },
+        ),
+    ]
@@ -7,3 +7,6 @@ from .volume import Volume
 from .reading_history import ReadingHistory
 from .chunk import Chunk
 from .chapter import Chapter
+from .trending_score import NovelTrendingScore
+from .pending_view_count import PendingViewCount
+from .novel_daily_stats import NovelDailyStats, DailyStatsWatermark
@@ -1,5 +1,8 @@
+from django.conf import settings
 from django.db import models
 from .chapter import Chapter
+from .fields import CompressibleTextField
+from novels.utils.content_codec import storage_payload, hash_content
 from constants import (
     COUNT_DEFAULT,
 )
@@ -7,8 +10,13 @@ from constants import (
 class Chunk(models.Model):
     chapter = models.ForeignKey(Chapter, on_delete=models.RESTRICT, related_name='chunks')
     position = models.IntegerField()
-    content = models.TextField()
+    # Empty in the database when the chunk is stored compressed in content_data
+    content = CompressibleTextField(payload_field='content_data')
+    content_data = models.BinaryField(null=True, blank=True, editable=False)
     word_count = models.IntegerField(default=COUNT_DEFAULT)
+    # sha1 of content, compared when a chapter is re-chunked; empty for rows
+    # written before it existed, which are simply rewritten on the next edit
+    content_hash = models.CharField(max_length=40, blank=True, default='', editable=False)
     
     class Meta:
         unique_together = ('chapter', 'position')
@@ -19,3 +27,16 @@ class Chunk(models.Model):
         
     def __str__(self):
         return f"{self.chapter.title} - Chunk {self.position}"
+
+    def save(self, *args, **kwargs):
+        self.content_hash = self.hash_content(self.content)
+        self.compress_content(settings.CHUNK_COMPRESSION)
+        return super().save(*args, **kwargs)
+
+    def compress_content(self, enabled=True):
+        """Encode content into content_data, or store it inline again"""
+        text = self.content
+        self.content_data = storage_payload(text, enabled)
+        self.__dict__['content'] = text
+
+    hash_content = staticmethod(hash_content)
@@ -0,0 +1,53 @@
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+
+from novels.utils.content_codec import decode_content
+
+
+class CompressibleTextDescriptor(DeferredAttribute):
+    """Decode the companion payload on first access and keep the text"""
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        value = super().__get__(instance, cls)
+        if not value:
+            payload = getattr(instance, self.field.payload_field)
+            if payload:
+                value = decode_content(payload)
+                instance.__dict__[self.field.attname] = value
+        return value
+
+    def __set__(self, instance, value):
+        # A data descriptor, so __get__ runs even once the text is loaded.
+        # Assigning new text after load drops the now stale payload; during
+        # __init__ the payload field is not populated yet and is left alone.
+        instance.__dict__[self.field.attname] = value
+        if self.field.payload_field in instance.__dict__:
+            instance.__dict__[self.field.payload_field] = None
+
+
+class CompressibleTextField(models.TextField):
+    """
+    Text stored inline, or encoded in a companion BinaryField.
+
+    When the companion field holds a payload the text column is written
+    empty and the attribute is decoded lazily from the payload, so rows
+    that are loaded but never read are never decompressed.
+    """
+
+    descriptor_class = CompressibleTextDescriptor
+
+    def __init__(self, *args, payload_field, **kwargs):
+        self.payload_field = payload_field
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['payload_field'] = self.payload_field
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        if getattr(model_instance, self.payload_field):
+            return ''
+        return super().pre_save(model_instance, add)
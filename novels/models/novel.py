@@ -41,13 +41,23 @@ class Novel(models.Model):
         db_index=True,
     )
     other_names = models.TextField(null=True, blank=True)
+    # Words of public chapters and the reading time they add up to, kept by ChapterService
     word_count = models.IntegerField(default=COUNT_DEFAULT)
+    reading_minutes = models.IntegerField(default=COUNT_DEFAULT)
     view_count = models.IntegerField(default=COUNT_DEFAULT)
     favorite_count = models.IntegerField(default=COUNT_DEFAULT)
     rating_avg = models.FloatField(
         default=COUNT_DEFAULT,
         validators=[MinValueValidator(MIN_RATE), MaxValueValidator(MAX_RATE)]
     )
+    # Active review totals kept by NovelRatingService; rating_avg follows them
+    rating_sum = models.IntegerField(default=COUNT_DEFAULT)
+    rating_count = models.IntegerField(default=COUNT_DEFAULT)
+    rating_1_count = models.IntegerField(default=COUNT_DEFAULT)
+    rating_2_count = models.IntegerField(default=COUNT_DEFAULT)
+    rating_3_count = models.IntegerField(default=COUNT_DEFAULT)
+    rating_4_count = models.IntegerField(default=COUNT_DEFAULT)
+    rating_5_count = models.IntegerField(default=COUNT_DEFAULT)
     
     created_by = models.ForeignKey(
         User, on_delete=models.SET_NULL, null=True, blank=True, related_name='created_novels'
@@ -60,6 +70,11 @@ class Novel(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     rejected_reason = models.TextField(null=True, blank=True)
     deleted_at = models.DateTimeField(default=None, null=True)
+    # Denormalized pointer to the newest public chapter, kept by ChapterService
+    latest_public_chapter = models.ForeignKey(
+        'Chapter', on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    latest_public_chapter_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         indexes = [
@@ -68,7 +83,8 @@ class Novel(models.Model):
             models.Index(fields=['-rating_avg']),
             models.Index(fields=['approval_status', '-created_at']),
             models.Index(fields=['progress_status']),
-            models.Index(fields=['deleted_at'])
+            models.Index(fields=['deleted_at']),
+            models.Index(fields=['-latest_public_chapter_at']),
         ]
         
     def __str__(self):
@@ -0,0 +1,38 @@
+from django.db import models
+from .novel import Novel
+from constants import (
+    COUNT_DEFAULT,
+)
+
+
+class NovelDailyStats(models.Model):
+    """
+    Activity of a novel on one day, rolled up by DailyStatsService.
+
+    Dashboards read these rows instead of scanning the event tables, so a
+    chart over N days touches at most N rows per novel.
+    """
+    novel = models.ForeignKey(Novel, on_delete=models.CASCADE, related_name='daily_stats')
+    date = models.DateField()
+    views = models.IntegerField(default=COUNT_DEFAULT)
+    favorites = models.IntegerField(default=COUNT_DEFAULT)
+    reviews = models.IntegerField(default=COUNT_DEFAULT)
+    comments = models.IntegerField(default=COUNT_DEFAULT)
+    new_chapters = models.IntegerField(default=COUNT_DEFAULT)
+
+    class Meta:
+        unique_together = ('novel', 'date')
+        indexes = [
+            models.Index(fields=['date']),
+        ]
+
+    def __str__(self):
+        return f"{self.novel} - {self.date}"
+
+
+class DailyStatsWatermark(models.Model):
+    """End of the last window folded into NovelDailyStats; a single row"""
+    processed_until = models.DateTimeField()
+
+    def __str__(self):
+        return f"Daily stats until {self.processed_until}"
@@ -0,0 +1,17 @@
+from django.db import models
+
+
+class PendingViewCount(models.Model):
+    """
+    View-count delta waiting for flush_view_counts.
+
+    Web workers only insert here, so page views never lock the hot
+    Novel/Chapter rows; the flusher folds the rows into view_count.
+    """
+    kind = models.CharField(max_length=10)  # 'novel' or 'chapter'
+    object_id = models.BigIntegerField()
+    delta = models.IntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} +{self.delta}"
@@ -12,4 +12,5 @@ class Favorite(models.Model):
         indexes = [
             models.Index(fields=['user', '-created_at']),
             models.Index(fields=['novel']),
+            models.Index(fields=['created_at']),
         ]
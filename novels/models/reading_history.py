@@ -19,4 +19,5 @@ class ReadingHistory(models.Model):
             models.Index(fields=['user', '-read_at']),
             models.Index(fields=['user', 'novel', '-read_at']),
             models.Index(fields=['chapter']),
+            models.Index(fields=['read_at']),
         ]
@@ -0,0 +1,29 @@
+from django.db import models
+from .novel import Novel
+from constants import (
+    COUNT_DEFAULT,
+)
+
+class NovelTrendingScore(models.Model):
+    """
+    Exponentially decayed activity score of a novel.
+
+    ``score`` is the value as of ``scored_at``. ``rank_key`` is the log of the
+    score shifted onto a fixed epoch, so comparing rank keys compares the
+    current decayed scores and rows without new activity never need rewriting.
+    """
+    novel = models.OneToOneField(
+        Novel, on_delete=models.CASCADE, primary_key=True, related_name='trending_score'
+    )
+    score = models.FloatField(default=COUNT_DEFAULT)
+    rank_key = models.FloatField(default=COUNT_DEFAULT)
+    scored_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-rank_key']),
+            models.Index(fields=['-scored_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.novel} - {self.score:.2f}"
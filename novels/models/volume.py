@@ -10,6 +10,11 @@ class Volume(models.Model):
     position = models.IntegerField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Denormalized pointer to the newest public chapter, kept by ChapterService
+    latest_public_chapter = models.ForeignKey(
+        'Chapter', on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    latest_public_chapter_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         unique_together = [
@@ -20,6 +25,7 @@ class Volume(models.Model):
         indexes = [
             models.Index(fields=['novel', 'position']),
             models.Index(fields=['novel', 'name']),  # Index for name lookups
+            models.Index(fields=['-latest_public_chapter_at']),
         ]
         
     def __str__(self):
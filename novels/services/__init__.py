@@ -1,5 +1,14 @@
+from .chapter_navigation_service import ChapterNavigationService
 from .chapter_service import ChapterService
 from .novel_service import NovelService
 from .reading_service import ReadingService
 from .reading_history_service import ReadingHistoryService
 from .novel_filter_service import NovelFilterService
+from .homepage_service import HomepageService
+from .trending_service import TrendingService
+from .chapter_content_cache import ChapterContentCache
+from .chapter_reading_bundle import ChapterReadingBundle
+from .daily_stats_service import DailyStatsService
+from .view_count_service import ViewCountService
+from .novel_rating_service import NovelRatingService
+from .user_counter_service import UserCounterService
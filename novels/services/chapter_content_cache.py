@@ -0,0 +1,70 @@
+import hashlib
+import json
+import zlib
+
+from django.core.cache import cache
+from django.utils.http import quote_etag
+
+from constants import CHAPTER_CONTENT_CACHE_TIMEOUT
+
+CHUNK_FIELDS = ('position', 'content', 'word_count')
+
+
+class ChapterContentCache:
+    """
+    Compressed cache of a chapter's assembled chunks.
+
+    The key embeds the chapter's ``updated_at``. Rewriting the chunks bumps
+    it, so old entries become unreachable and expire instead of needing an
+    explicit delete.
+    """
+
+    KEY_PREFIX = 'chapter_content'
+
+    @staticmethod
+    def get_chunks(chapter):
+        """All chunks of ``chapter`` as ordered dicts of CHUNK_FIELDS"""
+        key = ChapterContentCache.key(chapter)
+        payload = cache.get(key)
+        if payload is not None:
+            return json.loads(zlib.decompress(payload))
+
+        # Model instances rather than values() so compressed rows are decoded
+        chunks = [
+            {field: getattr(chunk, field) for field in CHUNK_FIELDS}
+            for chunk in chapter.chunks.order_by('position').only(*CHUNK_FIELDS, 'content_data')
+        ]
+        cache.set(key, zlib.compress(json.dumps(chunks).encode()), CHAPTER_CONTENT_CACHE_TIMEOUT)
+        return chunks
+
+    @staticmethod
+    def get_window(chapter, start, limit):
+        """
+        Chunks with ``start <= position < start + limit`` plus paging info,
+        cached per (chapter, updated_at, start, limit).
+        """
+        key = f'{ChapterContentCache.key(chapter)}:{start}:{limit}'
+        window = cache.get(key)
+        if window is not None:
+            return window
+
+        chunks = ChapterContentCache.get_chunks(chapter)
+        end = start + limit
+        window = {
+            'chunks': [chunk for chunk in chunks if start <= chunk['position'] < end],
+            'has_more': bool(chunks) and chunks[-1]['position'] >= end,
+            'next_start': end,
+            'total_chunks': len(chunks),
+        }
+        cache.set(key, window, CHAPTER_CONTENT_CACHE_TIMEOUT)
+        return window
+
+    @staticmethod
+    def key(chapter):
+        return f'{ChapterContentCache.KEY_PREFIX}:{chapter.id}:{chapter.updated_at.timestamp():.6f}'
+
+    @staticmethod
+    def etag(chapter, *parts):
+        """Strong ETag for the chapter content plus extra representation parts"""
+        raw = ':'.join(str(part) for part in (chapter.id, chapter.updated_at.isoformat(), *parts))
+        return quote_etag(hashlib.sha1(raw.encode()).hexdigest())
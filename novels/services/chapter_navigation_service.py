@@ -0,0 +1,97 @@
+import hashlib
+from collections import namedtuple
+
+from django.core.cache import cache
+
+from novels.models import Chapter
+from constants import CHAPTER_NAV_INDEX_TIMEOUT
+
+
+class ChapterNavEntry(namedtuple('ChapterNavEntry', 'id slug title volume_id volume_name')):
+    """Lightweight stand-in for a Chapter in navigation and sidebar lists"""
+    __slots__ = ()
+
+    @property
+    def pk(self):
+        return self.id
+
+    def __eq__(self, other):
+        if isinstance(other, Chapter):
+            return self.id == other.pk
+        return super().__eq__(other)
+
+    __hash__ = tuple.__hash__
+
+
+class ChapterNavigationService:
+    """
+    Cached, ordered index of a novel's public chapters.
+
+    One query builds the whole reading order; prev/next and the sidebar are
+    then lookups into the cached structure. Signals drop the index whenever
+    a chapter's visibility, title or position changes.
+    """
+
+    KEY_PREFIX = 'chapter_nav'
+
+    # Chapter fields that change a novel's reading order or sidebar
+    NAV_FIELDS = frozenset({
+        'volume', 'volume_id', 'title', 'slug', 'position',
+        'approved', 'is_hidden', 'deleted_at',
+    })
+
+    @staticmethod
+    def build_index(novel_id):
+        rows = Chapter.objects.filter(
+            volume__novel_id=novel_id,
+            approved=True,
+            is_hidden=False,
+            deleted_at__isnull=True
+        ).order_by('volume__position', 'position').values_list(
+            'id', 'slug', 'title', 'volume_id', 'volume__name'
+        )
+        entries = [ChapterNavEntry(*row) for row in rows]
+        return {
+            'entries': entries,
+            'positions': {entry.id: index for index, entry in enumerate(entries)},
+            # Digest of what the index shows, so every worker derives the same
+            # value and pages can put it in their ETag
+            'version': hashlib.sha1(repr(entries).encode()).hexdigest(),
+        }
+
+    @staticmethod
+    def get_index(novel_id):
+        key = ChapterNavigationService._key(novel_id)
+        index = cache.get(key)
+        if index is None:
+            index = ChapterNavigationService.build_index(novel_id)
+            cache.set(key, index, CHAPTER_NAV_INDEX_TIMEOUT)
+        return index
+
+    @staticmethod
+    def get_public_chapters(novel_id):
+        """Ordered public chapters of a novel as ChapterNavEntry tuples"""
+        return ChapterNavigationService.get_index(novel_id)['entries']
+
+    @staticmethod
+    def get_neighbours(chapter):
+        """
+        Return (prev, next) entries around ``chapter``, or None when the
+        chapter is not public and therefore not in the index.
+        """
+        index = ChapterNavigationService.get_index(chapter.volume.novel_id)
+        position = index['positions'].get(chapter.id)
+        if position is None:
+            return None
+        entries = index['entries']
+        prev_entry = entries[position - 1] if position > 0 else None
+        next_entry = entries[position + 1] if position + 1 < len(entries) else None
+        return prev_entry, next_entry
+
+    @staticmethod
+    def invalidate(novel_id):
+        cache.delete(ChapterNavigationService._key(novel_id))
+
+    @staticmethod
+    def _key(novel_id):
+        return f'{ChapterNavigationService.KEY_PREFIX}:{novel_id}'
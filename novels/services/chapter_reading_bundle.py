@@ -0,0 +1,81 @@
+from django.http import Http404
+
+from novels.models import Chapter
+from novels.services.chapter_service import ChapterService
+from novels.services.chapter_navigation_service import ChapterNavigationService
+from novels.services.chapter_content_cache import ChapterContentCache
+from novels.services.reading_service import ReadingService
+from constants import MAX_LIMIT_CHUNKS, WORDS_PER_MINUTE
+
+
+class ChapterReadingBundle:
+    """
+    Everything chapter_detail_view renders, built with a fixed query budget.
+
+    The novel loaded by ``require_active_novel`` is reused, chunks and their
+    statistics come from the compressed content cache, and navigation and
+    the public sidebar are read from the cached navigation index.
+    """
+
+    @staticmethod
+    def get_chapter(novel, chapter_slug, user=None):
+        """Single lookup; owners may also open hidden or unapproved chapters"""
+        chapters = Chapter.objects.select_related('volume').filter(
+            slug=chapter_slug,
+            volume__novel=novel,
+            deleted_at__isnull=True
+        )
+        is_owner = user and user.is_authenticated and novel.created_by_id == user.id
+        if not is_owner:
+            chapters = chapters.filter(approved=True, is_hidden=False)
+
+        chapter = chapters.first()
+        if chapter is None:
+            raise Http404("No Chapter matches the given query.")
+        chapter.volume.novel = novel
+        return chapter
+
+    @staticmethod
+    def get_chunk_stats(chapter, chunks):
+        word_counts = [chunk['word_count'] for chunk in chunks]
+        return {
+            'total_chunks': len(chunks),
+            'avg_chunk_size': sum(word_counts) / len(word_counts) if word_counts else 0,
+            'max_chunk_words': max(word_counts) if word_counts else 0,
+            'estimated_reading_time': chapter.word_count / WORDS_PER_MINUTE,
+        }
+
+    @staticmethod
+    def get_validators(novel, chapter):
+        """
+        (ETag, Last-Modified) of the public chapter page. The ETag also covers
+        the navigation index version so prev/next and sidebar changes show up.
+        """
+        nav_version = ChapterNavigationService.get_index(novel.id)['version']
+        etag = ChapterContentCache.etag(chapter, novel.updated_at.isoformat(), nav_version)
+        return etag, max(chapter.updated_at, novel.updated_at)
+
+    @staticmethod
+    def build(novel, chapter_slug, user=None):
+        """Return the chapter page context (without request-level constants)"""
+        chapter = ChapterReadingBundle.get_chapter(novel, chapter_slug, user)
+        return ChapterReadingBundle.build_for_chapter(novel, chapter, user)
+
+    @staticmethod
+    def build_for_chapter(novel, chapter, user=None):
+        chunks = ChapterContentCache.get_chunks(chapter)
+        initial_chunks = [chunk for chunk in chunks if chunk['position'] <= MAX_LIMIT_CHUNKS]
+        navigation = ChapterService.get_chapter_navigation(chapter)
+
+        return {
+            'chapter': chapter,
+            'chunks': initial_chunks,
+            'novel': novel,
+            'volume': chapter.volume,
+            'next_chapter': navigation['next_chapter'],
+            'prev_chapter': navigation['prev_chapter'],
+            'reading_history': ReadingService.get_or_create_reading_history(user, chapter),
+            'all_chapters': ChapterService.get_all_chapters_for_novel(novel, user),
+            'loaded_chunks': len(initial_chunks),
+            **ChapterReadingBundle.get_chunk_stats(chapter, chunks),
+        }
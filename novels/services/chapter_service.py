@@ -1,12 +1,17 @@
 from django.shortcuts import get_object_or_404
 from django.http import Http404
 from django.core.paginator import Paginator
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Q, F, FloatField, IntegerField, Sum
+from django.db.models.functions import Cast, Ceil
+from django.utils import timezone
 from common.utils.sse import send_notification_to_user
-from novels.models import Chapter
+from novels.models import Novel, Volume, Chapter
+from novels.services.chapter_navigation_service import ChapterNavigationService
 from constants import (
     PAGINATOR_COMMON_LIST,
     DEFAULT_PAGE_NUMBER,
+    WORDS_PER_MINUTE,
 )
 class ChapterService:
     @staticmethod
@@ -35,9 +40,27 @@ class ChapterService:
             else:
                 raise Http404("No Chapter matches the given query.")
     
+    @staticmethod
+    def get_readable_chapter(chapter_id, user=None):
+        """Get a chapter by id if it is public or owned by ``user``"""
+        visible = Q(approved=True, is_hidden=False)
+        if user and user.is_authenticated:
+            visible |= Q(volume__novel__created_by=user)
+        return get_object_or_404(
+            Chapter.objects.filter(visible, id=chapter_id, deleted_at__isnull=True)
+        )
+
     @staticmethod
     def get_chapter_navigation(chapter):
         """Get next and previous chapters"""
+        neighbours = ChapterNavigationService.get_neighbours(chapter)
+        if neighbours is not None:
+            prev_chapter, next_chapter = neighbours
+            return {
+                'next_chapter': next_chapter,
+                'prev_chapter': prev_chapter
+            }
+        # Chapters outside the public index (owner previews, admin review)
         return {
             'next_chapter': chapter.get_next_chapter(),
             'prev_chapter': chapter.get_previous_chapter()
@@ -46,42 +69,18 @@ class ChapterService:
     @staticmethod
     def get_all_chapters_for_novel(novel, user=None):
         """Get all chapters for a novel based on user permissions"""
-        if user and user.is_authenticated and novel.created_by == user:
+        if user and user.is_authenticated and novel.created_by_id == user.id:
             # Owner can see all non-deleted chapters
             return Chapter.objects.filter(
                 volume__novel=novel,
                 deleted_at__isnull=True
-            ).select_related('volume').order_by('volume__position', 'position')
+            ).select_related('volume').annotate(
+                volume_name=F('volume__name')
+            ).order_by('volume__position', 'position')
         else:
-            # Public view - only approved and visible chapters
-            return Chapter.objects.filter(
-                volume__novel=novel,
-                approved=True,
-                is_hidden=False,
-                deleted_at__isnull=True
-            ).select_related('volume').order_by('volume__position', 'position')
+            # Public view - only approved and visible chapters, from the cached index
+            return ChapterNavigationService.get_public_chapters(novel.id)
     
-    @staticmethod
-    def get_chapter_chunks_stats(chapter):
-        """Calculate chapter chunking statistics"""
-        from constants import WORDS_PER_MINUTE
-        
-        all_chunks = chapter.chunks.all()
-        total_chunks = all_chunks.count()
-        
-        chunk_word_counts = [chunk.word_count for chunk in all_chunks]
-        avg_chunk_size = sum(chunk_word_counts) / len(chunk_word_counts) if chunk_word_counts else 0
-        max_chunk_words = max(chunk_word_counts) if chunk_word_counts else 0
-        estimated_reading_time = chapter.word_count / WORDS_PER_MINUTE
-        
-        return {
-            'all_chunks': all_chunks,
-            'total_chunks': total_chunks,
-            'avg_chunk_size': avg_chunk_size,
-            'max_chunk_words': max_chunk_words,
-            'estimated_reading_time': estimated_reading_time
-        }
-
     @staticmethod
     def get_pending_chapters_for_admin(search_query='', page=DEFAULT_PAGE_NUMBER):
         """Get paginated list of chapters pending approval"""
@@ -153,19 +152,135 @@ class ChapterService:
     @staticmethod
     def approve_chapter(chapter):
         """Approve a chapter"""
-        chapter.approved = True
-        chapter.rejected_reason = None
-        chapter.save()
+        with transaction.atomic():
+            was_public = ChapterService.lock_public_state(chapter)
+            chapter.approved = True
+            chapter.rejected_reason = None
+            chapter.save()
+            ChapterService.apply_visibility_change(chapter, was_public)
+        ChapterService.refresh_latest_chapter_pointers(chapter.volume)
         return chapter
 
     @staticmethod
     def reject_chapter(chapter, rejected_reason):
         """Reject a chapter with reason"""
-        chapter.approved = False
-        chapter.rejected_reason = rejected_reason
-        chapter.save()
+        with transaction.atomic():
+            was_public = ChapterService.lock_public_state(chapter)
+            chapter.approved = False
+            chapter.rejected_reason = rejected_reason
+            chapter.save()
+            ChapterService.apply_visibility_change(chapter, was_public)
+        ChapterService.refresh_latest_chapter_pointers(chapter.volume)
+        return chapter
+
+    @staticmethod
+    def set_chapter_hidden(chapter, is_hidden):
+        """Hide or unhide a chapter"""
+        with transaction.atomic():
+            was_public = ChapterService.lock_public_state(chapter)
+            chapter.is_hidden = is_hidden
+            chapter.save(update_fields=['is_hidden', 'updated_at'])
+            ChapterService.apply_visibility_change(chapter, was_public)
+        ChapterService.refresh_latest_chapter_pointers(chapter.volume)
         return chapter
 
+    @staticmethod
+    def soft_delete_chapter(chapter):
+        """Soft delete a chapter"""
+        with transaction.atomic():
+            was_public = ChapterService.lock_public_state(chapter)
+            chapter.deleted_at = timezone.now()
+            chapter.save(update_fields=['deleted_at'])
+            ChapterService.apply_visibility_change(chapter, was_public)
+        ChapterService.refresh_latest_chapter_pointers(chapter.volume)
+        return chapter
+
+    @staticmethod
+    def is_public(chapter):
+        return chapter.approved and not chapter.is_hidden and chapter.deleted_at is None
+
+    @staticmethod
+    def lock_public_state(chapter):
+        """
+        Lock the chapter row and return whether it is public as stored.
+
+        The instance may be stale, so the stored state and word count
+        decide what the novel's totals already include.
+        """
+        stored = Chapter.objects.select_for_update().only(
+            'approved', 'is_hidden', 'deleted_at', 'word_count'
+        ).get(pk=chapter.pk)
+        chapter.word_count = stored.word_count
+        return ChapterService.is_public(stored)
+
+    @staticmethod
+    def apply_visibility_change(chapter, was_public):
+        """Add or remove the chapter's words when it enters or leaves the public list"""
+        is_public = ChapterService.is_public(chapter)
+        if is_public != was_public:
+            delta = chapter.word_count if is_public else -chapter.word_count
+            ChapterService.apply_word_count_delta(chapter.volume.novel_id, delta)
+
+    @staticmethod
+    def apply_word_count_delta(novel_id, delta):
+        """Add ``delta`` public words to a novel and its reading time with one UPDATE"""
+        if not delta:
+            return
+        # reading_minutes comes first: MySQL evaluates SET clauses left to
+        # right and would otherwise read the already updated word_count
+        Novel.objects.filter(pk=novel_id).update(
+            reading_minutes=ChapterService.reading_minutes(F('word_count') + delta),
+            word_count=F('word_count') + delta,
+        )
+
+    @staticmethod
+    def visible_words_by_novel(chapters):
+        """{novel_id: words} of the approved, unhidden chapters in ``chapters``, for bulk updates"""
+        return dict(
+            chapters.filter(approved=True, is_hidden=False)
+            .order_by()
+            .values('volume__novel_id')
+            .annotate(words=Sum('word_count'))
+            .values_list('volume__novel_id', 'words')
+        )
+
+    @staticmethod
+    def reading_minutes(words):
+        """Expression for the minutes it takes to read ``words`` words"""
+        return Ceil(Cast(words, FloatField()) / WORDS_PER_MINUTE, output_field=IntegerField())
+
+    @staticmethod
+    def refresh_latest_chapter_pointers(volume):
+        """
+        Recompute latest_public_chapter on the volume and its novel.
+
+        Must be called after any change to a chapter's visibility or content.
+        Uses queryset updates so Volume/Novel updated_at are left untouched.
+        """
+        latest = Chapter.objects.filter(
+            volume_id=volume.id,
+            approved=True,
+            is_hidden=False,
+            deleted_at__isnull=True
+        ).order_by('-updated_at', '-id').only('id', 'updated_at').first()
+
+        Volume.objects.filter(pk=volume.id).update(
+            latest_public_chapter=latest,
+            latest_public_chapter_at=latest.updated_at if latest else None
+        )
+
+        novel_latest = Volume.objects.filter(
+            novel_id=volume.novel_id,
+            latest_public_chapter_at__isnull=False
+        ).order_by(
+            '-latest_public_chapter_at', '-latest_public_chapter_id'
+        ).values('latest_public_chapter_id', 'latest_public_chapter_at').first()
+
+        Novel.objects.filter(pk=volume.novel_id).update(
+            latest_public_chapter_id=novel_latest['latest_public_chapter_id'] if novel_latest else None,
+            latest_public_chapter_at=novel_latest['latest_public_chapter_at'] if novel_latest else None
+        )
+
     @staticmethod
     def get_chapter_review_context(chapter):
         """Get complete context for chapter review"""
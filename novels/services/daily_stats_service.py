@@ -0,0 +1,171 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import Case, Count, F, IntegerField, Sum, Value, When
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from interactions.models import Comment, Review
+from novels.models import Chapter, DailyStatsWatermark, Favorite, Novel, NovelDailyStats
+from constants import (
+    RECONCILE_BATCH_SIZE,
+    DAILY_STATS_LOOKBACK_DAYS,
+    DAILY_STATS_SETTLE_SECONDS,
+)
+
+STAT_FIELDS = ('views', 'favorites', 'reviews', 'comments', 'new_chapters')
+
+
+class DailyStatsService:
+    """
+    NovelDailyStats rollup and the dashboard queries that read it.
+
+    rollup_daily_stats folds the events created since the watermark into
+    per-novel, per-day counts. Views have no per-event rows, so
+    ViewCountService adds them to the day of each flush instead.
+    """
+
+    # (stats field, model, lookup of the novel, timestamp field, extra filters)
+    ACTIVITY_SOURCES = (
+        ('favorites', Favorite, 'novel', 'created_at', {}),
+        ('reviews', Review, 'novel', 'created_at', {'is_active': True}),
+        ('comments', Comment, 'novel', 'created_at', {'is_active': True}),
+        ('new_chapters', Chapter, 'volume__novel', 'created_at', {}),
+    )
+
+    @staticmethod
+    def collect_activity(since, until):
+        """{(novel_id, date): {field: events}} for events in (since, until]"""
+        counts = defaultdict(dict)
+        for field, model, novel_lookup, time_field, filters in DailyStatsService.ACTIVITY_SOURCES:
+            rows = (
+                model.objects.filter(
+                    **{f'{time_field}__gt': since, f'{time_field}__lte': until},
+                    **filters
+                )
+                .annotate(day=TruncDate(time_field))
+                .order_by()
+                .values(novel_lookup, 'day')
+                .annotate(events=Count('pk'))
+                .values_list(novel_lookup, 'day', 'events')
+            )
+            for novel_id, day, events in rows:
+                counts[(novel_id, day)][field] = events
+        return counts
+
+    @staticmethod
+    def rollup(now=None, batch_size=RECONCILE_BATCH_SIZE):
+        """Fold the window after the watermark into NovelDailyStats; return (since, until, rows written)"""
+        until = (now or timezone.now()) - timedelta(seconds=DAILY_STATS_SETTLE_SECONDS)
+        with transaction.atomic():
+            # The locked watermark keeps concurrent runs from counting a window twice
+            watermark, _ = DailyStatsWatermark.objects.select_for_update().get_or_create(
+                pk=1,
+                defaults={'processed_until': until - timedelta(days=DAILY_STATS_LOOKBACK_DAYS)}
+            )
+            since = watermark.processed_until
+            if until <= since:
+                return since, since, 0
+
+            counts = DailyStatsService.collect_activity(since, until)
+            keys = list(counts)
+            for start in range(0, len(keys), batch_size):
+                DailyStatsService.add_activity({key: counts[key] for key in keys[start:start + batch_size]})
+
+            watermark.processed_until = until
+            watermark.save(update_fields=['processed_until'])
+        return since, until, len(keys)
+
+    @staticmethod
+    def add_activity(counts):
+        """Add ``counts`` to the stored rows with one read and one upsert"""
+        stored = {
+            (row['novel_id'], row['date']): row
+            for row in NovelDailyStats.objects.filter(
+                novel_id__in={novel_id for novel_id, _ in counts},
+                date__in={day for _, day in counts},
+            ).values('novel_id', 'date', *STAT_FIELDS)
+        }
+        fields = [field for field in STAT_FIELDS if field != 'views']
+        rows = []
+        for (novel_id, day), events in counts.items():
+            previous = stored.get((novel_id, day), {})
+            rows.append(NovelDailyStats(
+                novel_id=novel_id,
+                date=day,
+                **{field: previous.get(field, 0) + events.get(field, 0) for field in fields}
+            ))
+        # MySQL upserts on any unique key and rejects an explicit conflict target
+        conflict_target = {}
+        if connection.features.supports_update_conflicts_with_target:
+            conflict_target['unique_fields'] = ['novel', 'date']
+        # views belongs to the view flush, so the upsert leaves it alone
+        NovelDailyStats.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            update_fields=fields,
+            **conflict_target,
+        )
+
+    @staticmethod
+    def add_views(deltas, day=None):
+        """Add flushed ``{novel_id: views}`` to the stats of ``day``"""
+        day = day or timezone.localdate()
+        # Buffered views may outlive a deleted novel
+        novel_ids = list(Novel.objects.filter(pk__in=list(deltas)).values_list('pk', flat=True))
+        if not novel_ids:
+            return
+        NovelDailyStats.objects.bulk_create(
+            [NovelDailyStats(novel_id=novel_id, date=day) for novel_id in novel_ids],
+            ignore_conflicts=True,
+        )
+        increment = Case(
+            *[When(novel_id=novel_id, then=Value(deltas[novel_id])) for novel_id in novel_ids],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        NovelDailyStats.objects.filter(date=day, novel_id__in=novel_ids).update(views=F('views') + increment)
+
+    @staticmethod
+    def daily_series(days, today=None):
+        """Site-wide totals per day for the last ``days`` days, zero-filled"""
+        today = today or timezone.localdate()
+        start = today - timedelta(days=days - 1)
+        totals = {
+            row['date']: row
+            for row in NovelDailyStats.objects.filter(date__gte=start, date__lte=today)
+            .values('date')
+            .annotate(**{f'{field}_total': Sum(field) for field in STAT_FIELDS})
+        }
+        dates = [start + timedelta(days=offset) for offset in range(days)]
+        series = {'dates': dates}
+        for field in STAT_FIELDS:
+            series[field] = [totals[day][f'{field}_total'] if day in totals else 0 for day in dates]
+        return series
+
+    @staticmethod
+    def top_novels(since, limit):
+        """Most viewed novels since ``since`` as dicts with name and views"""
+        return list(
+            NovelDailyStats.objects.filter(date__gte=since)
+            .values('novel_id')
+            .annotate(name=F('novel__name'), views=Sum('views'))
+            .filter(views__gt=0)
+            .order_by('-views')[:limit]
+        )
+
+    @staticmethod
+    def top_authors(since, limit):
+        """Authors whose novels were viewed most since ``since``"""
+        return list(
+            NovelDailyStats.objects.filter(date__gte=since, novel__author__isnull=False)
+            .values('novel__author_id')
+            .annotate(
+                name=F('novel__author__name'),
+                total_views=Sum('views'),
+                total_novels=Count('novel', distinct=True),
+            )
+            .filter(total_views__gt=0)
+            .order_by('-total_views')[:limit]
+        )
@@ -0,0 +1,153 @@
+import time
+
+from django.core.cache import cache
+
+from interactions.models import Comment
+from novels.services.novel_service import NovelService
+from novels.utils import format_comments_for_template, get_relative_time
+from constants import (
+    ApprovalStatus,
+    MAX_HOME_COMMENTS,
+    MAX_HOME_NEW_NOVELS,
+    MAX_FINISH_NOVELS,
+    HOME_SNAPSHOT_TIMEOUT,
+    HOME_SNAPSHOT_STALE_TIMEOUT,
+    HOME_SNAPSHOT_LOCK_TIMEOUT,
+    HOME_SNAPSHOT_LOCK_WAIT,
+    HOME_SNAPSHOT_POLL_INTERVAL,
+)
+
+CARD_FIELDS = ('name', 'slug', 'image_url', 'summary')
+
+
+class HomepageService:
+    """
+    Cached snapshot of the homepage sections.
+
+    Each section is cached under its own key and dropped when one of its
+    tags is invalidated. A longer-lived stale copy is kept so that, while one
+    worker holds the rebuild lock, the others keep serving the old section
+    instead of all querying the database at once.
+    """
+
+    KEY_PREFIX = 'home:snapshot'
+
+    SECTIONS = (
+        'trend_novels',
+        'new_novels',
+        'like_novels',
+        'finish_novels',
+        'newupdate_novels',
+        'comments',
+    )
+
+    TAG_SECTIONS = {
+        'novel': SECTIONS,
+        'chapter': ('finish_novels', 'newupdate_novels'),
+        'comment': ('comments',),
+        'favorite': ('like_novels',),
+        'trending': ('trend_novels',),
+    }
+
+    @staticmethod
+    def build_trend_novels():
+        return list(NovelService.get_trend_novels().values(*CARD_FIELDS))
+
+    @staticmethod
+    def build_new_novels():
+        return list(NovelService.get_new_novels()[:MAX_HOME_NEW_NOVELS].values(*CARD_FIELDS))
+
+    @staticmethod
+    def build_like_novels():
+        return list(NovelService.get_like_novels().values(*CARD_FIELDS))
+
+    @staticmethod
+    def build_finish_novels():
+        novels = NovelService.get_finished_novels_with_chapters(MAX_FINISH_NOVELS)
+        return [{
+            'name': novel.name,
+            'slug': novel.slug,
+            'image_url': novel.image_url,
+            'recent_volume': {
+                'name': novel.recent_volume.name
+            } if getattr(novel, 'recent_volume', None) else None,
+            'recent_chapter': {
+                'title': novel.recent_chapter.title
+            } if getattr(novel, 'recent_chapter', None) else None,
+        } for novel in novels]
+
+    @staticmethod
+    def build_newupdate_novels():
+        return NovelService.get_recent_volumes_for_cards()
+
+    @staticmethod
+    def build_comments():
+        comments = Comment.objects.select_related('user', 'novel', 'user__profile').filter(
+            novel__approval_status=ApprovalStatus.APPROVED.value,
+            novel__deleted_at__isnull=True,
+            is_reported=False
+        ).exclude(
+            user__isnull=True
+        ).order_by('-created_at')[:MAX_HOME_COMMENTS]
+        return format_comments_for_template(comments)
+
+    @classmethod
+    def get_snapshot(cls):
+        """Return every homepage section, rebuilding only the missing ones"""
+        keys = {name: cls._key(name) for name in cls.SECTIONS}
+        cached = cache.get_many(list(keys.values()))
+
+        snapshot = {}
+        for name, key in keys.items():
+            if key in cached:
+                snapshot[name] = cached[key]
+            else:
+                snapshot[name] = cls._rebuild_section(name)
+
+        # Relative times must not be frozen in the cache
+        snapshot['comments'] = [
+            dict(comment, time=get_relative_time(comment['created_at']))
+            for comment in snapshot['comments']
+        ]
+        return snapshot
+
+    @classmethod
+    def invalidate(cls, *tags):
+        """Drop the fresh copy of every section attached to the given tags"""
+        sections = set()
+        for tag in tags:
+            sections.update(cls.TAG_SECTIONS.get(tag, ()))
+        if sections:
+            cache.delete_many([cls._key(name) for name in sections])
+
+    @classmethod
+    def _rebuild_section(cls, name):
+        key = cls._key(name)
+        builder = getattr(cls, f'build_{name}')
+
+        if cache.add(f'{key}:lock', True, HOME_SNAPSHOT_LOCK_TIMEOUT):
+            try:
+                data = builder()
+                cache.set(key, data, HOME_SNAPSHOT_TIMEOUT)
+                cache.set(f'{key}:stale', data, HOME_SNAPSHOT_STALE_TIMEOUT)
+            finally:
+                cache.delete(f'{key}:lock')
+            return data
+
+        # Another worker is rebuilding: serve the stale copy if there is one
+        stale = cache.get(f'{key}:stale')
+        if stale is not None:
+            return stale
+
+        deadline = time.monotonic() + HOME_SNAPSHOT_LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(HOME_SNAPSHOT_POLL_INTERVAL)
+            data = cache.get(key)
+            if data is not None:
+                return data
+
+        return builder()
+
+    @classmethod
+    def _key(cls, name):
+        return f'{cls.KEY_PREFIX}:{name}'
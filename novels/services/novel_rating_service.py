@@ -0,0 +1,65 @@
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+from novels.models import Novel
+from constants import MIN_RATE, MAX_RATE, RECONCILE_BATCH_SIZE
+
+STARS = range(MIN_RATE + 1, MAX_RATE + 1)
+
+
+class NovelRatingService:
+    """
+    Rating totals of a novel kept in step with its active reviews.
+
+    Review writes adjust rating_sum, rating_count and the per-star counts
+    with F() expressions in the same transaction, so listings can sort by
+    rating_avg and the review panel can show the histogram without
+    aggregating reviews.
+    """
+
+    @staticmethod
+    def star_field(star):
+        return f'rating_{star}_count'
+
+    @staticmethod
+    def apply(novel_id, added=None, removed=None):
+        """Add and/or remove one rating from a novel's totals"""
+        if added == removed:
+            return
+        sum_delta = (added or 0) - (removed or 0)
+        count_delta = (added is not None) - (removed is not None)
+        changes = {}
+        if added in STARS:
+            changes[NovelRatingService.star_field(added)] = F(NovelRatingService.star_field(added)) + 1
+        if removed in STARS:
+            changes[NovelRatingService.star_field(removed)] = F(NovelRatingService.star_field(removed)) - 1
+
+        # rating_avg comes first: MySQL evaluates SET clauses left to right and
+        # would otherwise read the already updated sum and count
+        Novel.objects.filter(pk=novel_id).update(
+            rating_avg=Coalesce(
+                Cast(F('rating_sum') + sum_delta, FloatField())
+                / NullIf(F('rating_count') + count_delta, 0),
+                Value(0.0),
+            ),
+            rating_sum=F('rating_sum') + sum_delta,
+            rating_count=F('rating_count') + count_delta,
+            **changes
+        )
+
+    @staticmethod
+    def histogram(novel):
+        """(star, count, percent of all ratings) from the highest star down"""
+        histogram = []
+        for star in reversed(STARS):
+            count = getattr(novel, NovelRatingService.star_field(star))
+            percent = round(count * 100 / novel.rating_count) if novel.rating_count else 0
+            histogram.append((star, count, percent))
+        return histogram
+
+    @staticmethod
+    def reconcile(batch_size=RECONCILE_BATCH_SIZE):
+        """Rewrite the totals of novels that drifted from their reviews; return how many"""
+        from novels.counters import NOVEL_RATING
+
+        return NOVEL_RATING.reconcile(batch_size, fix=True).fixed
@@ -1,8 +1,11 @@
+from datetime import timedelta
+
 from django.utils import timezone
 
-from django.db.models import OuterRef, Subquery, Q, Prefetch
+from django.db.models import Q, F, Max, Window
+from django.db.models.functions import RowNumber
 from django.core.paginator import Paginator
-from novels.models import Novel, Volume, Chapter, Tag, Favorite
+from novels.models import Novel, Volume, Chapter, Tag, Favorite, NovelTrendingScore
 from django.db import IntegrityError
 from django.db import transaction
 from constants import (
@@ -10,7 +13,8 @@ from constants import (
     MAX_LIKE_NOVELS, MAX_FINISH_NOVELS, MAX_NEWUPDATE_NOVELS,
     MAX_LATEST_CHAPTER, NOVEL_PER_PAGE, PAGINATOR_COMMON_LIST,
     SEARCH_RESULTS_LIMIT, SUMMARY_TRUNCATE_WORDS, DEFAULT_RATING_AVERAGE,
-    MAX_CHAPTER_LIST,MAX_LIKE_NOVELS_PAGE, NotificationTypeChoices
+    MAX_CHAPTER_LIST,MAX_LIKE_NOVELS_PAGE, RECONCILE_BATCH_SIZE, TRENDING_STALE_HOURS,
+    NotificationTypeChoices
 )
 from interactions.services.notification_service import NotificationService
 from django.utils.translation import gettext_lazy as _
@@ -29,12 +33,21 @@ class NovelService:
     
     @staticmethod
     def get_trend_novels():
-        """Get trending novels based on view count"""
-        return NovelService.get_approved_novels().order_by('-view_count')[:MAX_TREND_NOVELS]
+        """Get the top trending novels from the precomputed scores"""
+        return NovelService.get_more_trend_novels()[:MAX_TREND_NOVELS]
     @staticmethod
     def get_more_trend_novels():
-        """Get trending novels based on view count"""
-        return NovelService.get_approved_novels().order_by('-view_count')
+        """
+        Get trending novels by decayed activity score, falling back to view
+        count before the first scoring run or when update_trending_scores has
+        not scored anything for TRENDING_STALE_HOURS
+        """
+        last_run = NovelTrendingScore.objects.aggregate(last=Max('scored_at'))['last']
+        if last_run is None or timezone.now() - last_run > timedelta(hours=TRENDING_STALE_HOURS):
+            return NovelService.get_approved_novels().order_by('-view_count', '-id')
+        return NovelService.get_approved_novels().filter(
+            trending_score__isnull=False
+        ).order_by('-trending_score__rank_key', '-id')
     
     @staticmethod
     def get_new_novels():
@@ -47,68 +60,60 @@ class NovelService:
         return NovelService.get_approved_novels().order_by('-favorite_count')[:MAX_LIKE_NOVELS]
     
     @staticmethod
-    def get_finished_novels_with_chapters():
-        """Get finished novels with their latest volumes and chapters"""
-        finish_novels = Novel.objects.filter(
-            progress_status=ProgressStatus.COMPLETED.value,
-            approval_status=ApprovalStatus.APPROVED.value
-        ).order_by('-updated_at')
-        
-        novel_ids = list(finish_novels.values_list('id', flat=True)[:MAX_FINISH_NOVELS])
-        
-        all_volumes = Volume.objects.filter(novel_id__in=novel_ids).order_by('-updated_at')
-        all_chapters = Chapter.objects.filter(volume__novel_id__in=novel_ids).order_by('-updated_at')
-        
-        # Build dictionaries for efficient lookup
-        recent_volume_dict = {}
-        for volume in all_volumes:
-            if volume.novel_id not in recent_volume_dict:
-                recent_volume_dict[volume.novel_id] = volume
-        
-        recent_chapter_dict = {}
-        for chapter in all_chapters:
-            vol_id = chapter.volume_id
-            if vol_id in [v.id for v in recent_volume_dict.values()]:
-                if vol_id not in recent_chapter_dict:
-                    recent_chapter_dict[vol_id] = chapter
-        
-        # Attach recent volumes and chapters to novels
-        for novel in finish_novels:
-            recent_volume = recent_volume_dict.get(novel.id)
-            novel.recent_volume = recent_volume
-            if recent_volume:
-                recent_chapter = Chapter.objects.filter(
-                    volume=recent_volume
-                ).order_by('-updated_at').first()
-                novel.recent_chapter = recent_chapter
-        
-        return finish_novels
-    
+    def get_finished_novels():
+        """Get approved, completed novels, most recently updated first"""
+        return NovelService.get_approved_novels().filter(
+            progress_status=ProgressStatus.COMPLETED.value
+        ).order_by('-updated_at', '-id')
+
     @staticmethod
-    def get_recent_volumes_for_cards(limit=MAX_LATEST_CHAPTER):
-        """Get recent volumes with their latest chapters for homepage cards"""
-        
-        # Get the most recent chapter for each volume
-        latest_chapter_subquery = Chapter.objects.filter(
-            volume_id=OuterRef('pk'),
+    def attach_recent_chapters(novels):
+        """
+        Attach recent_volume and recent_chapter to each novel in one query.
+
+        The latest public chapter of every novel is picked with a
+        ROW_NUMBER() window, so the cost does not depend on how many
+        volumes or chapters the novels have.
+        """
+        novels = list(novels)
+        if not novels:
+            return novels
+
+        latest_chapters = Chapter.objects.filter(
+            volume__novel_id__in=[novel.id for novel in novels],
             approved=True,
             is_hidden=False,
             deleted_at__isnull=True
-        ).order_by('-updated_at').values('title', 'updated_at')[:1]
+        ).select_related('volume').annotate(
+            row_number=Window(
+                expression=RowNumber(),
+                partition_by=[F('volume__novel_id')],
+                order_by=[F('updated_at').desc(), F('id').desc()]
+            )
+        ).filter(row_number=1)
+
+        chapter_by_novel = {chapter.volume.novel_id: chapter for chapter in latest_chapters}
+        for novel in novels:
+            chapter = chapter_by_novel.get(novel.id)
+            novel.recent_chapter = chapter
+            novel.recent_volume = chapter.volume if chapter else None
+        return novels
 
-        # Get volumes with approved novels, ordered by their latest chapter update
-        volumes = Volume.objects.select_related('novel').filter(
+    @staticmethod
+    def get_finished_novels_with_chapters(limit=MAX_FINISH_NOVELS):
+        """Get finished novels with their latest volumes and chapters (two queries)"""
+        return NovelService.attach_recent_chapters(
+            NovelService.get_finished_novels()[:limit]
+        )
+    
+    @staticmethod
+    def get_recent_volumes_for_cards(limit=MAX_LATEST_CHAPTER):
+        """Get recent volumes with their latest chapters for homepage cards"""
+        volumes = Volume.objects.select_related('novel', 'latest_public_chapter').filter(
             novel__approval_status=ApprovalStatus.APPROVED.value,
             novel__deleted_at__isnull=True,
-            chapters__approved=True,
-            chapters__is_hidden=False,
-            chapters__deleted_at__isnull=True
-        ).annotate(
-            recent_chapter_title=Subquery(latest_chapter_subquery.values('title')),
-            latest_chapter_update=Subquery(latest_chapter_subquery.values('updated_at'))
-        ).filter(
-            recent_chapter_title__isnull=False
-        ).distinct().order_by('-latest_chapter_update')[:limit]
+            latest_public_chapter_at__isnull=False
+        ).order_by('-latest_public_chapter_at')[:limit]
         
         return [{
             'name': vol.novel.name,  
@@ -118,8 +123,8 @@ class NovelService:
                 'name': vol.name
             },
             'recent_chapter': {
-                'title': vol.recent_chapter_title
-            } if vol.recent_chapter_title else None
+                'title': vol.latest_public_chapter.title
+            } if vol.latest_public_chapter else None
         } for vol in volumes]
 
     @staticmethod
@@ -478,15 +483,39 @@ class NovelService:
         
 class FavoriteService:
     @staticmethod
-    @transaction.atomic
     def toggle_like(user, novel):
-        fav = Favorite.objects.filter(user=user, novel=novel).first()
-        if fav:
-            fav.delete()
-            return False
-        else:
-            Favorite.objects.create(user=user, novel=novel)
-            return True
+        return FavoriteService.toggle(user, novel)[0]
+
+    @staticmethod
+    def toggle(user, novel):
+        """
+        Like or unlike ``novel``; return (liked, new favorite_count).
+
+        The delete or insert and the F() adjustment of favorite_count share a
+        transaction, so concurrent toggles never drift the counter, and the
+        count is read back from the novel row instead of counting favorites.
+        """
+        with transaction.atomic():
+            deleted, _ = Favorite.objects.filter(user=user, novel=novel).delete()
+            if deleted:
+                liked, delta = False, -1
+            else:
+                # A concurrent toggle by the same user may have inserted it first
+                _, created = Favorite.objects.get_or_create(user=user, novel=novel)
+                liked, delta = True, int(created)
+
+            novels = Novel.objects.filter(pk=novel.pk)
+            if delta:
+                novels.update(favorite_count=F('favorite_count') + delta)
+            novel.favorite_count = novels.values_list('favorite_count', flat=True).get()
+        return liked, novel.favorite_count
+
+    @staticmethod
+    def reconcile(batch_size=RECONCILE_BATCH_SIZE):
+        """Rewrite favorite_count where it drifted from the favorites; return how many novels changed"""
+        from novels.counters import NOVEL_FAVORITE_COUNT
+
+        return NOVEL_FAVORITE_COUNT.reconcile(batch_size, fix=True).fixed
 
 
 def get_liked_novels(user, page_number, per_page=MAX_LIKE_NOVELS_PAGE):
@@ -0,0 +1,117 @@
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from interactions.models import Comment, Review
+from novels.models import Favorite, NovelTrendingScore, ReadingHistory
+from novels.services.homepage_service import HomepageService
+from constants import (
+    RECONCILE_BATCH_SIZE,
+    TRENDING_HALF_LIFE_HOURS,
+    TRENDING_LOOKBACK_DAYS,
+    TRENDING_MIN_SCORE,
+    TRENDING_VIEW_WEIGHT,
+    TRENDING_FAVORITE_WEIGHT,
+    TRENDING_REVIEW_WEIGHT,
+    TRENDING_COMMENT_WEIGHT,
+)
+
+# Fixed origin of rank keys; it must never change once scores exist
+RANK_EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+DECAY_RATE = math.log(2) / (TRENDING_HALF_LIFE_HOURS * 3600)
+
+
+class TrendingService:
+    """
+    Incremental recompute of NovelTrendingScore.
+
+    Only novels with activity since the previous run are rewritten; the
+    newest ``scored_at`` in the table doubles as that run's watermark.
+    """
+
+    # (model, timestamp field, weight, extra filters)
+    ACTIVITY_SOURCES = (
+        (ReadingHistory, 'read_at', TRENDING_VIEW_WEIGHT, {}),
+        (Favorite, 'created_at', TRENDING_FAVORITE_WEIGHT, {}),
+        (Review, 'created_at', TRENDING_REVIEW_WEIGHT, {'is_active': True}),
+        (Comment, 'created_at', TRENDING_COMMENT_WEIGHT, {'is_active': True}),
+    )
+
+    @staticmethod
+    def rank_key(score, at):
+        """Log of ``score`` moved onto RANK_EPOCH, comparable across scoring times"""
+        return math.log(score) + DECAY_RATE * (at - RANK_EPOCH).total_seconds()
+
+    @staticmethod
+    def decayed_score(score, scored_at, now):
+        return score * math.exp(-DECAY_RATE * (now - scored_at).total_seconds())
+
+    @staticmethod
+    def last_run_at():
+        return NovelTrendingScore.objects.aggregate(last=Max('scored_at'))['last']
+
+    @staticmethod
+    def collect_activity(since, until):
+        """Sum the decayed weights of events in (since, until] per novel"""
+        totals = defaultdict(float)
+        for model, time_field, weight, filters in TrendingService.ACTIVITY_SOURCES:
+            events = model.objects.filter(
+                **{f'{time_field}__gt': since, f'{time_field}__lte': until},
+                **filters
+            ).values_list('novel_id', time_field)
+            for novel_id, happened_at in events.iterator(chunk_size=RECONCILE_BATCH_SIZE):
+                totals[novel_id] += TrendingService.decayed_score(weight, happened_at, until)
+        return totals
+
+    @staticmethod
+    def recompute(now=None, since=None, batch_size=RECONCILE_BATCH_SIZE):
+        """Fold new activity into the scores; return (novels scored, rows pruned)"""
+        now = now or timezone.now()
+        if since is None:
+            since = TrendingService.last_run_at() or now - timedelta(days=TRENDING_LOOKBACK_DAYS)
+
+        activity = TrendingService.collect_activity(since, now)
+        novel_ids = list(activity)
+
+        for start in range(0, len(novel_ids), batch_size):
+            batch_ids = novel_ids[start:start + batch_size]
+            previous = {
+                novel_id: (score, scored_at)
+                for novel_id, score, scored_at in NovelTrendingScore.objects.filter(
+                    novel_id__in=batch_ids
+                ).values_list('novel_id', 'score', 'scored_at')
+            }
+            rows = []
+            for novel_id in batch_ids:
+                score = activity[novel_id]
+                if novel_id in previous:
+                    score += TrendingService.decayed_score(*previous[novel_id], now)
+                rows.append(NovelTrendingScore(
+                    novel_id=novel_id,
+                    score=score,
+                    rank_key=TrendingService.rank_key(score, now),
+                    scored_at=now,
+                ))
+            # MySQL upserts on any unique key and rejects an explicit conflict target
+            conflict_target = {}
+            if connection.features.supports_update_conflicts_with_target:
+                conflict_target['unique_fields'] = ['novel']
+            with transaction.atomic():
+                NovelTrendingScore.objects.bulk_create(
+                    rows,
+                    update_conflicts=True,
+                    update_fields=['score', 'rank_key', 'scored_at'],
+                    **conflict_target,
+                )
+
+        pruned, _ = NovelTrendingScore.objects.filter(
+            rank_key__lt=TrendingService.rank_key(TRENDING_MIN_SCORE, now)
+        ).delete()
+
+        if novel_ids or pruned:
+            HomepageService.invalidate('trending')
+        return len(novel_ids), pruned
@@ -0,0 +1,40 @@
+from django.core.cache import cache
+
+from novels.models import Favorite, Novel
+from constants import USER_COUNTERS_TIMEOUT
+
+
+class UserCounterService:
+    """
+    Sidebar counts of a user's novels and favorites, cached per user.
+
+    user_context exposes them lazily, so pages that never show the sidebar
+    do not touch the cache or the database; signals drop the entry when one
+    of the user's favorites or novels changes.
+    """
+
+    KEY_PREFIX = 'user_counters'
+
+    # Novel fields that change which user's count a novel belongs to
+    COUNTED_FIELDS = frozenset({'created_by', 'created_by_id', 'deleted_at'})
+
+    @staticmethod
+    def get_counts(user_id):
+        key = UserCounterService._key(user_id)
+        counts = cache.get(key)
+        if counts is None:
+            counts = {
+                'novels': Novel.objects.filter(created_by_id=user_id, deleted_at__isnull=True).count(),
+                'favorites': Favorite.objects.filter(user_id=user_id).count(),
+            }
+            cache.set(key, counts, USER_COUNTERS_TIMEOUT)
+        return counts
+
+    @staticmethod
+    def invalidate(user_id):
+        if user_id is not None:
+            cache.delete(UserCounterService._key(user_id))
+
+    @staticmethod
+    def _key(user_id):
+        return f'{UserCounterService.KEY_PREFIX}:{user_id}'
@@ -0,0 +1,267 @@
+import atexit
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils.module_loading import import_string
+
+from novels.models import Novel, Chapter, PendingViewCount
+from novels.services.daily_stats_service import DailyStatsService
+from constants import (
+    RECONCILE_BATCH_SIZE,
+    VIEW_BUFFER_DRAIN_SECONDS,
+    VIEW_BUFFER_MAX_KEYS,
+    VIEW_DEDUPE_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+COUNTED_MODELS = {'novel': Novel, 'chapter': Chapter}
+
+# Per-process buffer of {(kind, object_id): views}
+_pending = Counter()
+_pending_lock = threading.Lock()
+_last_drain = time.monotonic()
+# pid of the process running the drain thread, set by the WSGI/ASGI entry points
+_drainer_pid = None
+
+
+class DatabaseViewBuffer:
+    """Shared buffer kept as PendingViewCount rows"""
+
+    def add(self, deltas):
+        PendingViewCount.objects.bulk_create([
+            PendingViewCount(kind=kind, object_id=object_id, delta=delta)
+            for (kind, object_id), delta in deltas.items()
+        ])
+
+    def drain(self, apply, batch_size=RECONCILE_BATCH_SIZE):
+        """Hand batches of summed deltas to ``apply`` and delete the rows in the same transaction"""
+        drained = 0
+        while True:
+            with transaction.atomic():
+                rows = PendingViewCount.objects.order_by('id')
+                if connection.features.has_select_for_update_skip_locked:
+                    # A second flusher skips rows the first one is applying
+                    rows = rows.select_for_update(skip_locked=True)
+                rows = list(rows.values_list('id', 'kind', 'object_id', 'delta')[:batch_size])
+                if not rows:
+                    return drained
+
+                deltas = Counter()
+                for _, kind, object_id, delta in rows:
+                    deltas[(kind, object_id)] += delta
+                apply(deltas)
+                PendingViewCount.objects.filter(id__in=[row[0] for row in rows]).delete()
+            drained += len(rows)
+            if len(rows) < batch_size:
+                return drained
+
+
+class FileViewBuffer:
+    """
+    Shared buffer kept as lines appended to a local file.
+
+    The flusher renames the file before reading it; writers holding the old
+    file notice the rename under the lock and reopen the path.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path or settings.VIEW_COUNT_BUFFER_PATH)
+
+    def add(self, deltas):
+        import fcntl
+
+        lines = ''.join(f'{kind} {object_id} {delta}\n' for (kind, object_id), delta in deltas.items())
+        while True:
+            with open(self.path, 'a', encoding='utf-8') as buffer:
+                fcntl.flock(buffer, fcntl.LOCK_EX)
+                if self._is_current(buffer):
+                    buffer.write(lines)
+                    return
+
+    def drain(self, apply, batch_size=RECONCILE_BATCH_SIZE):
+        import fcntl
+
+        try:
+            os.rename(self.path, self.path.with_name(f'{self.path.name}.draining-{os.getpid()}-{time.time_ns()}'))
+        except FileNotFoundError:
+            pass
+
+        drained = 0
+        # Older files are left behind when a previous flush failed
+        for path in sorted(self.path.parent.glob(f'{self.path.name}.draining-*')):
+            try:
+                buffer = open(path, encoding='utf-8')
+            except FileNotFoundError:
+                continue
+            with buffer:
+                fcntl.flock(buffer, fcntl.LOCK_EX)
+                if os.fstat(buffer.fileno()).st_nlink == 0:
+                    continue  # Another flusher already applied it
+                deltas = Counter()
+                for line in buffer:
+                    kind, object_id, delta = line.split()
+                    deltas[(kind, int(object_id))] += int(delta)
+                    drained += 1
+                apply(deltas)
+                os.unlink(path)
+        return drained
+
+    def _is_current(self, buffer):
+        try:
+            return os.fstat(buffer.fileno()).st_ino == os.stat(self.path).st_ino
+        except FileNotFoundError:
+            return False
+
+
+class ViewCountService:
+    """
+    Buffered Novel.view_count and Chapter.view_count.
+
+    A page view only bumps a per-process counter. Every few seconds the
+    process, or its drain thread when no further views arrive, moves its
+    deltas to the shared buffer (VIEW_COUNT_BUFFER), and
+    flush_view_counts applies everything buffered with one
+    ``UPDATE ... CASE`` per model and batch, so a popular novel's row is
+    written once per flush instead of once per view.
+    """
+
+    @staticmethod
+    def get_buffer():
+        return import_string(settings.VIEW_COUNT_BUFFER)()
+
+    @staticmethod
+    def record_view(request, novel, chapter=None):
+        """Count a view of ``novel`` (and ``chapter``), once per viewer and window when dedupe is on"""
+        keys = [('novel', novel.pk)]
+        if chapter is not None:
+            keys.append(('chapter', chapter.pk))
+        if settings.VIEW_COUNT_DEDUPE:
+            viewer = ViewCountService.viewer_key(request)
+            keys = [
+                key for key in keys
+                if cache.add(f'views:seen:{viewer}:{key[0]}:{key[1]}', True, VIEW_DEDUPE_SECONDS)
+            ]
+        if keys:
+            ViewCountService.add(keys)
+
+    @staticmethod
+    def viewer_key(request):
+        if request.user.is_authenticated:
+            return f'u{request.user.pk}'
+        if request.session.session_key:
+            return f's{request.session.session_key}'
+        # Anonymous visitors without a session yet
+        agent = request.META.get('HTTP_USER_AGENT', '')
+        fingerprint = f"{request.META.get('REMOTE_ADDR', '')}|{agent}"
+        return 'a' + hashlib.md5(fingerprint.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def add(keys):
+        if _drainer_pid not in (None, os.getpid()):
+            # Forked from a preloaded server process; the thread did not survive the fork
+            ViewCountService.start_drainer()
+        with _pending_lock:
+            _pending.update(keys)
+            due = (
+                len(_pending) >= VIEW_BUFFER_MAX_KEYS
+                or time.monotonic() - _last_drain >= VIEW_BUFFER_DRAIN_SECONDS
+            )
+        if due:
+            ViewCountService.drain_local()
+
+    @staticmethod
+    def drain_local():
+        """Move this process's deltas to the shared buffer; return how many keys moved"""
+        global _last_drain
+        with _pending_lock:
+            deltas = dict(_pending)
+            _pending.clear()
+            _last_drain = time.monotonic()
+        if not deltas:
+            return 0
+
+        try:
+            ViewCountService.get_buffer().add(deltas)
+        except Exception:
+            # Keep the views for the next attempt rather than failing the page
+            logger.exception("Could not write view counts to the shared buffer")
+            with _pending_lock:
+                _pending.update(deltas)
+            return 0
+        return len(deltas)
+
+    @staticmethod
+    def start_drainer():
+        """
+        Drain this process's deltas every VIEW_BUFFER_DRAIN_SECONDS and at exit.
+
+        Without it views recorded just before a worker goes idle, is recycled
+        or shuts down would wait for a later view that never comes. Only
+        server processes start it, so management commands and tests keep
+        their views until they drain them.
+        """
+        global _drainer_pid
+        pid = os.getpid()
+        with _pending_lock:
+            if _drainer_pid == pid:
+                return
+            # A forked worker inherits the exit hook but not the thread
+            forked, _drainer_pid = _drainer_pid is not None, pid
+        threading.Thread(target=ViewCountService._drain_forever, name='view-count-drainer', daemon=True).start()
+        if not forked:
+            atexit.register(ViewCountService.drain_local)
+
+    @staticmethod
+    def _drain_forever():
+        while True:
+            time.sleep(VIEW_BUFFER_DRAIN_SECONDS)
+            if time.monotonic() - _last_drain < VIEW_BUFFER_DRAIN_SECONDS:
+                continue
+            try:
+                ViewCountService.drain_local()
+            finally:
+                close_old_connections()
+
+    @staticmethod
+    def flush(batch_size=RECONCILE_BATCH_SIZE):
+        """Apply every buffered delta; return a Counter of rows updated per kind"""
+        ViewCountService.drain_local()
+        updated = Counter()
+
+        def apply(deltas):
+            by_kind = defaultdict(dict)
+            for (kind, object_id), delta in deltas.items():
+                by_kind[kind][object_id] = delta
+            for kind, counts in by_kind.items():
+                if kind in COUNTED_MODELS:
+                    updated[kind] += ViewCountService.apply_deltas(COUNTED_MODELS[kind], counts, batch_size)
+            if by_kind.get('novel'):
+                DailyStatsService.add_views(by_kind['novel'])
+
+        ViewCountService.get_buffer().drain(apply, batch_size)
+        return updated
+
+    @staticmethod
+    def apply_deltas(model, deltas, batch_size=RECONCILE_BATCH_SIZE):
+        """``view_count = view_count + CASE id WHEN ... END`` for ``batch_size`` rows per UPDATE"""
+        ids = list(deltas)
+        updated = 0
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            increment = Case(
+                *[When(pk=pk, then=Value(deltas[pk])) for pk in batch],
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+            updated += model.objects.filter(pk__in=batch).update(view_count=F('view_count') + increment)
+        return updated
@@ -0,0 +1,53 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from interactions.models import Comment
+from novels.models import Novel, Volume, Chapter, Favorite
+from novels.services.homepage_service import HomepageService
+from novels.services.chapter_navigation_service import ChapterNavigationService
+from novels.services.user_counter_service import UserCounterService
+
+
+@receiver([post_save, post_delete], sender=Novel)
+def invalidate_home_on_novel_change(sender, **kwargs):
+    HomepageService.invalidate('novel')
+
+
+@receiver([post_save, post_delete], sender=Volume)
+@receiver([post_save, post_delete], sender=Chapter)
+def invalidate_home_on_chapter_change(sender, **kwargs):
+    HomepageService.invalidate('chapter')
+
+
+@receiver([post_save, post_delete], sender=Comment)
+def invalidate_home_on_comment_change(sender, **kwargs):
+    HomepageService.invalidate('comment')
+
+
+@receiver([post_save, post_delete], sender=Favorite)
+def invalidate_home_on_favorite_change(sender, **kwargs):
+    HomepageService.invalidate('favorite')
+
+
+@receiver([post_save, post_delete], sender=Chapter)
+def invalidate_navigation_on_chapter_change(sender, instance, update_fields=None, **kwargs):
+    if update_fields and ChapterNavigationService.NAV_FIELDS.isdisjoint(update_fields):
+        return
+    ChapterNavigationService.invalidate(instance.volume.novel_id)
+
+
+@receiver([post_save, post_delete], sender=Volume)
+def invalidate_navigation_on_volume_change(sender, instance, **kwargs):
+    ChapterNavigationService.invalidate(instance.novel_id)
+
+
+@receiver([post_save, post_delete], sender=Favorite)
+def invalidate_user_counters_on_favorite_change(sender, instance, **kwargs):
+    UserCounterService.invalidate(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=Novel)
+def invalidate_user_counters_on_novel_change(sender, instance, update_fields=None, **kwargs):
+    if update_fields and UserCounterService.COUNTED_FIELDS.isdisjoint(update_fields):
+        return
+    UserCounterService.invalidate(instance.created_by_id)
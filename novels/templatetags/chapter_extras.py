@@ -3,6 +3,8 @@ from django.utils.safestring import mark_safe
 from django.utils.translation import gettext as _
 import math
 
+from constants import WORDS_PER_MINUTE
+
 register = template.Library()
 
 
@@ -23,12 +25,15 @@ def reading_time(chapter):
     if not chapter or not chapter.word_count:
         return _("Unknown")
 
-    words_per_minute = 225
-    minutes = math.ceil(chapter.word_count / words_per_minute)
+    return format_minutes(math.ceil(chapter.word_count / WORDS_PER_MINUTE))
+
 
-    if minutes < 1:
-        return _("< 1 min")
-    elif minutes == 1:
+@register.filter
+def format_minutes(minutes):
+    """Format a reading time given in minutes"""
+    if not minutes:
+        return _("Unknown")
+    if minutes == 1:
         return _("1 min")
     elif minutes < 60:
         return _("%(minutes)d mins") % {'minutes': minutes}
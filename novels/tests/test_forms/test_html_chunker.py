@@ -0,0 +1,81 @@
+"""
+Tests for the streaming HtmlChunker
+"""
+from django.test import SimpleTestCase, TestCase
+
+from novels.models import Novel, Volume, Chapter
+from novels.utils import ChunkManager, HtmlChunker
+from novels.utils.legacy_html_chunker import SoupHtmlChunker
+from constants import ApprovalStatus
+
+EDITOR_HTML = """
+<h2>Chương 1: Khởi đầu</h2>
+<p>Trời đã <strong>sáng</strong> từ lâu,&nbsp;nhưng <em>anh</em> vẫn chưa dậy.</p>
+<p class="note  center" data-x='say "hi"'>Tom &amp; Jerry &lt;3 &#150; &copy; 2024</p>
+
+
+<p></p>
+<blockquote><p>Trích dẫn</p><p>thứ hai<br>dòng mới</p></blockquote>
+<ul><li>một</li><li>hai <a href="/x?a=1&amp;b=2">liên kết</a></li></ul>
+<p>Câu cuối cùng.<!-- ghi chú --></p>
+"""
+
+
+class HtmlChunkerTest(SimpleTestCase):
+    def test_matches_soup_chunker_on_editor_content(self):
+        for max_chunk_size in (100, 200, 10000):
+            with self.subTest(max_chunk_size=max_chunk_size):
+                self.assertEqual(
+                    HtmlChunker(max_chunk_size).split_into_chunks(EDITOR_HTML),
+                    SoupHtmlChunker(max_chunk_size).split_into_chunks(EDITOR_HTML)
+                )
+
+    def test_counts_words_across_inline_tags(self):
+        chunks = HtmlChunker().split_into_chunks('<p><b>foo</b>bar baz</p> <p>qux<!-- x --><i>quux</i></p>')
+
+        self.assertEqual(chunks, [('<p><b>foo</b>bar baz</p> <p>qux<!-- x --><i>quux</i></p>', 3)])
+
+    def test_oversized_container_is_split_between_blocks(self):
+        paragraphs = [f'<p>Doan {i} {"chu " * 10}</p>' for i in range(6)]
+        content = f'<div class="chapter">{"".join(paragraphs)}</div>'
+        chunker = HtmlChunker(max_chunk_size=150)
+
+        chunks = chunker.split_into_chunks(content)
+
+        self.assertGreater(len(chunks), 1)
+        for chunk, _ in chunks:
+            self.assertLessEqual(len(chunk), 150)
+            self.assertTrue(chunk.startswith('<div class="chapter"><p>'))
+            self.assertTrue(chunker.validate_html_chunk(chunk))
+        self.assertEqual(''.join(chunk[21:-6] for chunk, _ in chunks), ''.join(paragraphs))
+        self.assertEqual(sum(count for _, count in chunks), 6 * 12)
+
+    def test_oversized_paragraph_falls_back_to_escaped_word_paragraphs(self):
+        content = '<p>' + 'a&lt;b ' * 50 + '</p>'
+
+        chunks = HtmlChunker(max_chunk_size=100).split_into_chunks(content)
+
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(chunk.startswith('<p>a&lt;b') for chunk, _ in chunks))
+        self.assertEqual(sum(count for _, count in chunks), 50)
+
+    def test_validate_rejects_unbalanced_markup(self):
+        chunker = HtmlChunker()
+
+        self.assertTrue(chunker.validate_html_chunk('<p>a<br>b</p>'))
+        self.assertFalse(chunker.validate_html_chunk('<p><b>a</p>'))
+        self.assertFalse(chunker.validate_html_chunk('a</div>'))
+
+
+class HtmlChunkManagerTest(TestCase):
+    def test_total_word_count_comes_from_chunks(self):
+        novel = Novel.objects.create(name="Chunked", summary="Summary", approval_status=ApprovalStatus.APPROVED.value)
+        volume = Volume.objects.create(novel=novel, name="Tap 1", position=1)
+        chapter = Chapter.objects.create(volume=volume, title="Chuong 1", position=1)
+
+        report = ChunkManager.create_html_chunks_for_chapter(chapter, EDITOR_HTML, HtmlChunker(max_chunk_size=200))
+
+        chapter.refresh_from_db()
+        self.assertEqual(chapter.chunks.count(), report.total)
+        self.assertEqual(chapter.word_count, sum(chunk.word_count for chunk in chapter.chunks.all()))
+        self.assertEqual(chapter.word_count, len(SoupHtmlChunker()._extract_text_from_html(EDITOR_HTML).split()))
@@ -0,0 +1,84 @@
+"""
+Tests for compressed Chunk.content storage
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from novels.models import Novel, Volume, Chapter, Chunk
+from novels.services import ChapterContentCache
+from novels.utils.content_codec import encode_content, decode_content, CODEC_PLAIN, CODEC_ZLIB
+from constants import ApprovalStatus
+
+LONG_HTML = "<p>" + "Mot doan van dai de nen. " * 200 + "</p>"
+
+
+class ChunkCompressionTest(TestCase):
+    def setUp(self):
+        novel = Novel.objects.create(
+            name="Compressed Novel",
+            summary="Test summary",
+            approval_status=ApprovalStatus.APPROVED.value
+        )
+        volume = Volume.objects.create(novel=novel, name="Tap 1", position=1)
+        self.chapter = Chapter.objects.create(volume=volume, title="Chuong 1", position=1, approved=True)
+
+    def test_codec_round_trip(self):
+        for codec in (CODEC_PLAIN, CODEC_ZLIB):
+            payload = encode_content("Tiếng Việt <b>HTML</b>", codec)
+            self.assertEqual(payload[0], codec)
+            self.assertEqual(decode_content(payload), "Tiếng Việt <b>HTML</b>")
+
+    @override_settings(CHUNK_COMPRESSION=True)
+    def test_compressed_row_reads_back_lazily(self):
+        chunk = Chunk.objects.create(chapter=self.chapter, position=1, content=LONG_HTML)
+
+        raw = Chunk.objects.filter(pk=chunk.pk).values('content', 'content_data').get()
+        self.assertEqual(raw['content'], '')
+        self.assertLess(len(raw['content_data']), len(LONG_HTML) // 4)
+
+        loaded = Chunk.objects.get(pk=chunk.pk)
+        self.assertEqual(loaded.__dict__['content'], '')
+        self.assertEqual(loaded.content, LONG_HTML)
+        self.assertEqual(self.chapter.get_content(), LONG_HTML)
+
+    @override_settings(CHUNK_COMPRESSION=True)
+    def test_short_chunks_stay_inline(self):
+        chunk = Chunk.objects.create(chapter=self.chapter, position=1, content="<p>Ngan</p>")
+
+        self.assertIsNone(Chunk.objects.get(pk=chunk.pk).content_data)
+
+    def test_edit_after_disabling_compression_goes_inline(self):
+        with self.settings(CHUNK_COMPRESSION=True):
+            chunk = Chunk.objects.create(chapter=self.chapter, position=1, content=LONG_HTML)
+
+        chunk = Chunk.objects.get(pk=chunk.pk)
+        chunk.content = "<p>Moi</p>"
+        chunk.save()
+
+        raw = Chunk.objects.filter(pk=chunk.pk).values('content', 'content_data').get()
+        self.assertEqual(raw, {'content': "<p>Moi</p>", 'content_data': None})
+
+    def test_command_converts_and_reports(self):
+        Chunk.objects.create(chapter=self.chapter, position=1, content=LONG_HTML)
+        Chunk.objects.create(chapter=self.chapter, position=2, content="<p>Ngan</p>")
+
+        out = StringIO()
+        call_command('compress_chunks', '--report', stdout=out)
+        self.assertIn('Chunks to convert: 1', out.getvalue())
+        self.assertFalse(Chunk.objects.filter(content_data__isnull=False).exists())
+
+        out = StringIO()
+        call_command('compress_chunks', '--batch-size', '1', stdout=out)
+        self.assertIn('Chunks converted: 1', out.getvalue())
+        self.assertIn('% saved', out.getvalue())
+        self.assertEqual(Chunk.objects.get(position=1).content, LONG_HTML)
+        self.assertEqual(
+            [chunk['content'] for chunk in ChapterContentCache.get_chunks(self.chapter)],
+            [LONG_HTML, "<p>Ngan</p>"]
+        )
+
+        call_command('compress_chunks', '--decompress', stdout=StringIO())
+        raw = Chunk.objects.filter(position=1).values('content', 'content_data').get()
+        self.assertEqual(raw, {'content': LONG_HTML, 'content_data': None})
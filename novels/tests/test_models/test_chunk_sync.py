@@ -0,0 +1,77 @@
+"""
+Tests for diff-based chunk persistence in ChunkManager
+"""
+from django.test import TestCase, override_settings
+
+from novels.models import Novel, Volume, Chapter, Chunk
+from novels.utils import ChunkManager
+from constants import ApprovalStatus
+
+PARAGRAPHS = [f"Doan van so {i}. " + "Noi dung dai. " * 30 for i in range(6)]
+
+
+class ChunkSyncTest(TestCase):
+    def setUp(self):
+        novel = Novel.objects.create(
+            name="Synced Novel",
+            summary="Test summary",
+            approval_status=ApprovalStatus.APPROVED.value
+        )
+        volume = Volume.objects.create(novel=novel, name="Tap 1", position=1)
+        self.chapter = Chapter.objects.create(volume=volume, title="Chuong 1", position=1, approved=True)
+
+    def _sync(self, paragraphs):
+        chunks_data = [(text, len(text.split())) for text in paragraphs]
+        total = sum(word_count for _, word_count in chunks_data)
+        return ChunkManager.sync_chapter_chunks(self.chapter, chunks_data, total)
+
+    def test_first_write_creates_every_chunk_in_bulk(self):
+        # Read, savepoint, bulk insert, lock chapter, save chapter, novel word count, release
+        with self.assertNumQueries(7):
+            report = self._sync(PARAGRAPHS)
+
+        self.assertEqual((report.created, report.written), (6, 6))
+        self.assertEqual([chunk.content for chunk in self.chapter.chunks.all()], PARAGRAPHS)
+        self.chapter.refresh_from_db()
+        self.assertEqual(self.chapter.word_count, sum(len(text.split()) for text in PARAGRAPHS))
+
+    def test_unchanged_content_writes_nothing(self):
+        self._sync(PARAGRAPHS)
+        updated_at = Chapter.objects.get(pk=self.chapter.pk).updated_at
+
+        with self.assertNumQueries(3):
+            report = self._sync(PARAGRAPHS)
+
+        self.assertEqual((report.written, report.unchanged), (0, 6))
+        self.assertEqual(Chapter.objects.get(pk=self.chapter.pk).updated_at, updated_at)
+
+    def test_edit_rewrites_only_changed_rows(self):
+        self._sync(PARAGRAPHS)
+        ids = list(self.chapter.chunks.values_list('id', flat=True))
+        edited = PARAGRAPHS[:2] + ["Doan van da sua."] + PARAGRAPHS[3:]
+
+        report = self._sync(edited)
+
+        self.assertEqual((report.updated, report.created, report.deleted), (1, 0, 0))
+        self.assertEqual(list(self.chapter.chunks.values_list('id', flat=True)), ids)
+        self.assertEqual(Chunk.objects.get(chapter=self.chapter, position=3).content, "Doan van da sua.")
+
+    def test_shorter_content_deletes_trailing_chunks(self):
+        self._sync(PARAGRAPHS)
+
+        report = self._sync(PARAGRAPHS[:4])
+
+        self.assertEqual((report.deleted, report.unchanged), (2, 4))
+        self.assertEqual(self.chapter.chunks.count(), 4)
+
+    @override_settings(CHUNK_COMPRESSION=True)
+    def test_updated_rows_are_stored_compressed(self):
+        self._sync(["Ngan"] + PARAGRAPHS[1:3])
+
+        self._sync(PARAGRAPHS[:3])
+
+        raw = Chunk.objects.filter(chapter=self.chapter, position=1).values('content', 'content_data', 'content_hash').get()
+        self.assertEqual(raw['content'], '')
+        self.assertIsNotNone(raw['content_data'])
+        self.assertEqual(raw['content_hash'], Chunk.hash_content(PARAGRAPHS[0]))
+        self.assertEqual(Chunk.objects.get(chapter=self.chapter, position=1).content, PARAGRAPHS[0])
@@ -0,0 +1,123 @@
+"""
+Tests for the denormalized latest_public_chapter pointer on Novel and Volume
+"""
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.admin.sites import site
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase
+
+from novels.admin import ChapterAdmin
+from novels.models import Novel, Volume, Chapter
+from novels.services import ChapterService, NovelService
+from constants import ApprovalStatus
+
+
+class LatestChapterPointerTest(TestCase):
+    def setUp(self):
+        self.novel = Novel.objects.create(
+            name="Pointer Novel",
+            summary="Test summary",
+            approval_status=ApprovalStatus.APPROVED.value
+        )
+        self.volume1 = Volume.objects.create(novel=self.novel, name="Tap 1", position=1)
+        self.volume2 = Volume.objects.create(novel=self.novel, name="Tap 2", position=2)
+
+    def _chapter(self, volume, position, **kwargs):
+        return Chapter.objects.create(
+            volume=volume,
+            title=f"Chuong {position}",
+            position=position,
+            **kwargs
+        )
+
+    def test_approve_sets_pointers(self):
+        chapter = self._chapter(self.volume1, 1)
+
+        ChapterService.approve_chapter(chapter)
+
+        self.volume1.refresh_from_db()
+        self.novel.refresh_from_db()
+        self.assertEqual(self.volume1.latest_public_chapter, chapter)
+        self.assertEqual(self.novel.latest_public_chapter, chapter)
+        self.assertEqual(self.novel.latest_public_chapter_at, chapter.updated_at)
+
+    def test_novel_points_at_newest_volume_chapter(self):
+        first = self._chapter(self.volume1, 1)
+        second = self._chapter(self.volume2, 1)
+        ChapterService.approve_chapter(first)
+        ChapterService.approve_chapter(second)
+
+        self.novel.refresh_from_db()
+        self.assertEqual(self.novel.latest_public_chapter, second)
+
+    def test_hide_and_soft_delete_fall_back(self):
+        first = self._chapter(self.volume1, 1)
+        second = self._chapter(self.volume1, 2)
+        ChapterService.approve_chapter(first)
+        ChapterService.approve_chapter(second)
+
+        ChapterService.set_chapter_hidden(second, True)
+        self.volume1.refresh_from_db()
+        self.assertEqual(self.volume1.latest_public_chapter, first)
+
+        ChapterService.soft_delete_chapter(first)
+        self.volume1.refresh_from_db()
+        self.novel.refresh_from_db()
+        self.assertIsNone(self.volume1.latest_public_chapter)
+        self.assertIsNone(self.novel.latest_public_chapter_at)
+
+    def test_admin_bulk_actions_refresh_pointers(self):
+        first = self._chapter(self.volume2, 1, approved=True)
+        second = self._chapter(self.volume2, 2, approved=True)
+        ChapterService.approve_chapter(second)
+        chapter_admin = ChapterAdmin(Chapter, site)
+        request = RequestFactory().post('/')
+        request.session = {}
+        request._messages = FallbackStorage(request)
+
+        with patch('novels.admin.HomepageService.invalidate') as invalidate:
+            chapter_admin.soft_delete_chapters(request, Chapter.objects.filter(pk=second.pk))
+        invalidate.assert_called_once_with('chapter')
+        self.volume2.refresh_from_db()
+        self.novel.refresh_from_db()
+        self.assertEqual(self.volume2.latest_public_chapter, first)
+        self.assertEqual(self.novel.latest_public_chapter, first)
+
+        chapter_admin.restore_chapters(request, Chapter.objects.filter(pk=second.pk))
+        self.volume2.refresh_from_db()
+        self.novel.refresh_from_db()
+        self.assertEqual(self.volume2.latest_public_chapter, second)
+        self.assertEqual(self.novel.latest_public_chapter, second)
+
+    def test_recent_volume_cards_use_pointer(self):
+        chapter = self._chapter(self.volume2, 1)
+        ChapterService.approve_chapter(chapter)
+
+        with self.assertNumQueries(1):
+            cards = NovelService.get_recent_volumes_for_cards()
+
+        self.assertEqual(len(cards), 1)
+        self.assertEqual(cards[0]['recent_volume']['name'], "Tap 2")
+        self.assertEqual(cards[0]['recent_chapter']['title'], "Chuong 1")
+
+    def test_rebuild_command_backfills_pointers(self):
+        self._chapter(self.volume1, 1, approved=True)
+        latest = self._chapter(self.volume2, 1, approved=True)
+        self._chapter(self.volume2, 2, approved=True, is_hidden=True)
+
+        out = StringIO()
+        call_command('rebuild_latest_chapters', '--batch-size', '1', stdout=out)
+
+        self.volume2.refresh_from_db()
+        self.novel.refresh_from_db()
+        self.assertEqual(self.volume2.latest_public_chapter, latest)
+        self.assertEqual(self.novel.latest_public_chapter, latest)
+        self.assertIn('Volumes updated: 2', out.getvalue())
+        self.assertIn('Novels updated: 1', out.getvalue())
+
+        out = StringIO()
+        call_command('rebuild_latest_chapters', stdout=out)
+        self.assertIn('Volumes updated: 0', out.getvalue())
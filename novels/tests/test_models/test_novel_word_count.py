@@ -0,0 +1,68 @@
+"""
+Tests for Novel.word_count and reading_minutes rolled up from chapter writes
+"""
+from django.test import TestCase
+
+from novels.counters import NOVEL_WORD_COUNT
+from novels.models import Novel, Volume, Chapter
+from novels.services import ChapterService
+from novels.utils import ChunkManager
+from constants import ApprovalStatus, WORDS_PER_MINUTE
+
+
+class NovelWordCountTest(TestCase):
+    def setUp(self):
+        self.novel = Novel.objects.create(
+            name="Long Novel",
+            summary="Test summary",
+            approval_status=ApprovalStatus.APPROVED.value
+        )
+        self.volume = Volume.objects.create(novel=self.novel, name="Tap 1", position=1)
+
+    def _chapter(self, title, words, position):
+        chapter = Chapter.objects.create(volume=self.volume, title=title, position=position)
+        self._write(chapter, words)
+        return chapter
+
+    def _write(self, chapter, words):
+        ChunkManager.sync_chapter_chunks(chapter, [("tu " * words, words)], words)
+
+    def _totals(self):
+        novel = Novel.objects.get(pk=self.novel.pk)
+        return novel.word_count, novel.reading_minutes
+
+    def test_only_public_chapters_count(self):
+        first = self._chapter("Mot", 300, 1)
+        second = self._chapter("Hai", 150, 2)
+        self.assertEqual(self._totals(), (0, 0))
+
+        ChapterService.approve_chapter(first)
+        ChapterService.approve_chapter(second)
+        # Approving twice must not count the words again
+        ChapterService.approve_chapter(Chapter.objects.get(pk=first.pk))
+        self.assertEqual(self._totals(), (450, -(-450 // WORDS_PER_MINUTE)))
+
+        self._write(Chapter.objects.get(pk=first.pk), 100)
+        self.assertEqual(self._totals()[0], 250)
+
+        ChapterService.set_chapter_hidden(second, True)
+        self.assertEqual(self._totals(), (100, 1))
+        ChapterService.set_chapter_hidden(second, False)
+        self.assertEqual(self._totals()[0], 250)
+
+        ChapterService.reject_chapter(second, "Sai noi dung")
+        ChapterService.soft_delete_chapter(first)
+        self.assertEqual(self._totals(), (0, 0))
+
+        self.assertEqual(NOVEL_WORD_COUNT.reconcile(batch_size=10).drifted, 0)
+
+    def test_hidden_chapter_edits_leave_novel_alone(self):
+        chapter = self._chapter("Mot", 300, 1)
+        ChapterService.approve_chapter(chapter)
+        ChapterService.set_chapter_hidden(chapter, True)
+
+        self._write(Chapter.objects.get(pk=chapter.pk), 1000)
+        self.assertEqual(self._totals(), (0, 0))
+
+        ChapterService.set_chapter_hidden(Chapter.objects.get(pk=chapter.pk), False)
+        self.assertEqual(self._totals(), (1000, 5))
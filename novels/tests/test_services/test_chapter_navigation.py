@@ -0,0 +1,113 @@
+"""
+Tests for the cached chapter navigation index
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from novels.models import Novel, Volume, Chapter
+from novels.services import ChapterService, ChapterNavigationService
+from constants import ApprovalStatus
+
+User = get_user_model()
+
+
+class ChapterNavigationIndexTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", password="testpass123"
+        )
+        self.novel = Novel.objects.create(
+            name="Nav Novel",
+            summary="Test summary",
+            created_by=self.owner,
+            approval_status=ApprovalStatus.APPROVED.value
+        )
+        self.volume1 = Volume.objects.create(novel=self.novel, name="Tap 1", position=1)
+        self.volume2 = Volume.objects.create(novel=self.novel, name="Tap 2", position=2)
+        self.ch1 = self._chapter(self.volume1, 1)
+        self.ch2 = self._chapter(self.volume1, 2)
+        self.ch3 = self._chapter(self.volume2, 1)
+
+    def _chapter(self, volume, position, **kwargs):
+        return Chapter.objects.create(
+            volume=volume,
+            title=f"{volume.name} Chuong {position}",
+            position=position,
+            approved=True,
+            **kwargs
+        )
+
+    def _navigation(self, chapter):
+        chapter = Chapter.objects.select_related('volume__novel').get(pk=chapter.pk)
+        navigation = ChapterService.get_chapter_navigation(chapter)
+        prev_chapter, next_chapter = navigation['prev_chapter'], navigation['next_chapter']
+        return (
+            prev_chapter.id if prev_chapter else None,
+            next_chapter.id if next_chapter else None,
+        )
+
+    def test_navigation_crosses_volumes(self):
+        self.assertEqual(self._navigation(self.ch1), (None, self.ch2.id))
+        self.assertEqual(self._navigation(self.ch2), (self.ch1.id, self.ch3.id))
+        self.assertEqual(self._navigation(self.ch3), (self.ch2.id, None))
+
+    def test_warm_index_needs_no_queries(self):
+        chapter = Chapter.objects.select_related('volume__novel').get(pk=self.ch2.pk)
+        ChapterService.get_chapter_navigation(chapter)
+
+        with self.assertNumQueries(0):
+            navigation = ChapterService.get_chapter_navigation(chapter)
+            sidebar = ChapterService.get_all_chapters_for_novel(self.novel)
+
+        self.assertEqual(navigation['next_chapter'].slug, self.ch3.slug)
+        self.assertEqual([entry.id for entry in sidebar], [self.ch1.id, self.ch2.id, self.ch3.id])
+        self.assertEqual(sidebar[2].volume_name, "Tap 2")
+
+    def test_hiding_chapter_invalidates_index(self):
+        self._navigation(self.ch1)
+
+        ChapterService.set_chapter_hidden(self.ch2, True)
+
+        self.assertEqual(self._navigation(self.ch1), (None, self.ch3.id))
+        self.assertEqual(self._navigation(self.ch3), (self.ch1.id, None))
+
+    def test_position_change_invalidates_index(self):
+        self._navigation(self.ch1)
+
+        self.volume1.position = 3
+        self.volume1.save()
+
+        self.assertEqual(self._navigation(self.ch3), (None, self.ch1.id))
+
+    def test_version_follows_content_not_the_rebuild(self):
+        version = ChapterNavigationService.get_index(self.novel.id)['version']
+
+        # Another worker rebuilding the same index derives the same version
+        self.assertEqual(ChapterNavigationService.build_index(self.novel.id)['version'], version)
+
+        self.ch2.title = "Renamed"
+        self.ch2.save()
+        self.assertNotEqual(ChapterNavigationService.get_index(self.novel.id)['version'], version)
+
+    def test_unrelated_update_keeps_index(self):
+        ChapterNavigationService.get_index(self.novel.id)
+
+        self.ch1.word_count = 42
+        self.ch1.save(update_fields=['word_count'])
+
+        self.assertIsNotNone(cache.get(ChapterNavigationService._key(self.novel.id)))
+
+    def test_non_public_chapter_falls_back_to_queries(self):
+        draft = self._chapter(self.volume1, 3, is_hidden=True)
+
+        self.assertEqual(self._navigation(draft), (self.ch2.id, self.ch3.id))
+
+    def test_owner_sidebar_includes_hidden_chapters(self):
+        draft = self._chapter(self.volume1, 3, is_hidden=True)
+
+        chapters = ChapterService.get_all_chapters_for_novel(self.novel, self.owner)
+
+        self.assertIn(draft, chapters)
+        self.assertEqual(chapters[0].volume_name, "Tap 1")
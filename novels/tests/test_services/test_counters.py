@@ -0,0 +1,61 @@
+"""
+Tests for the denormalized counter registry and reconcile_counters
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from novels.counters import NOVEL_WORD_COUNT
+from novels.models import Novel, Volume, Chapter, Chunk
+from constants import ApprovalStatus
+
+
+class ReconcileCountersTest(TestCase):
+    def setUp(self):
+        self.novels = []
+        for i in range(5):
+            novel = Novel.objects.create(
+                name=f"Counted {i}", summary="Summary", approval_status=ApprovalStatus.APPROVED.value
+            )
+            volume = Volume.objects.create(novel=novel, name="Tap 1", position=1)
+            public = Chapter.objects.create(volume=volume, title=f"Public {i}", position=1, approved=True)
+            hidden = Chapter.objects.create(volume=volume, title=f"Hidden {i}", position=2, approved=True, is_hidden=True)
+            Chunk.objects.create(chapter=public, position=1, content="a b c", word_count=3)
+            Chunk.objects.create(chapter=public, position=2, content="d e", word_count=2)
+            Chunk.objects.create(chapter=hidden, position=1, content="f", word_count=1)
+            self.novels.append(novel)
+
+    def test_reports_drift_without_writing(self):
+        Novel.objects.filter(pk__in=[novel.pk for novel in self.novels]).update(word_count=7)
+
+        out = StringIO()
+        call_command('reconcile_counters', '--counter', 'novel.word_count', stdout=out)
+
+        self.assertIn('novel.word_count: 5 drifted rows in 1 batches', out.getvalue())
+        self.assertIn('--fix', out.getvalue())
+        self.assertEqual(Novel.objects.filter(word_count=7).count(), 5)
+
+    def test_fix_rewrites_drifted_rows_in_keyset_batches(self):
+        Chapter.objects.filter(volume__novel__in=self.novels).update(word_count=0)
+        Novel.objects.filter(pk=self.novels[0].pk).update(word_count=99)
+
+        out = StringIO()
+        call_command(
+            'reconcile_counters', '--counter', 'chapter.word_count', '--counter', 'novel.word_count',
+            '--fix', '--batch-size', '2', stdout=out
+        )
+
+        self.assertIn('novel.word_count: 5 drifted rows in 3 batches, 5 fixed', out.getvalue())
+        self.assertEqual(set(Novel.objects.values_list('word_count', flat=True)), {5})
+        self.assertEqual(set(Chapter.objects.values_list('word_count', flat=True)), {5, 1})
+
+        # Bound, drift count and nothing to update for each batch
+        with self.assertNumQueries(6):
+            report = NOVEL_WORD_COUNT.reconcile(batch_size=2, fix=True)
+        self.assertEqual(report.drifted, 0)
+
+    def test_unknown_counter_is_rejected(self):
+        with self.assertRaises(CommandError):
+            call_command('reconcile_counters', '--counter', 'novel.nope', stdout=StringIO())
@@ -0,0 +1,108 @@
+"""
+Tests for the NovelDailyStats rollup
+"""
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from interactions.models import Comment, Review
+from novels.models import Novel, Volume, Chapter, Favorite, NovelDailyStats, DailyStatsWatermark, PendingViewCount
+from novels.services import DailyStatsService, ViewCountService
+from constants import ApprovalStatus, UserRole, DAILY_STATS_SETTLE_SECONDS
+
+User = get_user_model()
+
+
+class DailyStatsRollupTest(TestCase):
+    def setUp(self):
+        self.readers = [
+            User.objects.create_user(email=f'reader{i}@example.com', username=f'reader{i}', password='testpass123')
+            for i in range(3)
+        ]
+        self.novel = Novel.objects.create(
+            name="Busy Novel",
+            summary="Test summary",
+            approval_status=ApprovalStatus.APPROVED.value
+        )
+        self.volume = Volume.objects.create(novel=self.novel, name="Tap 1", position=1)
+        self.now = timezone.now()
+        self.today = timezone.localdate(self.now)
+        DailyStatsWatermark.objects.create(pk=1, processed_until=self.now - timedelta(days=3))
+
+    def _at(self, instance, days_ago):
+        type(instance).objects.filter(pk=instance.pk).update(created_at=self.now - timedelta(days=days_ago))
+
+    def _rollup(self, now):
+        return DailyStatsService.rollup(now=now + timedelta(seconds=DAILY_STATS_SETTLE_SECONDS))
+
+    def _stats(self, days_ago):
+        row = NovelDailyStats.objects.filter(novel=self.novel, date=self.today - timedelta(days=days_ago)).values(
+            'views', 'favorites', 'reviews', 'comments', 'new_chapters'
+        ).first()
+        return row and tuple(row.values())
+
+    def test_each_window_is_counted_once(self):
+        self._at(Favorite.objects.create(user=self.readers[0], novel=self.novel), 1)
+        self._at(Review.objects.create(user=self.readers[0], novel=self.novel, rating=4, content='Hay'), 1)
+        self._at(Comment.objects.create(user=self.readers[1], novel=self.novel, content='Hidden', is_active=False), 1)
+        self._at(Chapter.objects.create(volume=self.volume, title="Mot", position=1), 2)
+        self._at(Comment.objects.create(user=self.readers[1], novel=self.novel, content='Old'), 5)
+
+        _, _, written = self._rollup(self.now - timedelta(hours=1))
+        self.assertEqual(written, 2)
+        self.assertEqual(self._stats(1), (0, 1, 1, 0, 0))
+        self.assertEqual(self._stats(2), (0, 0, 0, 0, 1))
+        self.assertIsNone(self._stats(5))
+
+        # Nothing new: the same window is not counted again
+        self.assertEqual(self._rollup(self.now - timedelta(minutes=30))[2], 0)
+
+        self._at(Favorite.objects.create(user=self.readers[1], novel=self.novel), 0)
+        self._at(Comment.objects.create(user=self.readers[2], novel=self.novel, content='Moi'), 0)
+        self._rollup(self.now)
+
+        self.assertEqual(self._stats(0)[1:], (1, 0, 1, 0))
+        self.assertEqual(self._stats(1), (0, 1, 1, 0, 0))
+
+    def test_flushed_views_land_on_today_and_survive_rollups(self):
+        # Views other tests left in this process or the shared buffer
+        ViewCountService.drain_local()
+        PendingViewCount.objects.all().delete()
+        ViewCountService.add([('novel', self.novel.pk)] * 4)
+        ViewCountService.flush()
+        self._at(Favorite.objects.create(user=self.readers[0], novel=self.novel), 0)
+
+        self._rollup(self.now)
+        ViewCountService.add([('novel', self.novel.pk)])
+        ViewCountService.flush()
+
+        self.assertEqual(self._stats(0)[:2], (5, 1))
+
+    def test_command_reports_window(self):
+        out = StringIO()
+        call_command('rollup_daily_stats', stdout=out)
+
+        self.assertIn('Stats rows written: 0', out.getvalue())
+        self.assertIn('Daily stats updated.', out.getvalue())
+
+    def test_upsert_names_conflict_target_only_where_supported(self):
+        counts = {(self.novel.pk, self.today): {'favorites': 1}}
+        features = connection.features
+
+        # MySQL upserts with ON DUPLICATE KEY UPDATE, which takes no conflict target
+        with patch.object(features, 'supports_update_conflicts_with_target', False), \
+                patch.object(NovelDailyStats.objects, 'bulk_create', return_value=[]) as bulk_create:
+            DailyStatsService.add_activity(counts)
+        self.assertNotIn('unique_fields', bulk_create.call_args.kwargs)
+
+        with patch.object(features, 'supports_update_conflicts_with_target', True), \
+                patch.object(NovelDailyStats.objects, 'bulk_create', wraps=NovelDailyStats.objects.bulk_create) as bulk_create:
+            DailyStatsService.add_activity(counts)
+        self.assertEqual(bulk_create.call_args.kwargs['unique_fields'], ['novel', 'date'])
+        self.assertEqual(self._stats(0), (0, 1, 0, 0, 0))
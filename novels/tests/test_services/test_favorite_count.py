@@ -0,0 +1,88 @@
+"""
+Tests for favorite_count maintenance by FavoriteService.toggle
+"""
+import threading
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.test import TestCase, TransactionTestCase
+
+from novels.models import Novel, Favorite
+from novels.services.novel_service import FavoriteService
+from constants import ApprovalStatus
+
+User = get_user_model()
+
+
+class FavoriteCountTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='fan@example.com', username='fan', password='12345')
+        self.novel = Novel.objects.create(
+            name='Liked Novel',
+            summary='Test summary',
+            approval_status=ApprovalStatus.APPROVED.value
+        )
+
+    def test_toggle_returns_count_from_novel_row(self):
+        Novel.objects.filter(pk=self.novel.pk).update(favorite_count=41)
+
+        self.assertEqual(FavoriteService.toggle(self.user, self.novel), (True, 42))
+        self.assertEqual(FavoriteService.toggle(self.user, self.novel), (False, 41))
+        self.assertEqual(Novel.objects.get(pk=self.novel.pk).favorite_count, 41)
+
+    def test_reconcile_favorites(self):
+        FavoriteService.toggle(self.user, self.novel)
+        other = User.objects.create_user(email='other@example.com', username='other', password='12345')
+        Favorite.objects.create(user=other, novel=self.novel)
+
+        out = StringIO()
+        call_command('reconcile_favorites', stdout=out)
+
+        self.assertIn('Novels updated: 1', out.getvalue())
+        self.assertEqual(Novel.objects.get(pk=self.novel.pk).favorite_count, 2)
+
+
+class FavoriteToggleConcurrencyTest(TransactionTestCase):
+    THREADS = 6
+    TOGGLES_PER_THREAD = 10
+
+    def toggle_until_committed(self, user, novel):
+        while True:
+            try:
+                return FavoriteService.toggle(user, novel)
+            except OperationalError as error:
+                # In-memory SQLite reports lock conflicts instead of waiting;
+                # the toggle rolled back as a whole, so simply run it again
+                if 'locked' not in str(error):
+                    raise
+
+    def test_concurrent_toggles_keep_count_exact(self):
+        novel = Novel.objects.create(name='Hot Novel', summary='Test summary')
+        users = [
+            User.objects.create_user(email=f'fan{i}@example.com', username=f'fan{i}', password='12345')
+            for i in range(self.THREADS // 2)
+        ]
+        errors = []
+        start = threading.Barrier(self.THREADS)
+
+        def hammer(user):
+            try:
+                start.wait()
+                for _ in range(self.TOGGLES_PER_THREAD):
+                    self.toggle_until_committed(user, novel)
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connection.close()
+
+        # Two threads per user, so the same favorite row is toggled concurrently
+        threads = [threading.Thread(target=hammer, args=(users[i % len(users)],)) for i in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(Novel.objects.get(pk=novel.pk).favorite_count, Favorite.objects.filter(novel=novel).count())
@@ -0,0 +1,143 @@
+"""
+Tests for the import_novels bulk importer
+"""
+import json
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from novels.models import Novel, Volume, Chapter, Chunk, Author, Tag
+from novels.services import UserCounterService
+from novels.utils import HtmlChunker
+from constants import ApprovalStatus
+
+CHAPTER_HTML = ''.join(f'<p>Doan {i} ' + 'chu ' * 40 + '</p>' for i in range(8))
+
+
+def novel_record(name, **extra):
+    record = {
+        'name': name,
+        'summary': 'Imported summary',
+        'author': 'Tac Gia',
+        'tags': ['Fantasy', 'Unknown'],
+        'volumes': [
+            {'name': 'Tap 1', 'chapters': [
+                {'title': 'Chuong 1', 'content': CHAPTER_HTML},
+                {'title': 'Chuong 2', 'content': '<p>Hai tu</p>', 'is_hidden': True},
+            ]},
+            {'name': 'Tap 2', 'chapters': [{'title': 'Chuong 1', 'content': '<p>Ba tu nua</p>'}]},
+        ],
+    }
+    record.update(extra)
+    return record
+
+
+class ImportNovelsCommandTest(TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        Tag.objects.create(name='Fantasy')
+        Novel.objects.create(name='Truyen Mot', summary='Existing')
+
+    def _write_jsonl(self, records, name='novels.jsonl'):
+        path = self.tmp / name
+        path.write_text(''.join(json.dumps(record) + '\n' for record in records), encoding='utf-8')
+        return path
+
+    def _import(self, source, *args):
+        out = StringIO()
+        call_command('import_novels', str(source), '--workers', '0', *args, stdout=out)
+        return out.getvalue()
+
+    def test_imports_novels_with_chunks_slugs_and_positions(self):
+        source = self._write_jsonl([novel_record('Truyen Mot'), novel_record('Truyen Mot')])
+
+        output = self._import(source, '--approve', '--max-chunk-size', '200')
+
+        self.assertIn('Novels: 2', output)
+        novels = Novel.objects.filter(summary='Imported summary').order_by('id')
+        self.assertEqual([novel.slug for novel in novels], ['truyen-mot-1', 'truyen-mot-2'])
+        novel = novels[0]
+        self.assertEqual(novel.approval_status, ApprovalStatus.APPROVED.value)
+        self.assertEqual(novel.author, Author.objects.get(name='Tac Gia'))
+        self.assertEqual(list(novel.tags.values_list('name', flat=True)), ['Fantasy'])
+        self.assertEqual(list(novel.volumes.values_list('position', flat=True)), [1, 2])
+
+        chapter = Chapter.objects.get(volume__novel=novel, volume__position=1, position=1)
+        expected = HtmlChunker(max_chunk_size=200).split_into_chunks(CHAPTER_HTML)
+        self.assertEqual([(chunk.content, chunk.word_count) for chunk in chapter.chunks.all()], expected)
+        self.assertEqual(chapter.word_count, sum(count for _, count in expected))
+        self.assertTrue(all(chunk.content_hash == Chunk.hash_content(chunk.content) for chunk in chapter.chunks.all()))
+
+        # Slugs unique across novels; hidden chapters do not count towards the novel
+        self.assertEqual(Chapter.objects.filter(slug__startswith='tap-1-chuong-1').count(), 2)
+        self.assertEqual(novel.word_count, chapter.word_count + 3)
+        latest = Chapter.objects.get(volume__novel=novel, volume__position=2)
+        self.assertEqual(novel.latest_public_chapter, latest)
+        self.assertEqual(Volume.objects.get(novel=novel, position=1).latest_public_chapter, chapter)
+
+    def test_imports_bundle_directories_with_chapter_files(self):
+        bundle = self.tmp / 'bundle-a'
+        (bundle / 'text').mkdir(parents=True)
+        (bundle / 'text' / 'c1.html').write_text(CHAPTER_HTML, encoding='utf-8')
+        record = {'name': 'Bundle', 'volumes': [{'chapters': [{'title': 'Mo dau', 'file': 'text/c1.html'}]}]}
+        (bundle / 'novel.json').write_text(json.dumps(record), encoding='utf-8')
+        self._write_jsonl([novel_record('Dong')])
+
+        self._import(self.tmp)
+
+        novel = Novel.objects.get(slug='bundle')
+        self.assertEqual(novel.approval_status, ApprovalStatus.DRAFT.value)
+        chapter = Chapter.objects.get(volume__novel=novel)
+        self.assertEqual(chapter.volume.name, 'Tập 1')
+        self.assertEqual(''.join(chunk.content for chunk in chapter.chunks.all()), CHAPTER_HTML)
+        self.assertIsNone(novel.latest_public_chapter)
+        self.assertTrue(Novel.objects.filter(slug='dong').exists())
+
+    def test_created_by_refreshes_sidebar_counts(self):
+        cache.clear()
+        user = get_user_model().objects.create_user(email='importer@example.com', username='importer', password='password')
+        self.assertEqual(UserCounterService.get_counts(user.pk)['novels'], 0)
+
+        self._import(self._write_jsonl([novel_record('Truyen Hai')]), '--created-by', 'importer')
+
+        self.assertEqual(UserCounterService.get_counts(user.pk)['novels'], 1)
+
+    def test_checkpoint_resumes_after_committed_batches(self):
+        source = self._write_jsonl([novel_record('Mot'), novel_record('Hai')])
+        self._import(source, '--batch-size', '1')
+        self.assertEqual(Path(f'{source}.checkpoint').read_text().split(), ['novels.jsonl:1', 'novels.jsonl:2'])
+
+        self._write_jsonl([novel_record('Mot'), novel_record('Hai'), novel_record('Ba')])
+        output = self._import(source)
+
+        self.assertIn('Resuming: 2 records', output)
+        self.assertEqual(Novel.objects.filter(summary='Imported summary').count(), 3)
+        self.assertTrue(Novel.objects.filter(slug='ba').exists())
+
+    def test_records_with_existing_slug_are_skipped(self):
+        source = self._write_jsonl([novel_record('Khac', slug='truyen-mot'), novel_record('Moi', slug='moi')])
+
+        output = self._import(source)
+
+        self.assertIn('Skipped (slug already imported): 1', output)
+        self.assertEqual(Novel.objects.get(slug='truyen-mot').summary, 'Existing')
+        self.assertTrue(Novel.objects.filter(slug='moi').exists())
+
+    def test_worker_processes_produce_the_same_rows(self):
+        source = self._write_jsonl([novel_record(f'Song Song {i}') for i in range(4)])
+
+        out = StringIO()
+        call_command('import_novels', str(source), '--workers', '2', stdout=out)
+
+        self.assertIn('Novels: 4', out.getvalue())
+        self.assertEqual(
+            Chunk.objects.filter(chapter__volume__novel__name='Song Song 3').count(),
+            Chunk.objects.filter(chapter__volume__novel__name='Song Song 0').count()
+        )
@@ -0,0 +1,122 @@
+"""
+Tests for the time-decayed NovelTrendingScore table
+"""
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from novels.models import Novel, Favorite, NovelTrendingScore
+from novels.services import NovelService, TrendingService
+from constants import ApprovalStatus, TRENDING_HALF_LIFE_HOURS, TRENDING_FAVORITE_WEIGHT, TRENDING_STALE_HOURS
+
+User = get_user_model()
+
+
+class TrendingScoreTest(TestCase):
+    def setUp(self):
+        self.novels = [
+            Novel.objects.create(
+                name=f"Trend {i}",
+                slug=f"trend-{i}",
+                summary="Test summary",
+                approval_status=ApprovalStatus.APPROVED.value,
+                view_count=100 - i,
+            )
+            for i in range(3)
+        ]
+        self.users = [
+            User.objects.create_user(username=f"reader{i}", email=f"reader{i}@example.com", password="testpass123")
+            for i in range(3)
+        ]
+
+    def _favorite(self, user, novel, created_at):
+        favorite = Favorite.objects.create(user=user, novel=novel)
+        Favorite.objects.filter(pk=favorite.pk).update(created_at=created_at)
+
+    def test_falls_back_to_view_count_before_first_run(self):
+        self.assertEqual(list(NovelService.get_trend_novels()), self.novels)
+
+    def test_activity_orders_trending(self):
+        now = timezone.now()
+        self._favorite(self.users[0], self.novels[2], now - timedelta(hours=1))
+        self._favorite(self.users[1], self.novels[2], now - timedelta(hours=1))
+        self._favorite(self.users[0], self.novels[1], now - timedelta(hours=1))
+
+        scored, _ = TrendingService.recompute(now=now)
+
+        self.assertEqual(scored, 2)
+        self.assertEqual(list(NovelService.get_trend_novels()), [self.novels[2], self.novels[1]])
+
+    def test_stale_scores_fall_back_to_view_count(self):
+        now = timezone.now() - timedelta(hours=TRENDING_STALE_HOURS + 1)
+        self._favorite(self.users[0], self.novels[2], now - timedelta(hours=1))
+        TrendingService.recompute(now=now)
+
+        self.assertEqual(list(NovelService.get_trend_novels()), self.novels)
+
+        NovelTrendingScore.objects.update(scored_at=timezone.now())
+        self.assertEqual(list(NovelService.get_trend_novels()), [self.novels[2]])
+
+    def test_older_activity_decays(self):
+        now = timezone.now()
+        self._favorite(self.users[0], self.novels[0], now - timedelta(hours=TRENDING_HALF_LIFE_HOURS))
+        self._favorite(self.users[0], self.novels[1], now - timedelta(hours=1))
+
+        TrendingService.recompute(now=now)
+
+        old = NovelTrendingScore.objects.get(novel=self.novels[0])
+        self.assertAlmostEqual(old.score, TRENDING_FAVORITE_WEIGHT / 2)
+        self.assertEqual(NovelService.get_trend_novels()[0], self.novels[1])
+
+    def test_recompute_only_touches_novels_with_new_activity(self):
+        start = timezone.now() - timedelta(hours=TRENDING_HALF_LIFE_HOURS)
+        self._favorite(self.users[0], self.novels[0], start - timedelta(minutes=1))
+        self._favorite(self.users[0], self.novels[1], start - timedelta(minutes=1))
+        TrendingService.recompute(now=start)
+
+        scored, _ = TrendingService.recompute(now=start + timedelta(hours=1))
+        self.assertEqual(scored, 0)
+
+        now = start + timedelta(hours=TRENDING_HALF_LIFE_HOURS)
+        self._favorite(self.users[1], self.novels[1], now - timedelta(minutes=1))
+        scored, _ = TrendingService.recompute(now=now)
+
+        self.assertEqual(scored, 1)
+        untouched = NovelTrendingScore.objects.get(novel=self.novels[0])
+        self.assertEqual(untouched.scored_at, start)
+        updated = NovelTrendingScore.objects.get(novel=self.novels[1])
+        self.assertAlmostEqual(updated.score, TRENDING_FAVORITE_WEIGHT * 1.5, places=2)
+        self.assertGreater(updated.rank_key, untouched.rank_key)
+
+    def test_command_prunes_decayed_scores(self):
+        self._favorite(self.users[0], self.novels[0], timezone.now() - timedelta(minutes=1))
+        call_command('update_trending_scores', stdout=StringIO())
+        NovelTrendingScore.objects.update(rank_key=-1000)
+
+        out = StringIO()
+        call_command('update_trending_scores', stdout=out)
+
+        self.assertIn('Scores pruned: 1', out.getvalue())
+        self.assertFalse(NovelTrendingScore.objects.exists())
+
+    def test_upsert_names_conflict_target_only_where_supported(self):
+        self._favorite(self.users[0], self.novels[0], timezone.now() - timedelta(minutes=1))
+        features = connection.features
+
+        # MySQL upserts with ON DUPLICATE KEY UPDATE, which takes no conflict target
+        with patch.object(features, 'supports_update_conflicts_with_target', False), \
+                patch.object(NovelTrendingScore.objects, 'bulk_create', return_value=[]) as bulk_create:
+            TrendingService.recompute()
+        self.assertNotIn('unique_fields', bulk_create.call_args.kwargs)
+
+        with patch.object(features, 'supports_update_conflicts_with_target', True), \
+                patch.object(NovelTrendingScore.objects, 'bulk_create', wraps=NovelTrendingScore.objects.bulk_create) as bulk_create:
+            TrendingService.recompute()
+        self.assertEqual(bulk_create.call_args.kwargs['unique_fields'], ['novel'])
+        self.assertTrue(NovelTrendingScore.objects.filter(novel=self.novels[0]).exists())
@@ -0,0 +1,117 @@
+"""
+Tests for buffered view counts
+"""
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from novels.models import Novel, Volume, Chapter, PendingViewCount
+from novels.services import ViewCountService
+from novels.services import view_count_service
+from constants import ApprovalStatus
+
+
+class ViewCountServiceTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        ViewCountService.drain_local()
+        PendingViewCount.objects.all().delete()
+        self.novel = Novel.objects.create(
+            name="Counted Novel",
+            summary="Test summary",
+            approval_status=ApprovalStatus.APPROVED.value
+        )
+        self.other = Novel.objects.create(name="Other Novel", summary="Test summary")
+        volume = Volume.objects.create(novel=self.novel, name="Tap 1", position=1)
+        self.chapter = Chapter.objects.create(volume=volume, title="Chuong 1", position=1, approved=True)
+
+    def test_views_are_applied_with_one_update_per_model(self):
+        ViewCountService.add([('novel', self.novel.pk)] * 3 + [('novel', self.other.pk), ('chapter', self.chapter.pk)])
+        ViewCountService.drain_local()
+        self.assertEqual(Novel.objects.get(pk=self.novel.pk).view_count, 0)
+
+        # Savepoint, read the buffer, one UPDATE per model, daily stats
+        # (live novels, insert missing rows, UPDATE), delete, release
+        with self.assertNumQueries(9):
+            updated = ViewCountService.flush()
+
+        self.assertEqual((updated['novel'], updated['chapter']), (2, 1))
+        self.assertEqual(Novel.objects.get(pk=self.novel.pk).view_count, 3)
+        self.assertEqual(Novel.objects.get(pk=self.other.pk).view_count, 1)
+        self.assertEqual(Chapter.objects.get(pk=self.chapter.pk).view_count, 1)
+        self.assertFalse(PendingViewCount.objects.exists())
+
+    def test_page_views_are_deduplicated_per_viewer(self):
+        url = reverse('novels:chapter_detail', kwargs={
+            'novel_slug': self.novel.slug,
+            'chapter_slug': self.chapter.slug
+        })
+        self.client.get(url)
+        self.client.get(url)
+        self.client.get(url, HTTP_USER_AGENT='another browser')
+
+        call_command('flush_view_counts', stdout=StringIO())
+
+        self.assertEqual(Novel.objects.get(pk=self.novel.pk).view_count, 2)
+        self.assertEqual(Chapter.objects.get(pk=self.chapter.pk).view_count, 2)
+
+    @override_settings(VIEW_COUNT_DEDUPE=False)
+    def test_dedupe_can_be_disabled(self):
+        url = reverse('novels:novel_detail', kwargs={'novel_slug': self.novel.slug})
+        self.client.get(url)
+        self.client.get(url)
+
+        ViewCountService.flush()
+
+        self.assertEqual(Novel.objects.get(pk=self.novel.pk).view_count, 2)
+
+    def test_file_buffer_round_trip(self):
+        directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, directory)
+
+        with override_settings(
+            VIEW_COUNT_BUFFER='novels.services.view_count_service.FileViewBuffer',
+            VIEW_COUNT_BUFFER_PATH=str(directory / 'views.buffer'),
+        ):
+            ViewCountService.add([('novel', self.novel.pk), ('chapter', self.chapter.pk)])
+            ViewCountService.drain_local()
+            ViewCountService.add([('novel', self.novel.pk)])
+            ViewCountService.drain_local()
+            ViewCountService.flush()
+
+        self.assertEqual(Novel.objects.get(pk=self.novel.pk).view_count, 2)
+        self.assertEqual(Chapter.objects.get(pk=self.chapter.pk).view_count, 1)
+        self.assertEqual(list(directory.iterdir()), [])
+
+    def test_drain_thread_moves_idle_views(self):
+        with patch.object(view_count_service, '_drainer_pid', None), \
+                patch.object(view_count_service.threading, 'Thread') as thread, \
+                patch.object(view_count_service.atexit, 'register') as register:
+            ViewCountService.add([('novel', self.novel.pk)])
+            thread.assert_not_called()
+
+            ViewCountService.start_drainer()
+            ViewCountService.start_drainer()
+            thread.assert_called_once()
+            register.assert_called_once_with(ViewCountService.drain_local)
+
+            # A worker forked after the server started the thread starts its own
+            view_count_service._drainer_pid = -1
+            ViewCountService.add([('novel', self.novel.pk)])
+            self.assertEqual(thread.call_count, 2)
+            register.assert_called_once()
+
+        # One pass of the thread's loop once the views have sat idle
+        with patch.object(view_count_service, '_last_drain', 0), \
+                patch.object(view_count_service.time, 'sleep', side_effect=[None, StopIteration]):
+            with self.assertRaises(StopIteration):
+                ViewCountService._drain_forever()
+
+        self.assertEqual(PendingViewCount.objects.get().delta, 2)
@@ -0,0 +1,57 @@
+"""
+Tests for the admin dashboard read from NovelDailyStats
+"""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from common.utils.sse import SSEManager
+from novels.models import Novel, NovelDailyStats
+from constants import UserRole
+
+User = get_user_model()
+
+
+class DashboardViewTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email='admin@example.com', username='admin', password='testpass123', role=UserRole.WEBSITE_ADMIN.value
+        )
+        self.client.force_login(self.admin)
+
+    def test_dashboard_reads_rollup(self):
+        today = timezone.localdate()
+        popular = Novel.objects.create(name="Popular", summary="Summary")
+        quiet = Novel.objects.create(name="Quiet", summary="Summary")
+        NovelDailyStats.objects.create(novel=popular, date=today, views=30, comments=2)
+        NovelDailyStats.objects.create(novel=quiet, date=today, views=5, new_chapters=1)
+        NovelDailyStats.objects.create(novel=quiet, date=today - timedelta(days=1), views=7)
+
+        response = self.client.get(reverse('admin:admin_dashboard'))
+
+        chart = response.context['chart_data']
+        self.assertEqual(len(chart['labels']), 30)
+        self.assertEqual(chart['views'][-2:], [7, 35])
+        self.assertEqual(chart['comments'][-1], 2)
+        self.assertEqual(chart['new_chapters'][-1], 1)
+        top = [(novel['name'], novel['views']) for novel in response.context['top_novels']]
+        if today.day == 1:
+            self.assertEqual(top, [("Popular", 30), ("Quiet", 5)])
+        else:
+            self.assertEqual(top, [("Popular", 30), ("Quiet", 12)])
+        self.assertContains(response, 'id="dashboard-chart-data"')
+
+    def test_dashboard_shows_sse_backpressure_totals(self):
+        cache.clear()
+        manager = SSEManager()
+        manager.stats.update(dropped=4, disconnected=1)
+        with self.assertLogs('common.utils.sse', 'WARNING'):
+            manager.report_stats()
+
+        response = self.client.get(reverse('admin:admin_dashboard'))
+
+        self.assertEqual(response.context['sse_stats'], {'dropped': 4, 'coalesced': 0, 'disconnected': 1})
@@ -0,0 +1,78 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from accounts.models import User
+from interactions.models import Comment
+from novels.models import Novel
+from novels.services import HomepageService
+from constants import ApprovalStatus, ProgressStatus
+
+
+class HomepageSnapshotTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="reader", email="reader@example.com", password="password123"
+        )
+        self.novel = Novel.objects.create(
+            name="Snapshot Novel",
+            slug="snapshot-novel",
+            summary="Demo summary",
+            approval_status=ApprovalStatus.APPROVED.value,
+            progress_status=ProgressStatus.COMPLETED.value,
+        )
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_home_renders_snapshot_sections(self):
+        response = self.client.get(reverse("novels:home"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["trend_novels"][0]["slug"], "snapshot-novel")
+        self.assertEqual(response.context["finish_novels"][0]["slug"], "snapshot-novel")
+
+    def test_warm_snapshot_runs_no_queries(self):
+        HomepageService.get_snapshot()
+
+        with self.assertNumQueries(0):
+            HomepageService.get_snapshot()
+
+    def test_novel_save_invalidates_sections(self):
+        HomepageService.get_snapshot()
+
+        Novel.objects.create(
+            name="Another Novel",
+            slug="another-novel",
+            summary="Demo summary",
+            approval_status=ApprovalStatus.APPROVED.value,
+        )
+
+        slugs = [card["slug"] for card in HomepageService.get_snapshot()["new_novels"]]
+        self.assertIn("another-novel", slugs)
+
+    def test_comment_save_only_invalidates_comments(self):
+        HomepageService.get_snapshot()
+
+        Comment.objects.create(user=self.user, novel=self.novel, content="Hay quá")
+
+        with patch.object(HomepageService, "build_trend_novels") as build_trend:
+            snapshot = HomepageService.get_snapshot()
+
+        build_trend.assert_not_called()
+        self.assertEqual(snapshot["comments"][0]["comment"], "Hay quá")
+        self.assertIn("time", snapshot["comments"][0])
+
+    def test_locked_rebuild_serves_stale_copy(self):
+        HomepageService.get_snapshot()
+        HomepageService.invalidate("favorite")
+        cache.add(f"{HomepageService._key('like_novels')}:lock", True)
+
+        with patch.object(HomepageService, "build_like_novels") as build_like:
+            snapshot = HomepageService.get_snapshot()
+
+        build_like.assert_not_called()
+        self.assertEqual(snapshot["like_novels"][0]["slug"], "snapshot-novel")
@@ -1,7 +1,11 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
-from novels.models import Novel
-from constants import ProgressStatus, ApprovalStatus
+from novels.models import Novel, Volume, Chapter
+from novels.services import NovelService
+from common.utils import KeysetPaginator
+from constants import ProgressStatus, ApprovalStatus, MAX_FINISH_NOVELS, MAX_MOST_READ_NOVELS
 from django.utils import timezone
 from datetime import timedelta
 
@@ -53,3 +57,132 @@ class NovelViewsTest(TestCase):
 
         novels = response.context["finish_novels"]
         self.assertTrue(all(n.progress_status == ProgressStatus.COMPLETED.value for n in novels))
+
+
+class FinishedNovelsQueryCountTest(TestCase):
+    """Query count of the finished-novel pipeline must not grow with the catalog"""
+
+    def _create_catalog(self, start, count, chapters_per_volume=3):
+        for i in range(start, start + count):
+            novel = Novel.objects.create(
+                name=f"Finished {i}",
+                slug=f"finished-{i}",
+                summary="Demo summary",
+                approval_status=ApprovalStatus.APPROVED.value,
+                progress_status=ProgressStatus.COMPLETED.value,
+            )
+            for v in range(1, 3):
+                volume = Volume.objects.create(novel=novel, name=f"Tap {v}", position=v)
+                for c in range(1, chapters_per_volume + 1):
+                    Chapter.objects.create(
+                        volume=volume,
+                        title=f"Chuong {c}",
+                        slug=f"finished-{i}-tap-{v}-chuong-{c}",
+                        position=c,
+                        approved=True,
+                    )
+
+    def test_latest_chapter_is_attached(self):
+        self._create_catalog(0, 1)
+
+        novel = NovelService.get_finished_novels_with_chapters()[0]
+
+        self.assertEqual(novel.recent_volume.name, "Tap 2")
+        self.assertEqual(novel.recent_chapter.title, "Chuong 3")
+
+    def test_hidden_chapters_are_skipped(self):
+        self._create_catalog(0, 1)
+        Chapter.objects.filter(slug="finished-0-tap-2-chuong-3").update(is_hidden=True)
+
+        novel = NovelService.get_finished_novels_with_chapters()[0]
+
+        self.assertEqual(novel.recent_chapter.title, "Chuong 2")
+
+    def test_query_count_is_flat_as_catalog_grows(self):
+        self._create_catalog(0, 2)
+        with self.assertNumQueries(2):
+            NovelService.get_finished_novels_with_chapters()
+
+        self._create_catalog(2, 20, chapters_per_volume=6)
+        with self.assertNumQueries(2):
+            novels = NovelService.get_finished_novels_with_chapters()
+        self.assertEqual(len(novels), MAX_FINISH_NOVELS)
+
+    def test_finish_page_query_count_is_flat(self):
+        self._create_catalog(0, 2)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(reverse("novels:finish_novels"))
+
+        self._create_catalog(2, 30)
+        first_page = self.client.get(reverse("novels:finish_novels"))
+        cursor = first_page.context["page_obj"].next_cursor
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(reverse("novels:finish_novels"), {"cursor": cursor})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+
+class KeysetPaginationTest(TestCase):
+    """Cursor pagination must walk the listing without skips or duplicates"""
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(25):
+            Novel.objects.create(
+                name=f"Keyset {i}",
+                slug=f"keyset-{i}",
+                summary="Demo summary",
+                approval_status=ApprovalStatus.APPROVED.value,
+                view_count=i // 3,
+            )
+
+    def _paginator(self, **kwargs):
+        return KeysetPaginator(NovelService.get_approved_novels(), ("-view_count", "-id"), 4, **kwargs)
+
+    def test_forward_and_backward_traversal_with_ties(self):
+        paginator = self._paginator()
+        expected = list(NovelService.get_approved_novels().order_by("-view_count", "-id"))
+
+        pages = []
+        page = paginator.get_page()
+        self.assertFalse(page.has_previous())
+        while True:
+            pages.append(page)
+            if not page.has_next():
+                break
+            page = paginator.get_page(page.next_cursor)
+
+        self.assertEqual([novel for p in pages for novel in p], expected)
+
+        previous = paginator.get_page(pages[-1].previous_cursor)
+        self.assertEqual(list(previous), list(pages[-2]))
+        first = paginator.get_page(pages[1].previous_cursor)
+        self.assertEqual(list(first), list(pages[0]))
+        self.assertFalse(first.has_previous())
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        paginator = self._paginator()
+
+        page = paginator.get_page("not-a-cursor")
+
+        self.assertEqual(list(page), list(paginator.get_page()))
+
+    def test_count_limit_caps_total(self):
+        page = self._paginator(count_limit=10).get_page()
+        self.assertEqual(page.total, 10)
+        self.assertFalse(page.total_is_exact)
+
+        page = self._paginator(count_limit=100).get_page()
+        self.assertEqual(page.total, 25)
+        self.assertTrue(page.total_is_exact)
+
+    def test_most_read_view_follows_cursor(self):
+        url = reverse("novels:most_read_novels")
+        first = self.client.get(url).context["page_obj"]
+
+        second = self.client.get(url, {"cursor": first.next_cursor}).context["page_obj"]
+
+        self.assertEqual(len(first), MAX_MOST_READ_NOVELS)
+        self.assertTrue(set(n.id for n in first).isdisjoint(n.id for n in second))
+        self.assertGreaterEqual(first[-1].view_count, second[0].view_count)
@@ -1,6 +1,7 @@
 """
 Unit tests for Chapter Public Views functionality
 """
+import json
 from http import HTTPStatus
 from django.test import TestCase, Client
 from django.contrib.auth import get_user_model
@@ -8,8 +9,12 @@ from django.urls import reverse
 from django.contrib.messages import get_messages
 from unittest.mock import patch, Mock
 
+from django.core.cache import cache
+from django.http import Http404
 from novels.models import Novel, Volume, Chapter, Author, Chunk
-from constants import ApprovalStatus, UserRole
+from novels.services import ChapterReadingBundle
+from novels.utils import ChunkManager
+from constants import ApprovalStatus, UserRole, MAX_LIMIT_CHUNKS, MAX_CHUNK_RANGE_LIMIT
 import warnings
 
 warnings.filterwarnings("ignore", message="No directory at:")
@@ -267,3 +272,173 @@ class ChapterContextTests(ChapterPublicViewTestCase):
         self.assertEqual(response.context['volume'], self.volume)
         self.assertEqual(response.context['total_chunks'], 2)
         self.assertEqual(response.context['loaded_chunks'], 2)
+
+
+class ChapterQueryBudgetTests(ChapterPublicViewTestCase):
+    """Pin the number of queries chapter_detail_view may run"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        for position in range(3, 12):
+            Chunk.objects.create(chapter=self.chapter, position=position, content=f"Chunk {position}", word_count=position)
+        for position in range(2, 30):
+            Chapter.objects.create(volume=self.volume, title=f"Chapter {position}", position=position, approved=True)
+        self.url = reverse('novels:chapter_detail', kwargs={
+            'novel_slug': self.novel.slug,
+            'chapter_slug': self.chapter.slug
+        })
+
+    def test_anonymous_query_budget(self):
+        """Novel and chapter; chunks and navigation come from the cache"""
+        self.client.get(self.url)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.context['total_chunks'], 11)
+        self.assertEqual(response.context['loaded_chunks'], 5)
+        self.assertEqual(response.context['max_chunk_words'], 11)
+        self.assertEqual(len(response.context['all_chapters']), 29)
+
+    def test_bundle_budget_does_not_grow(self):
+        """Chapter and reading history"""
+        reader = User.objects.create_user(username='reader', email='reader@example.com', password='password123')
+        ChapterReadingBundle.build(self.novel, self.chapter.slug, reader)
+
+        with self.assertNumQueries(2):
+            ChapterReadingBundle.build(self.novel, self.chapter.slug, reader)
+
+        for position in range(12, 40):
+            Chunk.objects.create(chapter=self.chapter, position=position, content=f"Chunk {position}")
+        self.chapter.save()
+        ChapterReadingBundle.build(self.novel, self.chapter.slug, reader)
+
+        with self.assertNumQueries(2):
+            bundle = ChapterReadingBundle.build(self.novel, self.chapter.slug, reader)
+        self.assertEqual(bundle['total_chunks'], 39)
+        self.assertIs(bundle['chapter'].volume.novel, self.novel)
+
+    def test_owner_can_open_hidden_chapter(self):
+        hidden = Chapter.objects.create(volume=self.volume, title="Draft", position=99, is_hidden=True)
+
+        with self.assertRaises(Http404):
+            ChapterReadingBundle.build(self.novel, hidden.slug)
+
+        bundle = ChapterReadingBundle.build(self.novel, hidden.slug, self.user)
+        self.assertEqual(bundle['chapter'], hidden)
+
+
+class ChapterConditionalResponseTests(ChapterPublicViewTestCase):
+    """ETag / Last-Modified handling on chapter pages and chunk loads"""
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('novels:chapter_detail', kwargs={
+            'novel_slug': self.novel.slug,
+            'chapter_slug': self.chapter.slug
+        })
+        self.chunks_url = reverse('novels:load_more_chunks', kwargs={'chapter_id': self.chapter.id})
+
+    def test_anonymous_page_revalidates_with_304(self):
+        response = self.client.get(self.url)
+        etag = response.headers['ETag']
+
+        with self.assertNumQueries(2):
+            not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(not_modified.status_code, HTTPStatus.NOT_MODIFIED)
+        self.assertEqual(not_modified.headers['ETag'], etag)
+
+    def test_revalidation_is_not_counted_as_a_view(self):
+        etag = self.client.get(self.url).headers['ETag']
+
+        with patch('novels.views.public.chapter_view.ViewCountService.record_view') as record_view:
+            self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        record_view.assert_not_called()
+
+    def test_if_modified_since_returns_304(self):
+        response = self.client.get(self.url)
+
+        not_modified = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=response.headers['Last-Modified'])
+
+        self.assertEqual(not_modified.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_etag_changes_when_navigation_changes(self):
+        etag = self.client.get(self.url).headers['ETag']
+
+        Chapter.objects.create(volume=self.volume, title="Next Chapter", position=2, approved=True)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_signed_in_page_has_no_validators(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertNotIn('ETag', response.headers)
+
+    def test_load_more_chunks_revalidates_until_content_changes(self):
+        response = self.client.get(self.chunks_url, {'start': 1, 'limit': 1})
+        etag = response.headers['ETag']
+        self.assertEqual(len(response.json()['chunks']), 1)
+        self.assertTrue(response.json()['has_more'])
+
+        not_modified = self.client.get(self.chunks_url, {'start': 1, 'limit': 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, HTTPStatus.NOT_MODIFIED)
+
+        ChunkManager.create_normal_chunks_for_chapter(self.chapter, "Rewritten content")
+
+        response = self.client.get(self.chunks_url, {'start': 1, 'limit': 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertIn("Rewritten content", response.json()['chunks'][0]['content'])
+
+
+class ChunkRangeTests(ChapterPublicViewTestCase):
+    """Capped, cached chunk windows from the range endpoint"""
+
+    def setUp(self):
+        super().setUp()
+        for position in range(3, 61):
+            Chunk.objects.create(chapter=self.chapter, position=position, content=f"Chunk {position}", word_count=1)
+        self.chapter.save()
+        self.url = reverse('novels:load_chunk_range', kwargs={'chapter_id': self.chapter.id})
+
+    def test_window_with_has_more_from_chunk_count(self):
+        self.client.get(self.url, {'start': 6, 'limit': 5})
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {'start': 56, 'limit': 5})
+
+        data = response.json()
+        self.assertEqual([chunk['position'] for chunk in data['chunks']], [56, 57, 58, 59, 60])
+        self.assertFalse(data['has_more'])
+        self.assertEqual(data['total_chunks'], 60)
+
+    def test_limit_is_capped_and_large_windows_stream(self):
+        response = self.client.get(self.url, {'start': 1, 'limit': 1000})
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual(len(lines), MAX_CHUNK_RANGE_LIMIT + 1)
+        self.assertEqual(lines[-1], {'has_more': True, 'next_start': MAX_CHUNK_RANGE_LIMIT + 1, 'total_chunks': 60})
+
+    def test_invalid_params_fall_back_to_defaults(self):
+        response = self.client.get(self.url, {'start': 'abc', 'limit': 'x'})
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(len(response.json()['chunks']), MAX_LIMIT_CHUNKS)
+
+    def test_hidden_chapter_only_served_to_owner(self):
+        self.chapter.is_hidden = True
+        self.chapter.save()
+
+        self.assertEqual(self.client.get(self.url).status_code, HTTPStatus.NOT_FOUND)
+
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(self.url).status_code, HTTPStatus.OK)
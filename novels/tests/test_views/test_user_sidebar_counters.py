@@ -0,0 +1,74 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.template import Context, Template
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from common.utils import user_context
+from novels.models import Favorite, Novel
+from novels.services.novel_service import FavoriteService, NovelService
+from constants import ApprovalStatus
+
+User = get_user_model()
+
+
+class TestUserSidebarCounters(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='reader@example.com', username='reader', password='password')
+        self.other = User.objects.create_user(email='other@example.com', username='other', password='password')
+        self.novels = [
+            Novel.objects.create(
+                name=f'Sidebar Novel {i}',
+                summary='Test summary',
+                created_by=self.user,
+                approval_status=ApprovalStatus.APPROVED.value
+            )
+            for i in range(2)
+        ]
+        Favorite.objects.create(user=self.user, novel=self.novels[0])
+
+    def context(self):
+        request = RequestFactory().get('/')
+        request.user = self.user
+        return user_context(request)
+
+    def counts(self, context):
+        return int(str(context['user_novel_count'])), int(str(context['user_like_novel_count']))
+
+    def test_counts_are_lazy_and_cached(self):
+        with CaptureQueriesContext(connection) as queries:
+            context = self.context()
+            Template('{{ user_name }}').render(Context(context))
+        self.assertFalse([q for q in queries.captured_queries if 'COUNT' in q['sql']])
+
+        with self.assertNumQueries(2):
+            self.assertEqual(self.counts(context), (2, 1))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.counts(self.context()), (2, 1))
+
+    def test_signals_drop_stale_counts(self):
+        self.counts(self.context())
+
+        Favorite.objects.create(user=self.user, novel=self.novels[1])
+        self.assertEqual(self.counts(self.context()), (2, 2))
+
+        FavoriteService.toggle_like(self.user, self.novels[0])
+        NovelService.delete_novel(self.novels[1].slug)
+        self.assertEqual(self.counts(self.context()), (1, 1))
+
+        # Other users' changes leave the entry alone
+        Favorite.objects.create(user=self.other, novel=self.novels[0])
+        with self.assertNumQueries(0):
+            self.counts(self.context())
+
+    def test_sidebar_shows_counts(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse('novels:my_novels'))
+
+        self.assertContains(response, '<span class="badge">2</span>', html=True)
+        self.assertContains(response, '<span class="badge">1</span>', html=True)
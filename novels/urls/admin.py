@@ -15,6 +15,7 @@ urlpatterns = [
     path("requests/chapter/<slug:chapter_slug>/", chapter_review, name="chapter_review"),
     path("requests/chapter/<slug:chapter_slug>/approve/", approve_chapter_view, name="approve_chapter"),
     path("requests/chapter/<slug:chapter_slug>/reject/", reject_chapter_view, name="reject_chapter"),
+    path("requests/chapter/<slug:chapter_slug>/notifications/", chapter_notification_progress, name="chapter_notification_progress"),
     path("tags/", admin_tag_list, name="admin_tag_list"),
     path("tags/create/", admin_tag_create, name="admin_tag_create"),
     path("tags/<slug:tag_slug>/edit/", admin_tag_update, name="admin_tag_update"),
@@ -3,5 +3,6 @@ from .. import views
 
 urlpatterns = [
     path('load-chunks/<int:chapter_id>/', views.load_more_chunks, name='load_more_chunks'),
+    path('chunks/<int:chapter_id>/range/', views.load_chunk_range, name='load_chunk_range'),
     path('save-progress/', views.save_reading_progress, name='save_reading_progress'),
 ]
@@ -1,8 +1,30 @@
+from typing import List, NamedTuple, Tuple
+
+from django.conf import settings
+from django.db import transaction
+
+from constants import CHUNK_BULK_BATCH_SIZE
 from .helpers import count_words
 from .simple_chunker import SimpleChunker
 from .html_chunker import HtmlChunker
 
 
+class ChunkSyncReport(NamedTuple):
+    """Rows touched when a chapter's chunks were brought in line with new content"""
+    created: int
+    updated: int
+    deleted: int
+    unchanged: int
+
+    @property
+    def total(self):
+        return self.created + self.updated + self.unchanged
+
+    @property
+    def written(self):
+        return self.created + self.updated + self.deleted
+
+
 class ChunkManager:
     """Manager class for handling chapter content chunking operations."""
     
@@ -16,34 +38,14 @@ class ChunkManager:
             content: Raw content to be chunked
             chunker: Optional SimpleChunker instance
         """
-        from novels.models import Chunk
-        
         if chunker is None:
             chunker = SimpleChunker()
             
         # Calculate total word count from original content first
         total_word_count = count_words(content)
         
-        # Clear existing chunks only if chapter is saved (has a primary key)
-        if chapter.pk:
-            Chunk.objects.filter(chapter=chapter).delete()
-        
-        # Create new chunks
         chunks_data = chunker.split_into_chunks(content)
-        
-        for position, (chunk_content, word_count) in enumerate(chunks_data, 1):
-            Chunk.objects.create(
-                chapter=chapter,
-                position=position,
-                content=chunk_content,
-                word_count=word_count
-            )
-        
-        # Update chapter word count with pre-calculated total
-        chapter.word_count = total_word_count
-        chapter.save(update_fields=['word_count'])
-        
-        return len(chunks_data)
+        return ChunkManager.sync_chapter_chunks(chapter, chunks_data, total_word_count)
     
     @staticmethod
     def create_html_chunks_for_chapter(chapter, content: str, chunker: HtmlChunker = None):
@@ -55,47 +57,106 @@ class ChunkManager:
             content: HTML content to be chunked
             chunker: Optional HtmlChunker instance
         """
-        from novels.models import Chunk
-        from bs4 import BeautifulSoup
-        
         if chunker is None:
             chunker = HtmlChunker()
         
-        # Extract text content for word counting (preserve original HTML for chunks)
-        soup = BeautifulSoup(content, 'html.parser')
-        total_word_count = count_words(soup.get_text())
+        # Chunks are balanced by construction and counted in the same pass,
+        # so the total comes from the chunks instead of another parse
+        chunks_data = chunker.split_into_chunks(content)
+        total_word_count = sum(word_count for _, word_count in chunks_data)
         
-        # Clear existing chunks only if chapter is saved (has a primary key)
-        if chapter.pk:
-            Chunk.objects.filter(chapter=chapter).delete()
+        return ChunkManager.sync_chapter_chunks(chapter, chunks_data, total_word_count)
+    
+    @staticmethod
+    def sync_chapter_chunks(chapter, chunks_data: List[Tuple[str, int]], total_word_count: int) -> ChunkSyncReport:
+        """
+        Write only the chunks that differ from what is stored for the chapter.
         
-        # Create new chunks using HTML-aware chunking
-        chunks_data = chunker.split_into_chunks(content)
+        New chunks are compared with the stored ones by position and content
+        hash; changed rows are updated, missing ones created and leftovers
+        deleted, all in bulk inside one transaction.
+        
+        Args:
+            chapter: Chapter model instance
+            chunks_data: (content, word_count) tuples in reading order
+            total_word_count: Word count stored on the chapter
+        """
+        from novels.models import Chunk
         
+        stored = {}
+        if chapter.pk:
+            stored = {
+                row['position']: row
+                for row in Chunk.objects.filter(chapter=chapter).values('id', 'position', 'content_hash', 'word_count')
+            }
+        
+        to_create, to_update = [], []
         for position, (chunk_content, word_count) in enumerate(chunks_data, 1):
-            # Validate that each chunk is valid HTML
-            if chunker.validate_html_chunk(chunk_content):
-                Chunk.objects.create(
-                    chapter=chapter,
-                    position=position,
-                    content=chunk_content,
-                    word_count=word_count
-                )
-            else:
-                # Fallback: wrap in paragraph tags if HTML is invalid
-                safe_content = f'<p>{chunk_content}</p>'
-                Chunk.objects.create(
-                    chapter=chapter,
-                    position=position,
-                    content=safe_content,
-                    word_count=word_count
-                )
-        
-        # Update chapter word count with pre-calculated total
-        chapter.word_count = total_word_count
-        chapter.save(update_fields=['word_count'])
-        
-        return len(chunks_data)
+            content_hash = Chunk.hash_content(chunk_content)
+            row = stored.pop(position, None)
+            if row and row['content_hash'] == content_hash and row['word_count'] == word_count:
+                continue
+            
+            chunk = Chunk(
+                id=row['id'] if row else None,
+                chapter=chapter,
+                position=position,
+                content=chunk_content,
+                content_hash=content_hash,
+                word_count=word_count
+            )
+            chunk.compress_content(settings.CHUNK_COMPRESSION)
+            (to_update if row else to_create).append(chunk)
+        
+        # Whatever is left in stored lies past the new last position
+        to_delete = [row['id'] for row in stored.values()]
+        
+        with transaction.atomic():
+            if to_delete:
+                Chunk.objects.filter(id__in=to_delete).delete()
+            if to_update:
+                ChunkManager.bulk_update_chunks(to_update, ['content_hash', 'word_count'])
+            if to_create:
+                Chunk.objects.bulk_create(to_create, batch_size=CHUNK_BULK_BATCH_SIZE)
+            
+            report = ChunkSyncReport(
+                created=len(to_create),
+                updated=len(to_update),
+                deleted=len(to_delete),
+                unchanged=len(chunks_data) - len(to_create) - len(to_update)
+            )
+            
+            # Update chapter word count with pre-calculated total; bumping
+            # updated_at retires the cached copy of the old chunks
+            if report.written or chapter.word_count != total_word_count:
+                # novels.services imports novels.utils, so a module-level import would be circular
+                from novels.services.chapter_service import ChapterService
+                was_public = ChapterService.lock_public_state(chapter)
+                delta = total_word_count - chapter.word_count
+                chapter.word_count = total_word_count
+                chapter.save(update_fields=['word_count', 'updated_at'])
+                if was_public:
+                    ChapterService.apply_word_count_delta(chapter.volume.novel_id, delta)
+        
+        return report
+    
+    @staticmethod
+    def bulk_update_chunks(chunks, fields=()):
+        """
+        bulk_update chunks whose content storage changed, along with ``fields``.
+        
+        bulk_update reads attributes, which hold the decoded text, so the
+        inline column of compressed chunks is cleared with a separate UPDATE.
+        """
+        from novels.models import Chunk
+        
+        compressed = [chunk for chunk in chunks if chunk.content_data]
+        inline = [chunk for chunk in chunks if not chunk.content_data]
+        if compressed:
+            Chunk.objects.bulk_update(compressed, ['content_data', *fields], batch_size=CHUNK_BULK_BATCH_SIZE)
+            Chunk.objects.filter(id__in=[chunk.id for chunk in compressed]).update(content='')
+        if inline:
+            Chunk.objects.bulk_update(inline, ['content', 'content_data', *fields], batch_size=CHUNK_BULK_BATCH_SIZE)
     
     @staticmethod
     def create_chunks_for_chapter(chapter, content: str, chunker: SimpleChunker = None):
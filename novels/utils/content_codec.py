@@ -0,0 +1,41 @@
+import hashlib
+import zlib
+
+from constants import CHUNK_COMPRESSION_LEVEL, CHUNK_COMPRESSION_MIN_SIZE
+
+# First byte of every encoded payload
+CODEC_PLAIN = 0
+CODEC_ZLIB = 1
+
+
+def encode_content(text, codec=CODEC_ZLIB):
+    """Encode ``text`` as a codec byte followed by the payload"""
+    data = text.encode('utf-8')
+    if codec == CODEC_ZLIB:
+        data = zlib.compress(data, CHUNK_COMPRESSION_LEVEL)
+    elif codec != CODEC_PLAIN:
+        raise ValueError(f"Unknown content codec: {codec}")
+    return bytes([codec]) + data
+
+
+def storage_payload(text, enabled=True):
+    """Payload to store for a chunk's ``text``, or None when it stays inline"""
+    if enabled and len(text) >= CHUNK_COMPRESSION_MIN_SIZE:
+        return encode_content(text)
+    return None
+
+
+def decode_content(payload):
+    """Inverse of encode_content"""
+    payload = bytes(payload)
+    codec, data = payload[0], payload[1:]
+    if codec == CODEC_ZLIB:
+        data = zlib.decompress(data)
+    elif codec != CODEC_PLAIN:
+        raise ValueError(f"Unknown content codec: {codec}")
+    return data.decode('utf-8')
+
+
+def hash_content(text):
+    """sha1 hex digest used to tell whether a stored chunk changed"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
@@ -47,7 +47,8 @@ def format_comments_for_template(comments):
             'comment': comment.content[:COMMENT_TRUNCATE_LENGTH] + '...' if len(comment.content) > COMMENT_TRUNCATE_LENGTH else comment.content,
             'username': comment.user.username if comment.user else 'Anonymous',
             'avatar': avatar_url,
-            'time': get_relative_time(comment.created_at)
+            'time': get_relative_time(comment.created_at),
+            'created_at': comment.created_at,
         })
     
     return comments_data
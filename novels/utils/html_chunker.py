@@ -1,193 +1,439 @@
 import re
-from typing import List, Tuple
-from bs4 import BeautifulSoup, NavigableString
-from constants import MAX_CHUNK_SIZE, HTML_TAG_OVERHEAD, BEAUTIFULSOUP_PARSER, HTML_BLOCK_ELEMENTS
-from .helpers import count_words
+from html.parser import HTMLParser
+from typing import Iterator, List, Tuple
+
+from bs4.dammit import EntitySubstitution
+
+from constants import (
+    MAX_CHUNK_SIZE,
+    HTML_TAG_OVERHEAD,
+    HTML_BLOCK_ELEMENTS,
+    HTML_CHUNKER_FEED_SIZE,
+    HTML_VOID_ELEMENTS,
+    HTML_PRESERVE_WHITESPACE_ELEMENTS,
+    HTML_UNCOUNTED_TEXT_ELEMENTS,
+    HTML_LIST_ATTRIBUTES,
+)
+
+# Tree building and serialization follow BeautifulSoup's html.parser builder
+# and its minimal formatter, so chunks match what the soup based chunker wrote
+_VOID_ELEMENTS = frozenset(HTML_VOID_ELEMENTS)
+_PRESERVE_WHITESPACE = frozenset(HTML_PRESERVE_WHITESPACE_ELEMENTS)
+_UNCOUNTED_CONTAINERS = frozenset(HTML_UNCOUNTED_TEXT_ELEMENTS)
+_RAW_TEXT_PARENTS = frozenset({'script', 'style'})
+_ENTITIES = EntitySubstitution.HTML_ENTITY_TO_CHARACTER
+_ASCII_SPACES = frozenset('\x20\x0a\x09\x0c\x0d')
+_ESCAPES = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+_BLOCK_ELEMENTS = frozenset(HTML_BLOCK_ELEMENTS)
+
+
+class _WordTally:
+    """Word count of text that arrives in pieces, joining words split across pieces"""
+
+    __slots__ = ('count', 'leading', 'trailing')
+
+    def __init__(self):
+        self.count = 0
+        self.leading = None
+        self.trailing = False
+
+    def add(self, text: str):
+        if text:
+            self._merge(len(text.split()), not text[0].isspace(), not text[-1].isspace())
+
+    def extend(self, other: '_WordTally'):
+        if other.leading is not None:
+            self._merge(other.count, other.leading, other.trailing)
+
+    def _merge(self, count: int, leading: bool, trailing: bool):
+        if self.leading is None:
+            self.leading = leading
+        elif self.trailing and leading:
+            count -= 1
+        self.count += count
+        self.trailing = trailing
+
+
+class _Text:
+    __slots__ = ('html', 'text')
+
+    def __init__(self, html: str, text: str = ''):
+        self.html = html
+        self.text = text  # the part get_text() would return, if any
+
+
+class _Element:
+    __slots__ = ('name', 'tag', 'children', 'html')
+
+    def __init__(self, name: str, tag: str):
+        self.name = name
+        self.tag = tag  # opening tag without the closing '>'
+        self.children = []
+        self.html = ''
+
+    @property
+    def start_tag(self) -> str:
+        return self.tag + '>'
+
+    @property
+    def end_tag(self) -> str:
+        return f'</{self.name}>'
+
+    def close(self):
+        if self.name in _VOID_ELEMENTS and not self.children:
+            self.html = self.tag + '/>'
+        else:
+            self.html = ''.join([self.start_tag, *(child.html for child in self.children), self.end_tag])
+
+
+class _HtmlNodeParser(HTMLParser):
+    """
+    Build the tree BeautifulSoup would build, one top-level node at a time.
+
+    Completed top-level nodes are queued with the word tally of their text
+    and collected with drain(), so the caller can group them while the rest
+    of the document is still being fed.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.nodes = []
+        self.repaired = False  # set when a stray or missing end tag was fixed up
+        self._stack = []
+        self._open = {}
+        self._data = []
+        self._tally = _WordTally()
+        self._already_closed = []
+        self._preserving = 0
+        self._containers = 0
+
+    def drain(self) -> List[Tuple[object, _WordTally]]:
+        nodes, self.nodes = self.nodes, []
+        return nodes
+
+    def close(self):
+        super().close()
+        self._flush()
+        if self._stack:
+            self.repaired = True
+        while self._stack:
+            self._pop()
+
+    def handle_starttag(self, tag, attrs):
+        self._push(tag, attrs)
+        if tag in _VOID_ELEMENTS:
+            self._pop_to(tag)
+            self._already_closed.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self._push(tag, attrs)
+        self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in self._already_closed:
+            self._already_closed.remove(tag)
+        else:
+            self._pop_to(tag)
+
+    def handle_data(self, data):
+        self._data.append(data)
+
+    def handle_charref(self, name):
+        codepoint = int(name[1:], 16) if name[0] in 'xX' else int(name)
+        data = None
+        if codepoint < 256:
+            try:
+                data = bytes([codepoint]).decode('windows-1252')
+            except UnicodeDecodeError:
+                pass
+        if not data:
+            try:
+                data = chr(codepoint)
+            except (ValueError, OverflowError):
+                pass
+        self._data.append(data or '\N{REPLACEMENT CHARACTER}')
+
+    def handle_entityref(self, name):
+        self._data.append(_ENTITIES.get(name, '&' + name))
+
+    def handle_comment(self, data):
+        self._flush()
+        self._data.append(data)
+        self._flush('<!--', '-->')
+
+    def handle_decl(self, decl):
+        self._flush()
+        self._data.append(decl[len('DOCTYPE '):])
+        self._flush('<!DOCTYPE ', '>\n')
+
+    def unknown_decl(self, data):
+        self._flush()
+        if data.upper().startswith('CDATA['):
+            self._data.append(data[len('CDATA['):])
+            self._flush('<![CDATA[', ']]>', counted=True)
+        else:
+            self._data.append(data)
+            self._flush('<?', '?>')
+
+    def handle_pi(self, data):
+        self._flush()
+        self._data.append(data)
+        self._flush('<?', '>')
+
+    def _flush(self, prefix=None, suffix=None, counted=False):
+        if not self._data:
+            return
+        data = ''.join(self._data)
+        self._data = []
+        if not self._preserving and all(char in _ASCII_SPACES for char in data):
+            data = '\n' if '\n' in data else ' '
+
+        if prefix is None:
+            parent = self._stack[-1].name if self._stack else None
+            html = data if parent in _RAW_TEXT_PARENTS else data.translate(_ESCAPES)
+            counted = not self._containers
+        else:
+            html = prefix + data + suffix
+
+        text = data if counted else ''
+        self._tally.add(text)
+        self._append(_Text(html, text))
+
+    def _push(self, name, attrs):
+        self._flush()
+        values = {}
+        for key, value in attrs:
+            values[key] = '' if value is None else value
+
+        list_attributes = HTML_LIST_ATTRIBUTES['*'] + HTML_LIST_ATTRIBUTES.get(name, [])
+        parts = ['<', name]
+        for key in sorted(values):
+            value = values[key]
+            if key in list_attributes:
+                value = ' '.join(value.split())
+            parts.append(f' {key}={self._quote(value.translate(_ESCAPES))}')
+
+        self._stack.append(_Element(name, ''.join(parts)))
+        self._open[name] = self._open.get(name, 0) + 1
+        if name in _PRESERVE_WHITESPACE:
+            self._preserving += 1
+        if name in _UNCOUNTED_CONTAINERS:
+            self._containers += 1
+
+    def _pop_to(self, name):
+        self._flush()
+        if not self._open.get(name):
+            self.repaired = True
+            return
+        while self._pop().name != name:
+            self.repaired = True
+
+    def _pop(self) -> _Element:
+        element = self._stack.pop()
+        self._open[element.name] -= 1
+        if element.name in _PRESERVE_WHITESPACE:
+            self._preserving -= 1
+        if element.name in _UNCOUNTED_CONTAINERS:
+            self._containers -= 1
+        element.close()
+        self._append(element)
+        return element
+
+    def _append(self, node):
+        if self._stack:
+            self._stack[-1].children.append(node)
+        else:
+            self.nodes.append((node, self._tally))
+            self._tally = _WordTally()
+
+    @staticmethod
+    def _quote(value: str) -> str:
+        if '"' not in value:
+            return f'"{value}"'
+        if "'" not in value:
+            return f"'{value}'"
+        return '"%s"' % value.replace('"', '&quot;')
+
+
+def _iter_text(node) -> Iterator[str]:
+    if isinstance(node, _Text):
+        yield node.text
+    else:
+        for child in node.children:
+            yield from _iter_text(child)
+
+
+def _count_blocks(node) -> int:
+    if isinstance(node, _Text):
+        return 0
+    return (node.name in _BLOCK_ELEMENTS) + sum(_count_blocks(child) for child in node.children)
+
 
 class HtmlChunker:
     """
     A chunker specifically designed for HTML content that ensures each chunk contains valid HTML blocks.
+
+    The content is tokenized once with html.parser. Top-level nodes are grouped
+    as soon as they are complete and words are counted in the same pass, so
+    every chunk is balanced by construction and nothing is parsed twice.
     """
-    
+
     def __init__(self, max_chunk_size: int = MAX_CHUNK_SIZE):
         """
         Initialize the HTML chunker.
-        
+
         Args:
             max_chunk_size: Maximum size of each chunk in characters (default: MAX_CHUNK_SIZE for MySQL TEXT)
         """
         self.max_chunk_size = max_chunk_size
-        
+
     def split_into_chunks(self, content: str) -> List[Tuple[str, int]]:
         """
         Split HTML content into chunks while maintaining valid HTML structure.
-        
+
         Args:
             content: The HTML content to chunk
-            
+
         Returns:
             List of tuples containing (chunk_content, word_count)
         """
+        return list(self.iter_chunks(content))
+
+    def iter_chunks(self, content: str) -> Iterator[Tuple[str, int]]:
+        """Yield (chunk_content, word_count) tuples while the content is being parsed."""
         if not content or not content.strip():
-            return []
-            
-        # Clean and normalize HTML content
-        content = self._normalize_html_content(content)
-        
-        # Parse HTML content
-        soup = BeautifulSoup(content, BEAUTIFULSOUP_PARSER)
-        
-        # Get all top-level elements
-        elements = list(soup.children)
-        
-        # Group elements into chunks
-        chunks = self._create_html_chunks(elements)
-        
-        # Calculate word counts for each chunk and clean up
-        result = []
-        for chunk_html in chunks:
-            if chunk_html.strip():
-                word_count = count_words(self._extract_text_from_html(chunk_html))
-                result.append((chunk_html.strip(), word_count))
-                
-        return result
-    
+            return
+
+        group = []
+        size = 0
+        for node, tally in self._iter_nodes(self._normalize_html_content(content)):
+            node_size = len(node.html)
+            if size + node_size > self.max_chunk_size and group:
+                yield from self._finish_chunk(group)
+                group = []
+                size = 0
+            group.append((node, tally))
+            size += node_size
+
+        if group:
+            yield from self._finish_chunk(group)
+
     def _normalize_html_content(self, content: str) -> str:
         """Normalize HTML content for proper chunking."""
         # Remove excessive whitespace between tags but preserve single spaces and line breaks
         # that might be important for word separation
         content = re.sub(r'>\s*\n\s*<', '> <', content)  # Replace newlines between tags with single space
         content = re.sub(r'>\s{2,}<', '> <', content)  # Replace multiple spaces between tags with single space
-        
+
         # Normalize line breaks in text content
         content = re.sub(r'\n\s*\n\s*\n+', '\n\n', content)
-        
+
         # Remove empty paragraphs
         content = re.sub(r'<p[^>]*>\s*</p>', '', content)
-        
+
         return content.strip()
-    
-    def _create_html_chunks(self, elements: List) -> List[str]:
-        """Create chunks by grouping HTML elements."""
-        chunks = []
-        current_chunk_elements = []
-        current_size = 0
-        
-        for element in elements:
-            if isinstance(element, NavigableString):
-                # Include all NavigableString elements, even whitespace-only ones,
-                # as they may be important for word separation
-                element_html = str(element)
-                element_size = len(element_html)
-            else:
-                element_html = str(element)
-                element_size = len(element_html)
-            
-            # Check if adding this element would exceed the chunk size
-            if current_size + element_size > self.max_chunk_size and current_chunk_elements:
-                # Finalize current chunk
-                chunk_html = ''.join(str(elem) for elem in current_chunk_elements)
-                if chunk_html.strip():
-                    chunks.append(chunk_html)
-                
-                # Start new chunk
-                current_chunk_elements = [element]
-                current_size = element_size
-            else:
-                # Add element to current chunk
-                current_chunk_elements.append(element)
-                current_size += element_size
-        
-        # Add the final chunk if it has content
-        if current_chunk_elements:
-            chunk_html = ''.join(str(elem) for elem in current_chunk_elements)
-            if chunk_html.strip():
-                chunks.append(chunk_html)
-        
-        # Ensure chunks don't exceed max size by splitting large elements if necessary
-        final_chunks = []
-        for chunk in chunks:
-            if len(chunk) <= self.max_chunk_size:
-                final_chunks.append(chunk)
+
+    def _iter_nodes(self, content: str):
+        """Feed the content in slices and yield top-level nodes as they complete."""
+        parser = _HtmlNodeParser()
+        for start in range(0, len(content), HTML_CHUNKER_FEED_SIZE):
+            parser.feed(content[start:start + HTML_CHUNKER_FEED_SIZE])
+            yield from parser.drain()
+        parser.close()
+        yield from parser.drain()
+
+    def _finish_chunk(self, group) -> Iterator[Tuple[str, int]]:
+        """Turn a group of top-level nodes into one chunk, or several if a single node is too large."""
+        chunk_html = ''.join(node.html for node, _ in group)
+        if not chunk_html.strip():
+            return
+
+        if len(chunk_html) > self.max_chunk_size:
+            # Only a lone node can overflow a group
+            pieces = self._split_large_node(*group[0])
+        else:
+            tally = _WordTally()
+            for _, node_tally in group:
+                tally.extend(node_tally)
+            pieces = [(chunk_html, tally.count)]
+
+        for piece_html, word_count in pieces:
+            if piece_html.strip():
+                yield piece_html.strip(), word_count
+
+    def _split_large_node(self, node, tally) -> Iterator[Tuple[str, int]]:
+        """Split a top-level node that exceeds the maximum size."""
+        if _count_blocks(node) > 1:
+            # Split between children, re-opening the enclosing tags around each piece
+            yield from self._split_element(node, '', '')
+            return
+
+        # Fallback for very long single elements: wrap the text in simple paragraphs
+        text_content = ''.join(_iter_text(node))
+        if len(text_content) > self.max_chunk_size:
+            yield from self._split_words(text_content, self.max_chunk_size - HTML_TAG_OVERHEAD, '<p>', '</p>')
+        else:
+            # Mostly markup, keep it as is
+            yield node.html, tally.count
+
+    def _split_element(self, element, opening: str, closing: str) -> Iterator[Tuple[str, int]]:
+        opening += element.start_tag
+        closing = element.end_tag + closing
+        budget = self.max_chunk_size - len(opening) - len(closing)
+
+        group = []
+        size = 0
+        for child in element.children:
+            child_size = len(child.html)
+            if group and size + child_size > budget:
+                yield from self._wrap(group, opening, closing)
+                group = []
+                size = 0
+            if child_size > budget:
+                yield from self._split_child(child, opening, closing, budget)
             else:
-                # Split large chunks more aggressively
-                split_chunks = self._split_large_chunk(chunk)
-                final_chunks.extend(split_chunks)
-        
-        return final_chunks
-    
-    def _split_large_chunk(self, chunk_html: str) -> List[str]:
-        """Split a large HTML chunk that exceeds the maximum size."""
-        chunks = []
-        soup = BeautifulSoup(chunk_html, BEAUTIFULSOUP_PARSER)
-        
-        # Try to split by paragraphs first
-        paragraphs = soup.find_all(HTML_BLOCK_ELEMENTS)
-        
-        if paragraphs and len(paragraphs) > 1:
-            # Split by paragraphs
-            current_elements = []
-            current_size = 0
-            
-            for p in paragraphs:
-                p_html = str(p)
-                p_size = len(p_html)
-                
-                if current_size + p_size > self.max_chunk_size and current_elements:
-                    chunk = ''.join(current_elements)
-                    if chunk.strip():
-                        chunks.append(chunk)
-                    current_elements = [p_html]
-                    current_size = p_size
-                else:
-                    current_elements.append(p_html)
-                    current_size += p_size
-            
-            if current_elements:
-                chunk = ''.join(current_elements)
-                if chunk.strip():
-                    chunks.append(chunk)
+                group.append(child)
+                size += child_size
+
+        if group:
+            yield from self._wrap(group, opening, closing)
+
+    def _split_child(self, child, opening: str, closing: str, budget: int) -> Iterator[Tuple[str, int]]:
+        if isinstance(child, _Element) and child.children:
+            yield from self._split_element(child, opening, closing)
+        elif isinstance(child, _Text) and child.text:
+            yield from self._split_words(child.text, budget, opening, closing)
         else:
-            # If we can't split by paragraphs, split by text content more aggressively
-            # This is a fallback for very long single elements
-            text_content = soup.get_text()
-            if len(text_content) > self.max_chunk_size:
-                # Split the text and wrap in simple paragraphs
-                words = text_content.split()
-                current_words = []
-                current_size = 0
-                
-                for word in words:
-                    word_size = len(word) + 1  # +1 for space
-                    
-                    if current_size + word_size > self.max_chunk_size - HTML_TAG_OVERHEAD and current_words:  # Buffer for HTML tags
-                        chunk_text = ' '.join(current_words)
-                        chunks.append(f'<p>{chunk_text}</p>')
-                        current_words = [word]
-                        current_size = word_size
-                    else:
-                        current_words.append(word)
-                        current_size += word_size
-                
-                if current_words:
-                    chunk_text = ' '.join(current_words)
-                    chunks.append(f'<p>{chunk_text}</p>')
+            yield from self._wrap([child], opening, closing)
+
+    def _split_words(self, text: str, budget: int, opening: str, closing: str) -> Iterator[Tuple[str, int]]:
+        current_words = []
+        current_size = 0
+        for word in text.split():
+            word_size = len(word) + 1  # +1 for space
+            if current_size + word_size > budget and current_words:
+                yield opening + ' '.join(current_words).translate(_ESCAPES) + closing, len(current_words)
+                current_words = [word]
+                current_size = word_size
             else:
-                # Chunk is not too long after all, keep it as is
-                chunks.append(chunk_html)
-        
-        return chunks
-    
-    def _extract_text_from_html(self, html: str) -> str:
-        """Extract plain text from HTML for word counting."""
-        soup = BeautifulSoup(html, BEAUTIFULSOUP_PARSER)
-        return soup.get_text()
-    
+                current_words.append(word)
+                current_size += word_size
+
+        if current_words:
+            yield opening + ' '.join(current_words).translate(_ESCAPES) + closing, len(current_words)
+
+    def _wrap(self, nodes, opening: str, closing: str) -> Iterator[Tuple[str, int]]:
+        if not any(node.html.strip() for node in nodes):
+            return
+        tally = _WordTally()
+        for node in nodes:
+            for text in _iter_text(node):
+                tally.add(text)
+        yield opening + ''.join(node.html for node in nodes) + closing, tally.count
+
     def validate_html_chunk(self, chunk_html: str) -> bool:
-        """Validate that a chunk contains valid HTML."""
-        try:
-            soup = BeautifulSoup(chunk_html, BEAUTIFULSOUP_PARSER)
-            # Check if parsing was successful and no malformed tags
-            return bool(soup)
-        except Exception:
-            return False
+        """Check that every element in a chunk is explicitly closed."""
+        parser = _HtmlNodeParser()
+        parser.feed(chunk_html)
+        parser.close()
+        return not parser.repaired
@@ -0,0 +1,364 @@
+"""
+Bulk import of novels, volumes and chapters.
+
+A source is a JSON-lines file with one novel per line, or a directory of
+such files and of novel bundles. A bundle is a directory holding a
+novel.json manifest whose chapters name content files instead of
+carrying their content inline, EPUB style. A novel record looks like::
+
+    {"name": "...", "slug": "optional", "summary": "...", "author": "...",
+     "artist": "...", "tags": ["Fantasy"], "progress_status": "o",
+     "approval_status": "approved", "other_names": "...", "image_url": "...",
+     "volumes": [{"name": "Tap 1", "chapters": [
+         {"title": "...", "content": "<p>...</p>", "approved": true},
+         {"title": "...", "file": "tap-1/chuong-2.html"}]}]}
+
+prepare_record chunks the chapters of one record and only needs the
+chunker, so it runs in worker processes; NovelImporter writes the
+prepared records with bulk_create.
+"""
+import json
+import math
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple
+
+from django.db import connection, transaction
+from django.utils.text import slugify
+
+from constants import (
+    MAX_NAME_LENGTH,
+    MAX_SLUG_LENGTH,
+    CHUNK_BULK_BATCH_SIZE,
+    IMPORT_PREFETCH_PER_WORKER,
+    WORDS_PER_MINUTE,
+    ApprovalStatus,
+    ProgressStatus,
+)
+from .content_codec import hash_content, storage_payload
+from .html_chunker import HtmlChunker
+
+BUNDLE_MANIFEST = 'novel.json'
+POINTER_FIELDS = ['latest_public_chapter', 'latest_public_chapter_at']
+
+
+def iter_import_records(source) -> Iterator[Tuple[str, dict, str]]:
+    """Yield (checkpoint key, record, content root) for every novel in ``source``"""
+    path = Path(source)
+    if path.is_file():
+        yield from _iter_jsonl(path)
+        return
+
+    for entry in sorted(path.iterdir()):
+        if entry.is_file() and entry.suffix == '.jsonl':
+            yield from _iter_jsonl(entry)
+        elif (entry / BUNDLE_MANIFEST).is_file():
+            record = json.loads((entry / BUNDLE_MANIFEST).read_text(encoding='utf-8'))
+            yield entry.name, record, str(entry)
+
+
+def _iter_jsonl(path: Path):
+    with path.open(encoding='utf-8') as lines:
+        for line_number, line in enumerate(lines, 1):
+            if line.strip():
+                yield f'{path.name}:{line_number}', json.loads(line), str(path.parent)
+
+
+def prepare_record(key: str, record: dict, root: str, max_chunk_size: int, compress: bool):
+    """
+    Chunk every chapter of a record.
+
+    Content is replaced by (content, word_count, content_hash, payload)
+    chunk tuples, where payload is the compressed form when compression
+    applies. Runs in worker processes, so it must not touch the database.
+    """
+    chunker = HtmlChunker(max_chunk_size=max_chunk_size)
+    for volume in record.get('volumes', []):
+        for chapter in volume.get('chapters', []):
+            content = chapter.pop('content', None)
+            file_name = chapter.pop('file', None)
+            if content is None and file_name:
+                content = Path(root, file_name).read_text(encoding='utf-8')
+
+            chapter['chunks'] = [
+                (chunk, word_count, hash_content(chunk), storage_payload(chunk, compress))
+                for chunk, word_count in chunker.split_into_chunks(content or '')
+            ]
+            chapter['word_count'] = sum(chunk[1] for chunk in chapter['chunks'])
+    return key, record
+
+
+def prepare_records(records: Iterable[Tuple[str, dict, str]], workers: int, max_chunk_size: int, compress: bool):
+    """
+    Yield prepared records in source order.
+
+    With ``workers`` > 0 chunking runs in a process pool, keeping a few
+    records per worker in flight so the source is never read ahead in full.
+    """
+    if workers <= 0:
+        for key, record, root in records:
+            yield prepare_record(key, record, root, max_chunk_size, compress)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for key, record, root in records:
+            pending.append(pool.submit(prepare_record, key, record, root, max_chunk_size, compress))
+            if len(pending) >= workers * IMPORT_PREFETCH_PER_WORKER:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def count_chunks(record: dict) -> int:
+    return sum(
+        len(chapter['chunks'])
+        for volume in record.get('volumes', [])
+        for chapter in volume.get('chapters', [])
+    )
+
+
+class NovelImporter:
+    """
+    Write prepared records in batches, one transaction per batch.
+
+    Slugs and positions are allocated in memory against the slugs that
+    already exist, so rows go straight to bulk_create without the per-row
+    lookups the model save() methods do.
+    """
+
+    def __init__(self, approve: bool = False, created_by=None):
+        self.approve = approve
+        self.created_by = created_by
+        self.counts = Counter()
+        self._novel_slugs = None
+        self._chapter_slugs = None
+        self._slug_counters = {}
+        self._people = {}
+        self._tags = None
+
+    @property
+    def rows_written(self) -> int:
+        return sum(self.counts[name] for name in ('novels', 'volumes', 'chapters', 'chunks'))
+
+    def write_batch(self, records: List[dict]):
+        from novels.models import Novel, Volume, Chapter, Chunk, Author, Artist
+
+        self._load_existing()
+        with transaction.atomic():
+            authors = self._resolve_people(Author, records, 'author')
+            artists = self._resolve_people(Artist, records, 'artist')
+
+            novels = []
+            for record in records:
+                slug = self._novel_slug(record)
+                if slug is None:
+                    # Records that carry a slug which already exists were imported before
+                    self.counts['skipped'] += 1
+                    continue
+                novels.append((self._build_novel(Novel, record, slug, authors, artists), record))
+            if not novels:
+                return
+
+            Novel.objects.bulk_create([novel for novel, _ in novels], batch_size=CHUNK_BULK_BATCH_SIZE)
+            self._fill_ids([novel for novel, _ in novels], Novel.objects.all(), ['slug'])
+            self._add_tags(Novel, novels)
+
+            volumes = [
+                (Volume(novel=novel, name=name, position=position), volume)
+                for novel, record in novels
+                for position, name, volume in self._volumes(record)
+            ]
+            Volume.objects.bulk_create([volume for volume, _ in volumes], batch_size=CHUNK_BULK_BATCH_SIZE)
+            self._fill_ids(
+                [volume for volume, _ in volumes],
+                Volume.objects.filter(novel_id__in=[novel.id for novel, _ in novels]),
+                ['novel_id', 'position']
+            )
+
+            chapters = [
+                (self._build_chapter(Chapter, volume, position, chapter), chapter)
+                for volume, volume_record in volumes
+                for position, chapter in enumerate(volume_record.get('chapters', []), 1)
+            ]
+            Chapter.objects.bulk_create([chapter for chapter, _ in chapters], batch_size=CHUNK_BULK_BATCH_SIZE)
+            self._fill_ids([chapter for chapter, _ in chapters], Chapter.objects.all(), ['slug'])
+
+            chunks = [
+                Chunk(
+                    chapter=chapter,
+                    position=position,
+                    content=content,
+                    content_hash=content_hash,
+                    content_data=payload,
+                    word_count=word_count
+                )
+                for chapter, chapter_record in chapters
+                for position, (content, word_count, content_hash, payload) in enumerate(chapter_record['chunks'], 1)
+            ]
+            Chunk.objects.bulk_create(chunks, batch_size=CHUNK_BULK_BATCH_SIZE)
+
+            self._set_latest_pointers(Novel, Volume, novels, volumes, chapters)
+
+        self.counts.update(novels=len(novels), volumes=len(volumes), chapters=len(chapters), chunks=len(chunks))
+
+    def _load_existing(self):
+        from novels.models import Novel, Chapter
+
+        if self._novel_slugs is None:
+            self._novel_slugs = set(Novel.objects.values_list('slug', flat=True).iterator())
+            self._chapter_slugs = set(Chapter.objects.values_list('slug', flat=True).iterator())
+
+    def _novel_slug(self, record):
+        if record.get('slug'):
+            if record['slug'] in self._novel_slugs:
+                return None
+            self._novel_slugs.add(record['slug'])
+            return record['slug']
+
+        # Same fallbacks as Novel.save()
+        name = (record.get('name') or '').strip()
+        base = (slugify(name) if name else 'untitled-novel') or 'novel'
+        return self._allocate(self._novel_slugs, base, MAX_NAME_LENGTH)
+
+    def _chapter_slug(self, volume, position, title):
+        # Same shape as Chapter.save(): volume slug, then chapter slug
+        volume_slug = slugify(volume.name) if volume.name else f'tap-{volume.position}'
+        chapter_slug = slugify(title.strip()) if title and title.strip() else f'chuong-{position}'
+        base = f'{volume_slug}-{chapter_slug}' if chapter_slug else f'{volume_slug}-chuong-{position}'
+        return self._allocate(self._chapter_slugs, base, MAX_SLUG_LENGTH)
+
+    def _allocate(self, taken, base, max_length):
+        """Claim ``base`` or the first free ``base-N``, remembering N per base"""
+        base = base[:max_length - 8].rstrip('-')
+        slug = base
+        counter = self._slug_counters.get((id(taken), base), 1)
+        while slug in taken:
+            slug = f'{base}-{counter}'
+            counter += 1
+        self._slug_counters[(id(taken), base)] = counter
+        taken.add(slug)
+        return slug
+
+    def _resolve_people(self, model, records, field):
+        """Map author or artist names to ids, creating the missing ones"""
+        known = self._people.setdefault(model, {})
+        names = {record[field].strip() for record in records if (record.get(field) or '').strip()}
+        missing = names - known.keys()
+        if missing:
+            model.objects.bulk_create([model(name=name) for name in missing], ignore_conflicts=True)
+            known.update(model.objects.filter(name__in=missing).values_list('name', 'id'))
+        return known
+
+    def _tag_ids(self):
+        from novels.models import Tag
+
+        if self._tags is None:
+            self._tags = {name.lower(): tag_id for name, tag_id in Tag.objects.values_list('name', 'id')}
+        return self._tags
+
+    def _build_novel(self, model, record, slug, authors, artists):
+        public_words = sum(
+            chapter['word_count']
+            for volume in record.get('volumes', [])
+            for chapter in volume.get('chapters', [])
+            if self._is_public(chapter)
+        )
+        default_status = ApprovalStatus.APPROVED.value if self.approve else ApprovalStatus.DRAFT.value
+        return model(
+            name=(record.get('name') or '').strip() or 'Untitled Novel',
+            slug=slug,
+            summary=(record.get('summary') or '').strip() or 'No summary available',
+            author_id=authors.get((record.get('author') or '').strip()),
+            artist_id=artists.get((record.get('artist') or '').strip()),
+            image_url=record.get('image_url'),
+            other_names=record.get('other_names'),
+            progress_status=record.get('progress_status') or ProgressStatus.ONGOING.value,
+            approval_status=record.get('approval_status') or default_status,
+            word_count=public_words,
+            reading_minutes=math.ceil(public_words / WORDS_PER_MINUTE),
+            created_by=self.created_by,
+        )
+
+    def _add_tags(self, model, novels):
+        tags = self._tag_ids()
+        links = []
+        for novel, record in novels:
+            tag_ids = set()
+            for name in record.get('tags', []):
+                tag_id = tags.get(name.strip().lower())
+                if tag_id is None:
+                    self.counts['unknown_tags'] += 1
+                else:
+                    tag_ids.add(tag_id)
+            links.extend(model.tags.through(novel_id=novel.id, tag_id=tag_id) for tag_id in tag_ids)
+        model.tags.through.objects.bulk_create(links, batch_size=CHUNK_BULK_BATCH_SIZE)
+
+    @staticmethod
+    def _volumes(record):
+        """(position, unique name, volume record) for each volume of a record"""
+        used = set()
+        for position, volume in enumerate(record.get('volumes', []), 1):
+            name = (volume.get('name') or '').strip() or f'Tập {position}'
+            unique_name, copy = name, 2
+            while unique_name in used:
+                unique_name = f'{name} ({copy})'
+                copy += 1
+            used.add(unique_name)
+            yield position, unique_name, volume
+
+    def _build_chapter(self, model, volume, position, chapter):
+        title = (chapter.get('title') or '').strip() or f'Chương {position}'
+        return model(
+            volume=volume,
+            title=title,
+            slug=self._chapter_slug(volume, position, chapter.get('title')),
+            position=position,
+            word_count=chapter['word_count'],
+            approved=chapter.get('approved', self.approve),
+            is_hidden=chapter.get('is_hidden', False),
+        )
+
+    def _is_public(self, chapter):
+        return chapter.get('approved', self.approve) and not chapter.get('is_hidden', False)
+
+    def _set_latest_pointers(self, novel_model, volume_model, novels, volumes, chapters):
+        """Point volumes and novels at their newest public chapter, as ChapterService does"""
+        latest_by_volume = {}
+        for chapter, chapter_record in chapters:
+            if self._is_public(chapter_record):
+                latest_by_volume[chapter.volume_id] = chapter
+
+        dirty_volumes = []
+        latest_by_novel = {}
+        for volume, _ in volumes:
+            latest = latest_by_volume.get(volume.id)
+            if latest:
+                volume.latest_public_chapter = latest
+                volume.latest_public_chapter_at = latest.updated_at
+                dirty_volumes.append(volume)
+                latest_by_novel[volume.novel_id] = latest
+
+        dirty_novels = []
+        for novel, _ in novels:
+            latest = latest_by_novel.get(novel.id)
+            if latest:
+                novel.latest_public_chapter = latest
+                novel.latest_public_chapter_at = latest.updated_at
+                dirty_novels.append(novel)
+
+        volume_model.objects.bulk_update(dirty_volumes, POINTER_FIELDS, batch_size=CHUNK_BULK_BATCH_SIZE)
+        novel_model.objects.bulk_update(dirty_novels, POINTER_FIELDS, batch_size=CHUNK_BULK_BATCH_SIZE)
+
+    @staticmethod
+    def _fill_ids(objs, queryset, fields):
+        """Backends that cannot return ids from bulk_create look them up by natural key"""
+        if not objs or connection.features.can_return_rows_from_bulk_insert:
+            return
+        keys = [tuple(getattr(obj, field) for field in fields) for obj in objs]
+        if fields == ['slug']:
+            queryset = queryset.filter(slug__in=[key[0] for key in keys])
+        ids = {tuple(row[:-1]): row[-1] for row in queryset.values_list(*fields, 'id')}
+        for obj, key in zip(objs, keys):
+            obj.id = ids[key]
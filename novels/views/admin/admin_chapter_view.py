@@ -1,5 +1,7 @@
-from django.shortcuts import redirect, render
+from django.shortcuts import redirect, render, get_object_or_404
 from django.contrib import messages
+from django.db import transaction
+from django.http import JsonResponse
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators.http import require_POST
 from django.urls import reverse
@@ -7,6 +9,7 @@ from sympy import Q
 from common.decorators import website_admin_required
 from novels.models.chapter import Chapter
 from novels.services import ChapterService
+from interactions.services import NotificationFanoutService
 from django.core.paginator import Paginator
 from constants import (
     PAGINATOR_COMMON_LIST,
@@ -16,7 +19,6 @@ from constants import (
     DEFAULT_PAGE_NUMBER,
     DATE_FORMAT_DMY,
 )
-from novels.views.public.chapter_view import notify_favorites_chapter_approved
 
 @website_admin_required
 def request_chapter_admin(request):
@@ -79,13 +81,36 @@ def approve_chapter_view(request, chapter_slug):
     
     was_approved = chapter.approved
     
-    ChapterService.approve_chapter(chapter)
-    if not was_approved and chapter.approved:
-        notify_favorites_chapter_approved(chapter)
+    fanout = None
+    with transaction.atomic():
+        ChapterService.approve_chapter(chapter)
+        if not was_approved and chapter.approved:
+            # Followers are notified in the background once this commits
+            fanout = NotificationFanoutService.enqueue(chapter)
 
     messages.success(request, _('Chương "%(title)s" đã được duyệt thành công!') % {'title': chapter.title})
+    if fanout and fanout.total:
+        messages.info(
+            request,
+            _('Đang gửi thông báo tới %(count)d người theo dõi.') % {'count': fanout.total}
+        )
     return redirect('admin:chapter_review', chapter_slug=chapter.slug)
 
+@website_admin_required
+def chapter_notification_progress(request, chapter_slug):
+    chapter = get_object_or_404(Chapter, slug=chapter_slug)
+    fanout = NotificationFanoutService.latest_for_chapter(chapter)
+    if not fanout:
+        return JsonResponse({'status': None})
+    return JsonResponse({
+        'status': fanout.status,
+        'status_display': fanout.get_status_display(),
+        'sent': fanout.sent,
+        'total': fanout.total,
+        'percent': fanout.percent,
+        'active': fanout.is_active,
+    })
+
 @require_POST
 @website_admin_required
 def reject_chapter_view(request, chapter_slug):
@@ -121,6 +146,7 @@ def chapter_review(request, chapter_slug):
     context = ChapterService.get_chapter_review_context(chapter)
     
     context.update({
+        'notification_fanout': NotificationFanoutService.latest_for_chapter(chapter),
         'DATE_FORMAT_DMYHI': DATE_FORMAT_DMYHI,
         'APPROVED': ApprovalStatus.APPROVED.value,
         'REJECTED': ApprovalStatus.REJECTED.value,
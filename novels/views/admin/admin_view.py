@@ -1,13 +1,18 @@
 from django.shortcuts import render
+from django.utils import timezone
 from novels.models import Chapter, Novel
+from novels.services import DailyStatsService
+from novels.services.daily_stats_service import STAT_FIELDS
 from django.utils.translation import gettext as _
 from accounts.models import User
 from constants import (
     ApprovalStatus,
     UserRole,
+    DASHBOARD_CHART_DAYS,
+    DASHBOARD_TOP_LIMIT,
 )
 from common.decorators import website_admin_required
-from novels.fake_data import getNewNovels, top_novels_this_month, new_novels,authors
+from common.utils.sse import sse_manager
 
 @website_admin_required
 def Admin(request):
@@ -29,11 +34,18 @@ def Admin(request):
 
 @website_admin_required
 def Dashboard(request):
-    labels, data = getNewNovels()
+    today = timezone.localdate()
+    month_start = today.replace(day=1)
+    series = DailyStatsService.daily_series(DASHBOARD_CHART_DAYS, today)
+    chart_data = {
+        'labels': [day.strftime("%d/%m") for day in series['dates']],
+        **{field: series[field] for field in STAT_FIELDS},
+    }
+    new_novels = Novel.objects.filter(deleted_at__isnull=True).only('name', 'created_at').order_by('-created_at')
     return render(request, 'admin/pages/dashboard_admin.html', {
-        'labels': labels,
-        'data': data,
-        'top_novels': top_novels_this_month,
-        'new_novels': new_novels,
-        'top_authors': authors,
+        'chart_data': chart_data,
+        'top_novels': DailyStatsService.top_novels(month_start, DASHBOARD_TOP_LIMIT),
+        'new_novels': new_novels[:DASHBOARD_TOP_LIMIT],
+        'top_authors': DailyStatsService.top_authors(month_start, DASHBOARD_TOP_LIMIT),
+        'sse_stats': sse_manager.shared_stats(),
     })
@@ -1,97 +1,111 @@
 import json
-import logging
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_http_methods
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 from django.contrib import messages
 from django.utils.translation import gettext_lazy as _
-from django.utils import timezone
-from django.contrib.contenttypes.models import ContentType
-from common.utils.sse import send_notification_to_user
-from interactions.models.notification import Notification
 from novels.models import Novel, Chapter
-from novels.models.reading_favorite import Favorite
 from novels.models.volume import Volume
-from django.urls import reverse
-from asgiref.sync import async_to_sync
-from novels.services import ChapterService, ReadingService
+from novels.services import (
+    ChapterService, ReadingService, ChapterReadingBundle, ChapterContentCache, ViewCountService
+)
 from novels.forms import ChapterForm
 from constants import (
-    MAX_LIMIT_CHUNKS, START_POSITION_DEFAULT, PROGRESS_DEFAULT,
+    MAX_LIMIT_CHUNKS, MAX_CHUNK_RANGE_LIMIT, CHUNK_STREAM_THRESHOLD,
+    START_POSITION_DEFAULT, PROGRESS_DEFAULT,
     DATE_FORMAT_DMY, ApprovalStatus
 )
 from common.decorators import require_active_novel
 
+def set_validator_headers(response, etag, last_modified):
+    """Attach ETag/Last-Modified and make caches revalidate before reuse"""
+    response.headers['ETag'] = etag
+    response.headers['Last-Modified'] = http_date(last_modified.timestamp())
+    patch_cache_control(response, no_cache=True)
+    return response
+
 @require_active_novel
 def chapter_detail_view(request, novel_slug, chapter_slug):
     """Chapter detail view with lazy loading"""
-    chapter = ChapterService.get_chapter_for_user(chapter_slug, novel_slug, request.user)
-    
-    initial_chunks = chapter.chunks.filter(
-        position__lte=MAX_LIMIT_CHUNKS
-    ).order_by('position')
-    
-    # Get navigation
-    navigation = ChapterService.get_chapter_navigation(chapter)
-    
-    # Get reading history
-    reading_history = ReadingService.get_or_create_reading_history(request.user, chapter)
-    
-    # Get all chapters for sidebar
-    all_chapters = ChapterService.get_all_chapters_for_novel(chapter.volume.novel, request.user)
-    
-    # Get chunk statistics
-    chunk_stats = ChapterService.get_chapter_chunks_stats(chapter)
-    
-    context = {
-        "chapter": chapter,
-        "chunks": initial_chunks,
-        "novel": chapter.volume.novel,
-        "volume": chapter.volume,
-        "next_chapter": navigation['next_chapter'],
-        "prev_chapter": navigation['prev_chapter'],
-        "reading_history": reading_history,
-        "all_chapters": all_chapters,
-        "total_chunks": chunk_stats['total_chunks'],
-        "loaded_chunks": initial_chunks.count(),
-        "all_chunks_for_stats": chunk_stats['all_chunks'],
-        "avg_chunk_size": chunk_stats['avg_chunk_size'],
-        "max_chunk_words": chunk_stats['max_chunk_words'],
-        "estimated_reading_time": chunk_stats['estimated_reading_time'],
-        "DATE_FORMAT_DMY": DATE_FORMAT_DMY
-    }
-    return render(request, "novels/pages/chapter_details.html", context)
+    novel = request.novel
+    chapter = ChapterReadingBundle.get_chapter(novel, chapter_slug, request.user)
+
+    # Signed-in pages carry per-user state (notifications, reading history)
+    # with no cheap validator, so only anonymous pages are revalidated
+    validators = None
+    if not request.user.is_authenticated:
+        validators = ChapterReadingBundle.get_validators(novel, chapter)
+        etag, last_modified = validators
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=int(last_modified.timestamp())
+        )
+        if not_modified is not None:
+            return set_validator_headers(not_modified, etag, last_modified)
+
+    # A 304 is a revalidation of a page the viewer already has, not a new view
+    ViewCountService.record_view(request, novel, chapter)
+    context = ChapterReadingBundle.build_for_chapter(novel, chapter, request.user)
+    context["DATE_FORMAT_DMY"] = DATE_FORMAT_DMY
+    response = render(request, "novels/pages/chapter_details.html", context)
+    if validators:
+        set_validator_headers(response, *validators)
+    return response
+
+def parse_chunk_window(request, default_limit=MAX_LIMIT_CHUNKS):
+    """Read ?start=&limit=, falling back to defaults and capping the limit"""
+    try:
+        start = max(int(request.GET.get('start', START_POSITION_DEFAULT)), START_POSITION_DEFAULT)
+    except ValueError:
+        start = START_POSITION_DEFAULT
+    try:
+        limit = int(request.GET.get('limit', default_limit))
+    except ValueError:
+        limit = default_limit
+    return start, min(max(limit, 1), MAX_CHUNK_RANGE_LIMIT)
+
+def stream_chunk_window(window):
+    """One NDJSON line per chunk, then a line with the paging info"""
+    for chunk in window['chunks']:
+        yield json.dumps(chunk) + '\n'
+    yield json.dumps({
+        'has_more': window['has_more'],
+        'next_start': window['next_start'],
+        'total_chunks': window['total_chunks'],
+    }) + '\n'
+
+def chunk_window_response(request, chapter_id, allow_stream=False):
+    chapter = ChapterService.get_readable_chapter(chapter_id, request.user)
+    start, limit = parse_chunk_window(request)
+
+    etag = ChapterContentCache.etag(chapter, start, limit)
+    not_modified = get_conditional_response(
+        request, etag=etag, last_modified=int(chapter.updated_at.timestamp())
+    )
+    if not_modified is not None:
+        return set_validator_headers(not_modified, etag, chapter.updated_at)
+
+    window = ChapterContentCache.get_window(chapter, start, limit)
+    wants_ndjson = 'application/x-ndjson' in request.headers.get('Accept', '')
+    if allow_stream and (wants_ndjson or limit > CHUNK_STREAM_THRESHOLD):
+        response = StreamingHttpResponse(
+            stream_chunk_window(window), content_type='application/x-ndjson'
+        )
+    else:
+        response = JsonResponse(window)
+    return set_validator_headers(response, etag, chapter.updated_at)
 
 @require_http_methods(["GET"])
 def load_more_chunks(request, chapter_id):
     """AJAX endpoint to load more chunks"""
-    chapter = get_object_or_404(Chapter, id=chapter_id)
-    start_position = int(request.GET.get('start', START_POSITION_DEFAULT))
-    limit = int(request.GET.get('limit', MAX_LIMIT_CHUNKS))
-    
-    chunks = chapter.chunks.filter(
-        position__gte=start_position,
-        position__lt=start_position + limit
-    ).order_by('position')
-    
-    chunks_data = []
-    for chunk in chunks:
-        chunks_data.append({
-            'position': chunk.position,
-            'content': chunk.content,
-            'word_count': chunk.word_count,
-        })
-    
-    has_more = chapter.chunks.filter(
-        position__gte=start_position + limit
-    ).exists()
-    
-    return JsonResponse({
-        'chunks': chunks_data,
-        'has_more': has_more,
-        'next_start': start_position + limit
-    })
+    return chunk_window_response(request, chapter_id)
+
+@require_http_methods(["GET"])
+def load_chunk_range(request, chapter_id):
+    """Chunk window endpoint; large windows are streamed as NDJSON"""
+    return chunk_window_response(request, chapter_id, allow_stream=True)
 
 @login_required
 @require_http_methods(["POST"])
@@ -170,8 +184,7 @@ def chapter_delete_view(request, novel_slug, chapter_slug):
         return redirect('novels:novel_detail', novel_slug=novel_slug)
     
     # Perform soft delete
-    chapter.deleted_at = timezone.now()
-    chapter.save(update_fields=['deleted_at'])
+    ChapterService.soft_delete_chapter(chapter)
     
     messages.success(request, _("Chapter đã được xóa thành công."))
     return redirect('novels:novel_detail', novel_slug=novel_slug)
@@ -179,40 +192,3 @@ def chapter_delete_view(request, novel_slug, chapter_slug):
 def chapter_upload_rules(request):
     """Static page showing chapter upload rules"""
     return render(request, 'novels/pages/chapter_upload_rules.html')
-
-logger = logging.getLogger(__name__)
-
-def notify_favorites_chapter_approved(chapter):
-    try:
-        novel = chapter.volume.novel
-        favorites_qs = Favorite.objects.filter(novel=novel).select_related("user")
-        content_type = ContentType.objects.get_for_model(chapter)
-
-        for fav in favorites_qs:
-            user = fav.user
-            notification = Notification.objects.create(
-                user=user,
-                type="NEW_CHAPTER",
-                title=_("Truyện '%(novel_name)s' có chương mới") % {"novel_name": novel.name},
-                content=_("Chương '%(chapter_title)s' vừa được duyệt và hiển thị.") % {"chapter_title": chapter.title},
-                content_type=content_type,
-                object_id=chapter.id,
-            )
-
-            redirect_url = reverse(
-                "novels:chapter_detail",
-                kwargs={"novel_slug": novel.slug, "chapter_slug": chapter.slug},
-            )
-
-            try:
-                async_to_sync(send_notification_to_user)(
-                    user_id=user.id,
-                    notification=notification,
-                    redirect_url=redirect_url,
-                )
-            except Exception as e:
-                logger.exception("Lỗi khi gửi SSE cho user %s: %s", user.id, e)
-
-    except Exception as e:
-        logger.exception("Lỗi khi tạo notification: %s", e)
-
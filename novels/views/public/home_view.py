@@ -1,60 +1,37 @@
 from django.shortcuts import render
-from novels.services import NovelService
-from novels.utils import format_comments_for_template
-from interactions.models import Comment
+from novels.services import NovelService, HomepageService
 from django.core.paginator import Paginator
-from django.shortcuts import render
+from common.utils import KeysetPaginator
 
 from constants import (
-    ApprovalStatus,
-    MAX_HOME_COMMENTS,
     MAX_MOST_READ_NOVELS,
     MAX_NEW_NOVELS,
     MAX_NEW_NOVELS_ROW,
-    MAX_FINISH_NOVELS
 )
 from ...fake_data import discussion_data, card_list
 
 def Home(request):
     """Homepage view with all novel listings"""
-    # Get novels using service
-    trend_novels = NovelService.get_trend_novels()
-    new_novels = NovelService.get_new_novels()
-    like_novels = NovelService.get_like_novels()
-    finish_novels = NovelService.get_finished_novels_with_chapters()[:MAX_FINISH_NOVELS]
-    newupdate_novels = NovelService.get_recent_volumes_for_cards()
-    
-    # Get recent comments
-    comments = Comment.objects.select_related('user', 'novel', 'user__profile').filter(
-        novel__approval_status=ApprovalStatus.APPROVED.value,
-        novel__deleted_at__isnull=True,
-        is_reported=False
-    ).exclude(
-        user__isnull=True
-    ).order_by('-created_at')[:MAX_HOME_COMMENTS]
-    
-    comments_data = format_comments_for_template(comments)
-    
+    snapshot = HomepageService.get_snapshot()
+
     context = {
-        "finish_novels": finish_novels,
-        "trend_novels": trend_novels,
-        "new_novels": new_novels,
+        "finish_novels": snapshot['finish_novels'],
+        "trend_novels": snapshot['trend_novels'],
+        "new_novels": snapshot['new_novels'],
         "discussion_data": discussion_data,
-        "comments": comments_data,
-        "newupdate_novels": newupdate_novels,
+        "comments": snapshot['comments'],
+        "newupdate_novels": snapshot['newupdate_novels'],
         "card_list": card_list,
-        "like_novels": like_novels,
+        "like_novels": snapshot['like_novels'],
     }
 
     return render(request, 'novels/pages/home.html', context)
 
 def most_read_novels(request):
-    novels = NovelService.get_approved_novels().order_by('-view_count')
+    novels = NovelService.get_approved_novels()
 
-    paginator = Paginator(novels, MAX_MOST_READ_NOVELS)  
-
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    paginator = KeysetPaginator(novels, ('-view_count', '-id'), MAX_MOST_READ_NOVELS)
+    page_obj = paginator.get_page(request.GET.get('cursor'))
 
     context = {
         'page_obj': page_obj,
@@ -78,12 +55,11 @@ def new_novels(request):
 
 def finish_novels(request):
     """Finished novels page"""
-    finish_novels = NovelService.get_finished_novels_with_chapters()
-    paginator = Paginator(finish_novels, MAX_NEW_NOVELS_ROW)  
-    
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-    context = {'finish_novels': finish_novels,
+    finish_novels = NovelService.get_finished_novels()
+    paginator = KeysetPaginator(finish_novels, ('-updated_at', '-id'), MAX_NEW_NOVELS_ROW)
+    page_obj = paginator.get_page(request.GET.get('cursor'))
+    page_obj.object_list = NovelService.attach_recent_chapters(page_obj.object_list)
+    context = {'finish_novels': page_obj.object_list,
                'page_obj': page_obj
                }
     return render(request, 'novels/pages/finish_novels.html', context)
@@ -9,7 +9,7 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from novels.models import Novel, Tag, novel
 from novels.models.reading_favorite import Favorite
-from novels.services import NovelService
+from novels.services import NovelService, ViewCountService, NovelRatingService
 from novels.forms import NovelForm
 from django.core.paginator import Paginator
 from interactions.services import ReviewService
@@ -19,15 +19,21 @@ from constants import (
     MAX_TRUNCATED_REJECTED_REASON_LENGTH, PAGINATION_PAGE_RANGE,
     SUMMARY_TRUNCATE_WORDS, DEFAULT_RATING_AVERAGE, MIN_RATE, MAX_RATE,
     MAX_LENGTH_REVIEW_CONTENT, NOVEL_PER_PAGE, DEFAULT_PAGE_NUMBER,
-    NotificationTypeChoices, UserRole
+    NotificationTypeChoices, UserRole, KEYSET_COUNT_LIMIT
 )
 from common.decorators import require_active_novel
+from common.utils import KeysetPaginator
 from novels.services.novel_service import FavoriteService, get_liked_novels
 from interactions.services.notification_service import NotificationService
 from common.utils import send_notification_to_user
 from asgiref.sync import async_to_sync
 from accounts.models.user import User
 
+SEARCH_SORT_ORDERINGS = {
+    'updated': ('-updated_at', '-id'),
+    'rating': ('-rating_avg', '-id'),
+}
+
 @require_active_novel
 def novel_detail(request, novel_slug):
     """Novel detail page using service"""
@@ -36,6 +42,7 @@ def novel_detail(request, novel_slug):
     if not novel_data:
         return redirect("novels:home")
     novel = get_object_or_404(Novel, slug=novel_slug)
+    ViewCountService.record_view(request, novel)
     is_favorited = False
     if request.user.is_authenticated:
         is_favorited = Favorite.objects.filter(user=request.user, novel=novel).exists()
@@ -57,6 +64,7 @@ def novel_detail(request, novel_slug):
         'MAX_CHAPTER_LIST': MAX_CHAPTER_LIST,
         'MAX_CHAPTER_LIST_PLUS': MAX_CHAPTER_LIST_PLUS,
         'rating_stars': range(MIN_RATE + 1, MAX_RATE + 1),
+        'rating_histogram': NovelRatingService.histogram(novel_data['novel']),
         'user_has_reviewed': user_has_reviewed,
         'MAX_LENGTH_REVIEW_CONTENT': MAX_LENGTH_REVIEW_CONTENT,
     }
@@ -268,7 +276,6 @@ def search_novels(request):
     artist = request.GET.get('artist', '').strip()
     status = request.GET.get('status', '').strip()
     sort = request.GET.get('sort', '').strip()
-    page = request.GET.get('page', DEFAULT_PAGE_NUMBER)
 
     novels = Novel.objects.filter(
     approval_status=ApprovalStatus.APPROVED.value,
@@ -287,20 +294,14 @@ def search_novels(request):
         novels = novels.filter(artist__name__icontains=artist)
     if status:
         novels = novels.filter(progress_status=status)
-    if query:
-        if sort == 'updated':
-            novels = novels.order_by('-updated_at')
-        elif sort == 'rating':
-            novels = novels.order_by('-rating_avg')
-    else:
-        novels = novels.order_by('-view_count')
-
     novels = novels.select_related('author', 'artist').prefetch_related('tags').distinct()
 
-    # Add pagination
-    from django.core.paginator import Paginator
-    paginator = Paginator(novels, NOVEL_PER_PAGE)
-    page_obj = paginator.get_page(page)
+    # Keyset pagination: no OFFSET scan and only a capped COUNT
+    paginator = KeysetPaginator(
+        novels, SEARCH_SORT_ORDERINGS.get(sort, ('-view_count', '-id')), NOVEL_PER_PAGE,
+        count_limit=KEYSET_COUNT_LIMIT
+    )
+    page_obj = paginator.get_page(request.GET.get('cursor'))
 
     for novel in page_obj:
         novel.tag_list = list(novel.tags.all())
@@ -308,14 +309,6 @@ def search_novels(request):
 
     all_tags = Tag.objects.all().order_by('name')
 
-    # Calculate pagination range
-    pagination_start = None
-    pagination_end = None
-    if page_obj:
-        current_page = page_obj.number
-        pagination_start = current_page - PAGINATION_PAGE_RANGE
-        pagination_end = current_page + PAGINATION_PAGE_RANGE
-
     context = {
         'novels': page_obj.object_list,
         'page_obj': page_obj,
@@ -326,12 +319,10 @@ def search_novels(request):
         'filter_status': status,
         'all_tags': all_tags,
         'filter_sort': sort,
-        'total_results': paginator.count if page_obj else 0,
+        'total_results': page_obj.total,
+        'total_results_is_exact': page_obj.total_is_exact,
         'SUMMARY_TRUNCATE_WORDS': SUMMARY_TRUNCATE_WORDS,
         'DEFAULT_RATING_AVERAGE': DEFAULT_RATING_AVERAGE,
-        'PAGINATION_PAGE_RANGE': PAGINATION_PAGE_RANGE,
-        'pagination_start': pagination_start,
-        'pagination_end': pagination_end,
     }
     
     return render(request, 'novels/pages/search_results.html', context)
@@ -339,9 +330,9 @@ def search_novels(request):
 @login_required
 def toggle_like(request, novel_slug):
     novel = get_object_or_404(Novel, slug=novel_slug)
-    liked = FavoriteService.toggle_like(request.user, novel)
+    liked, count = FavoriteService.toggle(request.user, novel)
     if request.headers.get("x-requested-with") == "XMLHttpRequest":
-        return JsonResponse({"liked": liked, "count": novel.favorites.count()})
+        return JsonResponse({"liked": liked, "count": count})
     return redirect('novels:novel_detail', novel_slug=novel.slug)
 
 @login_required
@@ -6,6 +6,7 @@ class SSENotificationManager {
         this.reconnectDelay = 5000;
         this.notificationSound = null;
         this.keepAliveInterval = null;
+        this.lastEventId = null;
         
         this.init();
     }
@@ -27,7 +28,12 @@ class SSENotificationManager {
         }
         
         try {
-            this.eventSource = new EventSource('/interactions/sse/stream/');
+            // Reconnecting closes the EventSource, so pass the last id ourselves
+            // and let the server replay what was sent in between
+            const url = this.lastEventId
+                ? `/interactions/sse/stream/?last_event_id=${encodeURIComponent(this.lastEventId)}`
+                : '/interactions/sse/stream/';
+            this.eventSource = new EventSource(url);
             
             this.eventSource.onopen = () => {
                 // console.log('✅ SSE Connected');
@@ -37,6 +43,10 @@ class SSENotificationManager {
             };
             
             this.eventSource.onmessage = (event) => {
+                // Keep the highest id: events from another publisher can arrive out of order
+                if (event.lastEventId && !(Number(event.lastEventId) < Number(this.lastEventId))) {
+                    this.lastEventId = event.lastEventId;
+                }
                 try {
                     const data = JSON.parse(event.data);
                     this.handleNotification(data);
@@ -110,7 +120,16 @@ class SSENotificationManager {
     }
     
     handleNotification(data) {
-        if (data.type === 'notification') {
+        if (data.type === 'notification_summary') {
+            // The server folded notifications this client was too slow to receive
+            this.showPopupNotification({
+                title: interpolate(gettext('%s thông báo mới'), [data.data.count]),
+                content: gettext('Mở danh sách thông báo để xem chi tiết.'),
+            });
+            if (window.notificationListManager) {
+                window.notificationListManager.updateNotificationBadge(data.data.count);
+            }
+        } else if (data.type === 'notification') {
             // Show popup notification
             this.showPopupNotification(data.data);
             
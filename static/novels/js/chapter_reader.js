@@ -10,6 +10,8 @@ class ChapterReader {
         this.currentChunk = 1;
         this.startTime = Date.now();
         this.isLoading = false;
+        this.chunkWindow = 5;
+        this.prefetched = null;
         this.scrollThreshold = 0.7;
         this.fontSize = 'medium';
         this.isDarkMode = false;
@@ -103,6 +105,12 @@ class ChapterReader {
         return Math.min((scrollTop / docHeight) * 100, 100);
     }
 
+    fetchChunkWindow(start) {
+        return fetch(
+            `/novels/ajax/chunks/${this.chapterId}/range/?start=${start}&limit=${this.chunkWindow}`
+        ).then(response => response.json());
+    }
+
     async loadMoreChunks() {
         if (this.loadedChunks >= this.totalChunks || this.isLoading) return;
 
@@ -110,10 +118,13 @@ class ChapterReader {
         document.getElementById('loadingIndicator').style.display = 'block';
 
         try {
-            const response = await fetch(
-                `/novels/ajax/load-chunks/${this.chapterId}/?start=${this.loadedChunks}&limit=5`
-            );
-            const data = await response.json();
+            // Chunk positions are 1-based; reuse the prefetched window when it matches
+            const start = this.loadedChunks + 1;
+            const pending = this.prefetched && this.prefetched.start === start
+                ? this.prefetched.request
+                : this.fetchChunkWindow(start);
+            this.prefetched = null;
+            const data = await pending;
 
             const container = document.getElementById('chunksContainer');
             data.chunks.forEach(chunkData => {
@@ -124,7 +135,15 @@ class ChapterReader {
 
             this.loadedChunks += data.chunks.length;
 
+            if (data.has_more) {
+                this.prefetched = {
+                    start: data.next_start,
+                    request: this.fetchChunkWindow(data.next_start)
+                };
+            }
+
         } catch (error) {
+            this.prefetched = null;
             console.error('Error loading chunks:', error);
         } finally {
             this.isLoading = false;
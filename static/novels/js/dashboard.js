@@ -1,30 +1,28 @@
 $(document).ready(function () {
-  const novelLabels = [];
-  const novelData = [];
-  const today = new Date();
-
-  for (let i = 29; i >= 0; i--) {
-    const d = new Date(today);
-    d.setDate(today.getDate() - i);
-    const label = d.toLocaleDateString('vi-VN', { day: '2-digit', month: '2-digit' });
-    novelLabels.push(label);
-    novelData.push(Math.floor(Math.random() * 10)); 
-  }
+  const $chartData = $('#dashboard-chart-data');
+  const chartData = $chartData.length ? JSON.parse($chartData.text()) : {};
+  const labels = chartData.labels || [];
 
   const $novelCtx = $('#novelChart');
   if ($novelCtx.length) {
+    const activity = [
+      ['Chương mới', chartData.new_chapters, '#36A2EB'],
+      ['Yêu thích', chartData.favorites, '#FF6384'],
+      ['Đánh giá', chartData.reviews, '#FFCE56'],
+      ['Bình luận', chartData.comments, '#4BC0C0'],
+    ];
     const novelChart = new Chart($novelCtx[0].getContext('2d'), {
       type: 'line',
       data: {
-        labels: novelLabels,
-        datasets: [{
-          label: 'Số tiểu thuyết mới',
-          data: novelData,
-          fill: true,
-          backgroundColor: 'rgba(54, 162, 235, 0.2)',
-          borderColor: '#36A2EB',
+        labels: labels,
+        datasets: activity.map(([label, data, color]) => ({
+          label: label,
+          data: data || [],
+          fill: false,
+          borderColor: color,
+          backgroundColor: color,
           tension: 0.3
-        }]
+        }))
       },
       options: {
         responsive: true,
@@ -49,10 +47,10 @@ $(document).ready(function () {
     const userChart = new Chart($userCtx[0].getContext('2d'), {
       type: 'bar',
       data: {
-        labels: window.chartLabels || [],
+        labels: labels,
         datasets: [{
-          label: 'Số lượng người dùng',
-          data: window.chartData || [],
+          label: 'Lượt xem',
+          data: chartData.views || [],
           backgroundColor: 'rgba(54, 162, 235, 0.6)',
           borderColor: 'rgba(54, 162, 235, 1)',
           borderWidth: 1
@@ -64,7 +62,7 @@ $(document).ready(function () {
           y: {
             beginAtZero: true,
             ticks: {
-              stepSize: 1
+              precision: 0
             }
           }
         }